@@ -0,0 +1,67 @@
+"""Service instances shared by the API routes (main.py), the task handlers
+(tasks.py) and the offline scripts, with the analysis helpers they all use.
+"""
+import json
+import asyncio
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from models import AnalysisResult
+from schemas import ResumeAnalysisResponse
+from services.analysis_pool import AnalysisPool
+from services.analysis_cache import AnalysisCache
+from services.resume_analyzer import MODEL_VERSION
+from services.job_matcher import JobMatcher
+from services.match_store import MatchStore
+from services.job_import import JobImporter
+from services.skill_catalog import set_skill_details
+from services.reanalysis import ReanalysisBackfill
+from config import settings
+
+analysis_pool = AnalysisPool()
+analysis_cache = AnalysisCache()
+job_matcher = JobMatcher()
+match_store = MatchStore(job_matcher)
+job_importer = JobImporter()
+
+def build_analysis_record(resume_id: int, analysis_result: ResumeAnalysisResponse) -> AnalysisResult:
+    """Map an analysis response onto an AnalysisResult row"""
+    record = AnalysisResult(
+        resume_id=resume_id,
+        skills=json.dumps([skill.skill for skill in analysis_result.skills]),
+        experience_years=analysis_result.experience_years,
+        education_level=analysis_result.education_level,
+        industry=analysis_result.industry,
+        job_titles=json.dumps(analysis_result.job_titles),
+        companies=json.dumps(analysis_result.companies),
+        overall_score=analysis_result.overall_score,
+        skills_score=analysis_result.skills_score,
+        experience_score=analysis_result.experience_score,
+        education_score=analysis_result.education_score,
+        suggestions=json.dumps(analysis_result.suggestions),
+        strengths=json.dumps(analysis_result.strengths),
+        weaknesses=json.dumps(analysis_result.weaknesses),
+        processing_time=analysis_result.processing_time,
+        model_version=MODEL_VERSION,
+        analysis_date=datetime.utcnow()
+    )
+    set_skill_details(record, analysis_result.skills)
+    return record
+
+async def analyze_content(content: str, db: Session) -> ResumeAnalysisResponse:
+    """Analyze resume text, reusing a cached analysis of identical content.
+    The cache's database lookup and store run in threads, off the event loop."""
+    if not settings.analysis_cache_enabled:
+        return await analysis_pool.analyze(content)
+    
+    content_hash = analysis_cache.key_for(content)
+    cached = await asyncio.to_thread(analysis_cache.get, db, content_hash)
+    if cached is not None:
+        return cached
+    
+    analysis_result = await analysis_pool.analyze(content)
+    await asyncio.to_thread(analysis_cache.put, db, content_hash, analysis_result)
+    return analysis_result
+
+reanalysis_backfill = ReanalysisBackfill(analyze_content, build_analysis_record)
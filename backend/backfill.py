@@ -0,0 +1,44 @@
+"""Re-analyze resumes whose analyses predate the current model version.
+
+Run with `python backfill.py [--restart] [--chunk-size N] [--rate R]`.
+Progress is checkpointed per chunk, so an interrupted run picks up where it
+stopped when started again.
+"""
+import json
+import asyncio
+import logging
+import argparse
+
+from database import init_db
+from app_services import analysis_pool, analyze_content, build_analysis_record
+from services.reanalysis import ReanalysisBackfill
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run(args):
+    init_db()
+    backfill = ReanalysisBackfill(
+        analyze_content,
+        build_analysis_record,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        max_rate=args.rate
+    )
+    
+    await asyncio.to_thread(analysis_pool.warm_up)
+    try:
+        progress = await backfill.run(max_duration=args.max_duration, restart=args.restart)
+    finally:
+        analysis_pool.shutdown()
+    
+    print(json.dumps(progress, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-analyze resumes for the current analyzer model version")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first resume")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--rate", type=float, default=None, help="max resumes per second (0 = unthrottled)")
+    parser.add_argument("--max-duration", type=float, default=None, help="stop after this many seconds")
+    asyncio.run(run(parser.parse_args()))
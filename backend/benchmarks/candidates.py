@@ -0,0 +1,111 @@
+"""
+Candidate search latency vs. number of analyzed resumes.
+
+Builds a synthetic candidate corpus per size (Zipf-distributed skills from
+a large vocabulary, mixed experience, education and industries) and a job
+corpus to fit the TF-IDF model and draw queries from, then times, per job:
+- full_scan: CandidateIndex.score over every candidate followed by ranking
+- indexed: CandidateIndex.search (skill postings with facet-group pruning)
+
+Both must return identical rankings; mismatches are reported and make the
+run fail.
+
+Usage (from the backend directory):
+    python -m benchmarks.candidates [--sizes 10000 100000 1000000] [--queries 200] [--limit 20]
+"""
+import argparse
+import math
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.matching import INDUSTRIES, make_jobs, percentile, zipf_weights
+from services.candidate_index import CandidateIndex, CandidateQuery, IndexedCandidate, education_rank
+from services.job_matcher import JobMatcher
+from services.tfidf_model import TfidfModelStore
+
+EDUCATION = [None, 'Not Specified', 'Associate Degree', 'Bachelor Of Science', 'Master Of Science', 'Phd']
+
+
+def make_candidates(count: int, vocabulary: List[str], seed: int) -> List[IndexedCandidate]:
+    rng = random.Random(seed)
+    weights = zipf_weights(len(vocabulary))
+    candidates = []
+    for resume_id in range(1, count + 1):
+        skills = list(dict.fromkeys(rng.choices(vocabulary, weights, k=rng.randint(0, 12))))
+        skills_lower = [skill.lower() for skill in skills]
+        education_level = rng.choice(EDUCATION)
+        candidates.append(IndexedCandidate(
+            resume_id=resume_id, analysis_id=resume_id, filename=f"resume{resume_id}.pdf",
+            skills=skills, skills_lower=skills_lower, skills_lower_set=frozenset(skills_lower),
+            experience_years=rng.choice([None, 0.0, 1.0, 2.0, 3.0, 4.5, 6.0, 8.0, 10.0, 15.0]),
+            education_level=education_level, education_rank=education_rank(education_level),
+            industry=rng.choice(INDUSTRIES), overall_score=None, analysis_date=None
+        ))
+    return candidates
+
+
+def run_size(size: int, queries: List[CandidateQuery], limit: int, vocabulary: List[str],
+             matcher: JobMatcher, tfidf_model: TfidfModelStore) -> bool:
+    build_start = time.perf_counter()
+    index = CandidateIndex(matcher, tfidf_model, rebuild_interval=math.inf)
+    index.load(make_candidates(size, vocabulary, seed=size))
+    build_seconds = time.perf_counter() - build_start
+
+    full_scan, indexed = [], []
+    mismatches = 0
+    for query in queries:
+        start = time.perf_counter()
+        candidates, scores = index.score(query)
+        expected = sorted(
+            ((candidates[position].resume_id, round(float(scores[position]), 2))
+             for position in (scores > 0.3).nonzero()[0]),
+            key=lambda item: (-item[1], item[0])
+        )[:limit]
+        full_scan.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ranked = index.search(query, limit)
+        indexed.append(time.perf_counter() - start)
+
+        mismatches += [(candidate.resume_id, round(score, 2)) for candidate, score in ranked] != expected
+
+    print(
+        f"{size:>10}{build_seconds:>10.1f}"
+        f"{statistics.median(full_scan) * 1000:>12.2f}{percentile(full_scan, 0.95) * 1000:>12.2f}"
+        f"{statistics.median(indexed) * 1000:>12.2f}{percentile(indexed, 0.95) * 1000:>12.2f}"
+        f"{index.stats()['facet_groups']:>8}{mismatches:>12}"
+    )
+    return mismatches == 0
+
+
+def main(sizes: List[int], queries: int, limit: int, vocabulary_size: int):
+    matcher = JobMatcher()
+    vocabulary = [f"skill{rank}" for rank in range(vocabulary_size)]
+    jobs = make_jobs(20000, vocabulary, matcher, seed=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        tfidf_model = TfidfModelStore(directory=directory)
+        tfidf_model.fit(jobs)
+        job_queries = [CandidateQuery.for_job(job, matcher) for job in random.Random(1).sample(jobs, queries)]
+
+        print(
+            f"{'resumes':>10}{'build s':>10}{'scan p50':>12}{'scan p95':>12}"
+            f"{'index p50':>12}{'index p95':>12}{'groups':>8}{'mismatches':>12}"
+        )
+        ok = all([run_size(size, job_queries, limit, vocabulary, matcher, tfidf_model) for size in sizes])
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="number of distinct skills")
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.limit, args.vocabulary)
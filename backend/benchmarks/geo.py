@@ -0,0 +1,144 @@
+"""
+Radius query latency over job locations.
+
+Loads a synthetic job table into a temporary SQLite database, with
+locations drawn from the bundled gazetteer (plus remote and unknown
+places) and coordinates resolved at load time as on ingest, then times
+the ids of active jobs within each radius of a random city:
+- parse: resolve every job's location text through the gazetteer and
+  compute haversine distances at query time (no stored coordinates)
+- scan: the distance check on the coordinate columns without the geohash
+  ranges (a full table scan)
+- indexed: radius_conditions, geohash prefix ranges over ix_jobs_geo
+
+Also times the matcher's vectorized distance decay over every job.
+
+Usage (from the backend directory):
+    python -m benchmarks.geo [--size 1000000] [--radii 10 50 200] [--queries 20]
+"""
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from models import Job
+from services.job_geo import GAZETTEER_PATH, distance_km, distance_score, gazetteer, geo_values, radius_conditions
+
+
+def load_places() -> List[str]:
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as handle:
+        return [", ".join(filter(None, (row["city"], row["region"] or row["country"]))) for row in csv.DictReader(handle)]
+
+
+def load_jobs(engine, count: int, places: List[str], seed: int):
+    rng = random.Random(seed)
+    locations = places + ["Remote", "Anywhere", "Hybrid"]
+    resolved = {location: geo_values(location) for location in locations}
+    Job.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        rows = []
+        for job_id in range(1, count + 1):
+            location = rng.choice(locations)
+            rows.append({
+                "id": job_id,
+                "title": f"Engineer {job_id}",
+                "company": f"Company {job_id % 4999}",
+                "location": location,
+                "description": "",
+                "is_active": rng.random() < 0.9,
+                **resolved[location],
+            })
+            if len(rows) == 10000:
+                conn.execute(Job.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(Job.__table__.insert(), rows)
+
+
+def parse_query(db, point, radius_km: float) -> List[int]:
+    ids = []
+    for job_id, location in db.execute(select(Job.id, Job.location).where(Job.is_active == True)):
+        place = gazetteer.resolve(location)
+        if place is not None and distance_km(point.latitude, point.longitude, place.latitude, place.longitude) <= radius_km:
+            ids.append(job_id)
+    return ids
+
+
+def sql_query(db, conditions) -> List[int]:
+    return list(db.execute(select(Job.id).where(Job.is_active == True, *conditions)).scalars())
+
+
+def main(size: int, radii: List[float], queries: int, parse_queries: int):
+    places = load_places()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'jobs.db')}")
+        session_factory = sessionmaker(bind=engine)
+        start = time.perf_counter()
+        load_jobs(engine, size, places, seed=size)
+        print(f"{size} jobs loaded in {time.perf_counter() - start:.1f}s")
+
+        db = session_factory()
+        try:
+            print(f"{'radius km':>10}{'jobs':>10}{'parse ms':>12}{'scan ms':>12}{'indexed ms':>12}")
+            for radius_km in radii:
+                centers = [gazetteer.resolve(rng.choice(places)) for _ in range(queries)]
+                parse_timings, scan_timings, indexed_timings, found = [], [], [], []
+                for position, point in enumerate(centers):
+                    conditions = radius_conditions(point, radius_km)
+
+                    start = time.perf_counter()
+                    scanned = sql_query(db, conditions[1:])
+                    scan_timings.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    indexed = sql_query(db, conditions)
+                    indexed_timings.append(time.perf_counter() - start)
+                    assert sorted(scanned) == sorted(indexed)
+                    found.append(len(indexed))
+
+                    if position < parse_queries:
+                        start = time.perf_counter()
+                        parsed = parse_query(db, point, radius_km)
+                        parse_timings.append(time.perf_counter() - start)
+                        # Equirectangular vs. haversine may differ right at the edge
+                        assert len(set(parsed) ^ set(indexed)) <= max(1, len(indexed) // 100)
+
+                parse_ms = f"{statistics.median(parse_timings) * 1000:>12.1f}" if parse_timings else f"{'-':>12}"
+                print(
+                    f"{radius_km:>10g}{int(statistics.median(found)):>10}{parse_ms}"
+                    f"{statistics.median(scan_timings) * 1000:>12.2f}{statistics.median(indexed_timings) * 1000:>12.2f}"
+                )
+
+            rows = db.execute(select(Job.latitude, Job.longitude)).all()
+            latitude = np.array([row[0] if row[0] is not None else np.nan for row in rows])
+            longitude = np.array([row[1] if row[1] is not None else np.nan for row in rows])
+            point = gazetteer.resolve(rng.choice(places))
+            timings = []
+            for _ in range(queries):
+                start = time.perf_counter()
+                distance_score(distance_km(point.latitude, point.longitude, latitude, longitude))
+                timings.append(time.perf_counter() - start)
+            print(f"distance decay over {len(rows)} jobs: {statistics.median(timings) * 1000:.1f} ms")
+        finally:
+            db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--radii", type=float, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--parse-queries", type=int, default=1, help="queries timed with query-time parsing (slow)")
+    args = parser.parse_args()
+    main(args.size, args.radii, args.queries, args.parse_queries)
@@ -0,0 +1,102 @@
+"""
+Bulk job import throughput and memory vs. feed size.
+
+Writes synthetic JSONL feeds (or CSV with --format csv) and imports each
+into a fresh temporary SQLite database with the full-text index triggers in
+place, through JobImporter. Prints rows/sec for a first import (inserts)
+and a re-import of the same feed (upserts of existing external ids), and
+the process's peak RSS after each feed, which stays flat as feeds grow.
+
+Usage (from the backend directory):
+    python -m benchmarks.ingest [--sizes 10000 100000 300000] [--chunk-size 1000] [--format jsonl]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import tempfile
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from services.job_import import JobImporter
+from services.job_search import JobSearch
+
+SKILLS = ["Python", "React", "AWS", "Docker", "Kubernetes", "Java", "SQL", "Django", "TypeScript", "Go",
+          "Terraform", "Linux", "Machine Learning", "Spark", "Rust", "C++", "GraphQL", "Kafka"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA", "Remote",
+             "London, UK", "Berlin, Germany", "Toronto, ON", "Bangalore, India", "Hybrid - Chicago, IL"]
+SALARIES = ["$100,000 - $120,000", "$140k-$180k", "€60k-80k", "£45,000", "$45/hr", "", "Competitive"]
+WORDS = ["build", "scale", "design", "ship", "own", "services", "pipelines", "platform", "data", "customers",
+         "reliable", "distributed", "systems", "team", "product", "mobile", "cloud", "security", "models", "apis"]
+
+
+def job_record(rng: random.Random, job_id: int) -> dict:
+    return {
+        "external_id": f"feed-{job_id}",
+        "title": f"{rng.choice(['Senior', 'Staff', '', 'Junior'])} {rng.choice(SKILLS)} Engineer".strip(),
+        "company": f"Company {job_id % 4999}",
+        "location": rng.choice(LOCATIONS),
+        "description": " ".join(rng.choices(WORDS, k=80)),
+        "salary_range": rng.choice(SALARIES),
+        "required_skills": rng.sample(SKILLS, rng.randint(1, 6)),
+        "preferred_skills": rng.sample(SKILLS, 2),
+        "industry": rng.choice(["Technology", "Finance", "Healthcare", "Retail"]),
+        "experience_level": rng.choice(["Entry", "Mid-Level", "Senior"]),
+        "employment_type": "Full-time",
+        "remote_work": rng.random() < 0.2,
+    }
+
+
+def write_feed(path: str, size: int, format: str):
+    rng = random.Random(size)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        if format == "jsonl":
+            for job_id in range(size):
+                handle.write(json.dumps(job_record(rng, job_id)) + "\n")
+            return
+        writer = None
+        for job_id in range(size):
+            record = job_record(rng, job_id)
+            record["required_skills"] = ", ".join(record["required_skills"])
+            record["preferred_skills"] = ", ".join(record["preferred_skills"])
+            if writer is None:
+                writer = csv.DictWriter(handle, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(sizes: List[int], chunk_size: int, format: str):
+    print(f"{'rows':>10}{'insert rows/s':>16}{'upsert rows/s':>16}{'peak RSS MB':>14}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            feed = os.path.join(directory, f"feed.{format}")
+            write_feed(feed, size, format)
+
+            engine = create_engine(f"sqlite:///{os.path.join(directory, 'jobs.db')}")
+            Base.metadata.create_all(bind=engine)
+            JobSearch(engine).ensure()
+            importer = JobImporter(sessionmaker(bind=engine), chunk_size=chunk_size)
+
+            inserted = importer.import_file(feed, format)
+            upserted = importer.import_file(feed, format)
+            assert inserted["inserted"] == size and upserted["updated"] == size
+            print(f"{size:>10}{inserted['rows_per_second']:>16}{upserted['rows_per_second']:>16}{peak_rss_mb():>14.0f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    args = parser.parse_args()
+    main(args.sizes, args.chunk_size, args.format)
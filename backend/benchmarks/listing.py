@@ -0,0 +1,83 @@
+"""
+Job listing page latency vs. page depth.
+
+Loads a synthetic job table into a temporary SQLite database and times
+fetching the page at each depth:
+- offset: full rows, ORDER BY posted_date, id with OFFSET (the old listing)
+- keyset: JobListing.page from the cursor of the previous page, with only
+  the list-view fields loaded
+
+Usage (from the backend directory):
+    python -m benchmarks.listing [--size 1000000] [--depths 0 1000 10000 100000 900000] [--limit 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer_group
+
+from benchmarks.search import load_jobs
+from models import Job
+from services.job_listing import JobListing, encode_job_cursor
+
+LIST_FIELDS = ["job_id", "title", "company", "location", "industry", "posted_date"]
+
+
+def time_depth(session_factory, listing: JobListing, depth: int, limit: int, repeats: int):
+    offset_timings, keyset_timings = [], []
+    db = session_factory()
+    try:
+        query = db.query(Job).order_by(Job.posted_date.desc(), Job.id.desc())
+        previous = query.offset(depth - 1).limit(1).first() if depth else None
+        cursor = encode_job_cursor(previous.posted_date, previous.id) if previous else None
+
+        for _ in range(repeats):
+            db.expunge_all()
+            start = time.perf_counter()
+            offset_page = query.options(undefer_group("details")).offset(depth).limit(limit).all()
+            offset_timings.append(time.perf_counter() - start)
+
+            db.expunge_all()
+            start = time.perf_counter()
+            keyset_page, _ = listing.page(db, limit, cursor, LIST_FIELDS)
+            keyset_timings.append(time.perf_counter() - start)
+
+            assert [job.id for job in offset_page] == [item.job_id for item in keyset_page]
+    finally:
+        db.close()
+
+    print(f"{depth:>10}{statistics.median(offset_timings) * 1000:>14.2f}{statistics.median(keyset_timings) * 1000:>14.2f}")
+
+
+def main(size: int, depths: List[int], limit: int, repeats: int):
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9))) for _ in range(5000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'jobs.db')}")
+        session_factory = sessionmaker(bind=engine)
+        start = time.perf_counter()
+        load_jobs(engine, size, vocabulary, seed=size)
+        print(f"{size} jobs loaded in {time.perf_counter() - start:.1f}s")
+
+        listing = JobListing(session_factory)
+        print(f"{'depth':>10}{'offset ms':>14}{'keyset ms':>14}")
+        for depth in depths:
+            if depth < size:
+                time_depth(session_factory, listing, depth, limit, repeats)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1000, 10000, 100000, 900000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.size, args.depths, args.limit, args.repeats)
@@ -0,0 +1,178 @@
+"""
+Job matching latency vs. corpus size.
+
+Builds a synthetic in-memory job corpus per size (Zipf-distributed skills
+from a large vocabulary, mixed experience levels, industries and locations),
+fits the TF-IDF model on it and times, per resume query:
+- full_scan: MatchEngine.score over every job followed by top_k
+- indexed: MatchEngine.search (skill inverted index with upper-bound pruning)
+
+Both must return identical rankings; mismatches are reported and make the
+run fail. A reference pass first scores a smaller corpus job by job with
+JobMatcher._calculate_match_score (the 0.4/0.3/0.2/0.1 formula), ranked as
+find_matches ranks (score rounded to two decimals, above 0.3, ties in job
+order), and checks both vectorized paths against it.
+
+Usage (from the backend directory):
+    python -m benchmarks.matching [--sizes 10000 100000 1000000] [--queries 200] [--limit 10]
+        [--reference-size 2000] [--reference-queries 50]
+"""
+import argparse
+import math
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from services.job_index import IndexedJob, JobIndex, ResumeProfile
+from services.job_matcher import JobMatcher
+from services.match_engine import MatchEngine
+from services.tfidf_model import TfidfModelStore
+
+LEVELS = [None, 'entry', 'junior', 'mid-level', 'senior', 'lead', 'principal']
+INDUSTRIES = [None, 'Technology', 'Finance', 'Healthcare', 'Software', 'Education', 'Marketing']
+LOCATIONS = ['', 'New York, NY', 'San Francisco, CA', 'Austin, TX']
+
+
+def zipf_weights(size: int) -> List[float]:
+    return [1.0 / (rank + 1) for rank in range(size)]
+
+
+def make_jobs(count: int, vocabulary: List[str], matcher: JobMatcher, seed: int) -> List[IndexedJob]:
+    rng = random.Random(seed)
+    weights = zipf_weights(len(vocabulary))
+    jobs = []
+    for job_id in range(1, count + 1):
+        required = list(dict.fromkeys(rng.choices(vocabulary, weights, k=rng.randint(0, 6))))
+        preferred = rng.choices(vocabulary, weights, k=2)
+        level = rng.choice(LEVELS)
+        jobs.append(IndexedJob(
+            id=job_id, title=f"Job {job_id}", company=f"Company {job_id % 997}",
+            location=rng.choice(LOCATIONS), coordinates=None, salary_range=None, salary=None, description="",
+            required_skills=required, preferred_skills=preferred, benefits=[], requirements=[],
+            industry=rng.choice(INDUSTRIES), experience_level=level, employment_type="Full-time",
+            remote_work=rng.random() < 0.2, company_size=None, posted_date=None,
+            application_deadline=None, updated_at=None,
+            required_lower=tuple(skill.lower() for skill in required),
+            job_skills_lower=frozenset(skill.lower() for skill in required + preferred),
+            experience_range=matcher.experience_range(level) if level else None
+        ))
+    return jobs
+
+
+def make_profiles(count: int, vocabulary: List[str], seed: int) -> List[ResumeProfile]:
+    rng = random.Random(seed)
+    weights = zipf_weights(len(vocabulary))
+    profiles = []
+    for _ in range(count):
+        skills = list(dict.fromkeys(rng.choices(vocabulary, weights, k=rng.randint(1, 12))))
+        skills_lower = [skill.lower() for skill in skills]
+        profiles.append(ResumeProfile(
+            skills=skills, skills_lower=skills_lower, skills_lower_set=frozenset(skills_lower),
+            experience_years=rng.choice([None, 1.0, 3.0, 6.0, 10.0]),
+            industry=rng.choice(INDUSTRIES), education_score=None
+        ))
+    return profiles
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def reference_ranking(matcher: JobMatcher, profile: ResumeProfile, jobs: List[IndexedJob], limit: int,
+                      threshold: float = 0.3) -> List[Tuple[int, float]]:
+    """Positions and scores of the best jobs scored one at a time, in find_matches order"""
+    scored = [(position, matcher._calculate_match_score(profile, job)) for position, job in enumerate(jobs)]
+    matches = [(position, score) for position, score in scored if score > threshold]
+    matches.sort(key=lambda match: round(match[1], 2), reverse=True)
+    return matches[:limit]
+
+
+def check_reference(size: int, queries: int, limit: int, vocabulary: List[str], matcher: JobMatcher) -> bool:
+    job_index = JobIndex(matcher.experience_range, refresh_interval=math.inf, rebuild_interval=math.inf)
+    job_index.load(make_jobs(size, vocabulary, matcher, seed=size))
+    mismatches, max_delta = 0, 0.0
+    with tempfile.TemporaryDirectory() as directory:
+        # The per-job formula reads the matcher's TF-IDF model: share the engine's
+        tfidf_model, matcher.tfidf_model = matcher.tfidf_model, TfidfModelStore(directory=directory)
+        try:
+            engine = MatchEngine(job_index, matcher, matcher.tfidf_model)
+            jobs = engine.compiled().jobs
+            for profile in make_profiles(queries, vocabulary, seed=2):
+                expected = reference_ranking(matcher, profile, jobs, limit)
+                _, scores = engine.score(profile)
+                _, ranked = engine.search(profile, limit)
+                for ranking in (engine.top_k(scores, limit), ranked):
+                    mismatches += [position for position, _ in ranking] != [position for position, _ in expected]
+                max_delta = max([max_delta] + [
+                    abs(float(scores[position]) - matcher._calculate_match_score(profile, job))
+                    for position, job in enumerate(jobs)
+                ])
+        finally:
+            matcher.tfidf_model = tfidf_model
+
+    print(f"reference: {size} jobs x {queries} queries, max |score delta| {max_delta:.1e}, {mismatches} mismatches")
+    return mismatches == 0 and max_delta < 1e-9
+
+
+def run_size(size: int, queries: int, limit: int, vocabulary: List[str], matcher: JobMatcher) -> bool:
+    build_start = time.perf_counter()
+    job_index = JobIndex(matcher.experience_range, refresh_interval=math.inf, rebuild_interval=math.inf)
+    job_index.load(make_jobs(size, vocabulary, matcher, seed=size))
+    with tempfile.TemporaryDirectory() as directory:
+        engine = MatchEngine(job_index, matcher, TfidfModelStore(directory=directory))
+        compiled = engine.compiled()
+    build_seconds = time.perf_counter() - build_start
+
+    full_scan, indexed = [], []
+    mismatches = 0
+    for profile in make_profiles(queries, vocabulary, seed=1):
+        start = time.perf_counter()
+        _, scores = engine.score(profile)
+        expected = engine.top_k(scores, limit)
+        full_scan.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, ranked = engine.search(profile, limit)
+        indexed.append(time.perf_counter() - start)
+
+        mismatches += ranked != expected
+
+    stats = compiled.skill_index.stats()
+    print(
+        f"{size:>10}{build_seconds:>10.1f}"
+        f"{statistics.median(full_scan) * 1000:>12.2f}{percentile(full_scan, 0.95) * 1000:>12.2f}"
+        f"{statistics.median(indexed) * 1000:>12.2f}{percentile(indexed, 0.95) * 1000:>12.2f}"
+        f"{stats['facet_groups']:>8}{mismatches:>12}"
+    )
+    return mismatches == 0
+
+
+def main(sizes: List[int], queries: int, limit: int, vocabulary_size: int, reference_size: int,
+         reference_queries: int):
+    matcher = JobMatcher()
+    vocabulary = [f"skill{rank}" for rank in range(vocabulary_size)]
+    ok = check_reference(reference_size, reference_queries, limit, vocabulary, matcher)
+
+    print(
+        f"{'jobs':>10}{'build s':>10}{'scan p50':>12}{'scan p95':>12}"
+        f"{'index p50':>12}{'index p95':>12}{'groups':>8}{'mismatches':>12}"
+    )
+    ok = all([run_size(size, queries, limit, vocabulary, matcher) for size in sizes]) and ok
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="number of distinct skills")
+    parser.add_argument("--reference-size", type=int, default=2000, help="jobs scored one at a time")
+    parser.add_argument("--reference-queries", type=int, default=50)
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.limit, args.vocabulary, args.reference_size, args.reference_queries)
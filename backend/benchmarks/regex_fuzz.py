@@ -0,0 +1,84 @@
+"""
+Adversarial corpus for the resume extraction patterns.
+
+Generates inputs designed to trigger regex backtracking (long comma-less lines,
+repeated separators, keyword floods, digit runs, random token soup) and checks
+that the worst-case analysis latency stays bounded.
+
+Usage (from the backend directory):
+    python -m benchmarks.regex_fuzz [--sizes 10000 50000 100000] [--max-seconds 2]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+TRICKY_TOKENS = [
+    'senior', 'lead', 'at', 'in', '@', 'developer', 'engineer', 'software', 'data',
+    'years', 'of', 'experience', 'exp', '2019', '-', 'present', 'bachelor', 'master',
+    'university', 'python', 'java', 'r', 'go', 'ai', 'inc', 'corp', '5+', '3-4'
+]
+
+
+def _repeat_to(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _random_soup(size: int, separators: str, seed: int) -> str:
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        token = rng.choice(TRICKY_TOKENS)
+        separator = rng.choice(separators)
+        parts.append(token + separator)
+        length += len(token) + 1
+    return ''.join(parts)[:size]
+
+
+CORPUS: Dict[str, Callable[[int], str]] = {
+    'long_line_no_commas': lambda size: 'senior ' + _repeat_to('word ', size),
+    'repeated_at': lambda size: _repeat_to('x at ', size),
+    'repeated_in_at': lambda size: _repeat_to('in at @ ', size),
+    'keyword_flood': lambda size: _repeat_to('software ', size),
+    'title_prefix_flood': lambda size: _repeat_to('senior lead ', size),
+    'digit_run': lambda size: _repeat_to('1', size) + ' years',
+    'digit_dash_run': lambda size: _repeat_to('2019 - ', size),
+    'near_miss_experience': lambda size: _repeat_to('5 years of expe ', size),
+    'whitespace_run': lambda size: 'a' + ' ' * size + 'b',
+    'degree_flood': lambda size: _repeat_to('bachelor of ', size),
+    'institution_flood': lambda size: _repeat_to('university ', size),
+    'random_soup_spaces': lambda size: _random_soup(size, ' ', seed=1),
+    'random_soup_lines': lambda size: _random_soup(size, '  \n', seed=2),
+    'random_soup_punct': lambda size: _random_soup(size, ' .;:-', seed=3),
+}
+
+
+def run(sizes: List[int], max_seconds: float) -> int:
+    from services.resume_analyzer import ResumeAnalyzer
+
+    analyzer = ResumeAnalyzer()
+    worst = 0.0
+    print(f"{'input':<24}{'size':>10}{'seconds':>10}")
+
+    for name, generate in CORPUS.items():
+        for size in sizes:
+            text = generate(size)
+            start = time.perf_counter()
+            asyncio.run(analyzer.analyze_resume(text))
+            elapsed = time.perf_counter() - start
+            worst = max(worst, elapsed)
+            print(f"{name:<24}{size:>10}{elapsed:>10.3f}")
+
+    print(f"worst case: {worst:.3f}s (limit {max_seconds:.3f}s)")
+    return 0 if worst <= max_seconds else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--max-seconds', type=float, default=2.0)
+    args = parser.parse_args()
+    sys.exit(run(args.sizes, args.max_seconds))
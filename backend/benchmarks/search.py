@@ -0,0 +1,150 @@
+"""
+Job search latency vs. number of postings.
+
+Loads a synthetic job table per size into a temporary SQLite database
+(titles, companies and Zipf-distributed description words, mixed
+industries, levels and locations), builds the FTS5 index and times, per
+query mix:
+- like: unindexed LIKE matching over title/company/description
+- fts: JobSearch.search (FTS5 BM25 with structured filters)
+
+Usage (from the backend directory):
+    python -m benchmarks.search [--sizes 100000 1000000] [--queries 50] [--limit 20]
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.matching import INDUSTRIES, percentile, zipf_weights
+from models import Job
+from schemas import JobSearchRequest
+from services.job_search import JobSearch
+
+TITLES = ["Engineer", "Developer", "Analyst", "Manager", "Designer", "Scientist", "Architect", "Consultant"]
+SENIORITY = ["Junior", "Senior", "Staff", "Lead", "Principal", ""]
+LEVELS = ["Entry", "Mid-Level", "Senior", "Executive"]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "Boston, MA", "Remote"]
+
+
+def load_jobs(engine, count: int, vocabulary: List[str], seed: int):
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(zipf_weights(len(vocabulary))))
+    now = datetime.utcnow()
+    Job.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        rows = []
+        for job_id in range(1, count + 1):
+            rows.append({
+                "id": job_id,
+                "title": f"{rng.choice(SENIORITY)} {rng.choice(vocabulary[:200]).title()} {rng.choice(TITLES)}".strip(),
+                "company": f"Company {job_id % 4999}",
+                "location": rng.choice(LOCATIONS),
+                "description": " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=60)),
+                "industry": rng.choice(INDUSTRIES),
+                "experience_level": rng.choice(LEVELS),
+                "employment_type": "Full-time",
+                "remote_work": rng.random() < 0.2,
+                "posted_date": now - timedelta(minutes=job_id),
+                "is_active": rng.random() < 0.9,
+            })
+            if len(rows) == 10000:
+                conn.execute(Job.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(Job.__table__.insert(), rows)
+
+
+def make_requests(count: int, vocabulary: List[str], limit: int, seed: int) -> Dict[str, List[JobSearchRequest]]:
+    rng = random.Random(seed)
+    return {
+        "common term": [JobSearchRequest(keywords=rng.choice(vocabulary[:20]), limit=limit) for _ in range(count)],
+        "rare term": [JobSearchRequest(keywords=rng.choice(vocabulary[1000:]), limit=limit) for _ in range(count)],
+        "two terms": [
+            JobSearchRequest(keywords=f"{rng.choice(vocabulary[:200])} {rng.choice(vocabulary[:2000])}", limit=limit)
+            for _ in range(count)
+        ],
+        "term + filters": [
+            JobSearchRequest(
+                keywords=rng.choice(vocabulary[:500]), location=rng.choice(LOCATIONS),
+                industry=rng.choice(INDUSTRIES[1:]), experience_level=rng.choice(LEVELS), limit=limit
+            )
+            for _ in range(count)
+        ],
+        "filters only": [
+            JobSearchRequest(industry=rng.choice(INDUSTRIES[1:]), remote_work=True, limit=limit)
+            for _ in range(count)
+        ],
+    }
+
+
+def time_requests(search: JobSearch, session_factory, requests: List[JobSearchRequest], like: bool) -> List[float]:
+    timings = []
+    db = session_factory()
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            if like:
+                statement = search._filter(search._like_statement(request), request)
+                db.execute(statement.limit(request.limit).offset(request.offset)).all()
+            else:
+                search.search(db, request)
+            timings.append(time.perf_counter() - start)
+    finally:
+        db.close()
+    return timings
+
+
+def run_size(size: int, queries: int, limit: int, vocabulary: List[str]):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'jobs.db')}")
+        session_factory = sessionmaker(bind=engine)
+
+        start = time.perf_counter()
+        load_jobs(engine, size, vocabulary, seed=size)
+        load_seconds = time.perf_counter() - start
+
+        search = JobSearch(engine)
+        start = time.perf_counter()
+        search.ensure()
+        index_seconds = time.perf_counter() - start
+        print(f"{size} jobs: loaded in {load_seconds:.1f}s, indexed in {index_seconds:.1f}s")
+
+        for name, requests in make_requests(queries, vocabulary, limit, seed=1).items():
+            like = time_requests(search, session_factory, requests[:max(1, queries // 5)], like=True)
+            fts = time_requests(search, session_factory, requests, like=False)
+            print(
+                f"{name:>16}"
+                f"{statistics.median(like) * 1000:>12.2f}{percentile(like, 0.95) * 1000:>12.2f}"
+                f"{statistics.median(fts) * 1000:>12.2f}{percentile(fts, 0.95) * 1000:>12.2f}"
+            )
+        engine.dispose()
+
+
+def main(sizes: List[int], queries: int, limit: int, vocabulary_size: int):
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = list(dict.fromkeys("".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(vocabulary_size * 2)))
+    vocabulary = vocabulary[:vocabulary_size]
+
+    print(f"{'query':>16}{'like p50':>12}{'like p95':>12}{'fts p50':>12}{'fts p95':>12}")
+    for size in sizes:
+        run_size(size, queries, limit, vocabulary)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=20000, help="number of distinct description words")
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.limit, args.vocabulary)
@@ -0,0 +1,88 @@
+"""
+Recall@k and latency of the semantic IVF index against exact search.
+
+Builds the index over a synthetic corpus of topical job descriptions (each
+document mixes words from one of many topics with background words), then
+for held-out queries compares IVFIndex.search at several nprobe values with
+brute-force exact search over the same vectors:
+- recall@k: share of the exact top-k found by the approximate search
+- p50 / p95: query latency in milliseconds (embedding excluded)
+
+Usage (from the backend directory):
+    python -m benchmarks.semantic_recall [--jobs 100000] [--queries 200] [--k 10] [--nprobe 1 2 4 8 16 32]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import List, Tuple
+
+from services.semantic_index import SemanticIndexStore
+
+
+def make_documents(count: int, topics: int, seed: int) -> List[Tuple[int, str]]:
+    rng = random.Random(seed)
+    vocabulary = [f"w{index}" for index in range(topics * 60)]
+    topic_words = [vocabulary[topic * 60:(topic + 1) * 60] for topic in range(topics)]
+
+    documents = []
+    for job_id in range(1, count + 1):
+        # Three topics per document, one dominant, plus background words
+        first, second, third = rng.sample(range(topics), 3)
+        words = (
+            rng.choices(topic_words[first], k=15) +
+            rng.choices(topic_words[second], k=10) +
+            rng.choices(topic_words[third], k=8) +
+            rng.choices(vocabulary, k=27)
+        )
+        documents.append((job_id, " ".join(words)))
+    return documents
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main(jobs: int, queries: int, k: int, nprobes: List[int], topics: int, dimensions: int):
+    with tempfile.TemporaryDirectory() as directory:
+        store = SemanticIndexStore(directory=directory, dimensions=dimensions)
+        start = time.perf_counter()
+        index = store.build(make_documents(jobs, topics, seed=1))
+        print(f"built {jobs} jobs, {index.dimensions} dimensions, {index.nlist} lists "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        query_vectors = index.embed([text for _, text in make_documents(queries, topics, seed=2)])
+        exact_ids, exact_times = [], []
+        for query in query_vectors:
+            start = time.perf_counter()
+            ids, _ = index.exact_search(query, k)
+            exact_times.append(time.perf_counter() - start)
+            exact_ids.append(set(ids.tolist()))
+
+        print(f"{'search':>12}{'recall@' + str(k):>12}{'p50 ms':>10}{'p95 ms':>10}")
+        print(f"{'exact':>12}{1.0:>12.3f}{statistics.median(exact_times) * 1000:>10.2f}"
+              f"{percentile(exact_times, 0.95) * 1000:>10.2f}")
+
+        for nprobe in nprobes:
+            recalls, times = [], []
+            for query, expected in zip(query_vectors, exact_ids):
+                start = time.perf_counter()
+                ids, _ = index.search(query, k, nprobe)
+                times.append(time.perf_counter() - start)
+                recalls.append(len(expected & set(ids.tolist())) / max(len(expected), 1))
+            print(f"{'nprobe=' + str(nprobe):>12}{statistics.mean(recalls):>12.3f}"
+                  f"{statistics.median(times) * 1000:>10.2f}{percentile(times, 0.95) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=128)
+    args = parser.parse_args()
+    main(args.jobs, args.queries, args.k, args.nprobe, args.topics, args.dimensions)
@@ -0,0 +1,121 @@
+"""
+Sharded multi-process match scoring vs. worker count.
+
+Builds a synthetic in-memory job corpus (see benchmarks.matching) with
+gazetteer coordinates and times, per resume query with an origin (scored
+exhaustively, since every job has its own location score):
+- in-process: MatchEngine.search in this process
+- N workers: ShardedScorer.top_k with the job arrays in shared memory,
+  split into N shards scored in parallel and merged
+
+Rankings must be identical to the in-process ones; mismatches make the run
+fail. Also reports the shared block size and each worker's private memory
+(Linux), which stays small next to it since workers map the block instead
+of copying it. Speedups are bounded by the cores available.
+
+Usage (from the backend directory):
+    python -m benchmarks.sharding [--size 1000000] [--workers 1 2 4 8] [--queries 50] [--limit 10]
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import List
+
+from benchmarks.matching import LOCATIONS, make_jobs, make_profiles, percentile
+from services.job_geo import gazetteer
+from services.job_index import JobIndex
+from services.job_matcher import JobMatcher
+from services.match_engine import MatchEngine
+from services.match_shards import ShardedScorer
+from services.tfidf_model import TfidfModelStore
+
+ORIGINS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Chicago, IL", "Denver, CO"]
+
+
+def main(size: int, workers: List[int], queries: int, limit: int, vocabulary_size: int, radius_km: float):
+    matcher = JobMatcher()
+    vocabulary = [f"skill{rank}" for rank in range(vocabulary_size)]
+    coordinates = {}
+    for location in LOCATIONS:
+        point = gazetteer.resolve(location)
+        coordinates[location] = (point.latitude, point.longitude) if point else None
+
+    build_start = time.perf_counter()
+    jobs = [replace(job, coordinates=coordinates[job.location]) for job in make_jobs(size, vocabulary, matcher, seed=size)]
+    job_index = JobIndex(matcher.experience_range, refresh_interval=math.inf, rebuild_interval=math.inf)
+    job_index.load(jobs)
+    rng = random.Random(2)
+    profiles = [
+        replace(profile, origin=gazetteer.resolve(rng.choice(ORIGINS)))
+        for profile in make_profiles(queries, vocabulary, seed=1)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = MatchEngine(job_index, matcher, TfidfModelStore(directory=directory))
+        compiled = engine.compiled()
+        print(f"{size} jobs compiled in {time.perf_counter() - build_start:.1f}s, {os.cpu_count()} CPUs")
+
+        queries_by_profile = [engine.scoring_query(compiled, profile, radius_km) for profile in profiles]
+        expected, timings = [], []
+        for profile in profiles:
+            start = time.perf_counter()
+            expected.append(engine.search(profile, limit, radius_km=radius_km)[1])
+            timings.append(time.perf_counter() - start)
+        baseline = statistics.median(timings)
+
+        print(
+            f"{'workers':>10}{'publish s':>11}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>9}"
+            f"{'shared MB':>11}{'worker private MB':>19}{'mismatches':>12}"
+        )
+        print(f"{'in-process':>10}{'-':>11}{baseline * 1000:>10.2f}{percentile(timings, 0.95) * 1000:>10.2f}{1.0:>9.2f}")
+
+        ok = True
+        for count in workers:
+            scorer = ShardedScorer(workers=count, min_jobs=0)
+            try:
+                scorer.start()
+                start = time.perf_counter()
+                shared = scorer.publish(compiled)
+                publish_seconds = time.perf_counter() - start
+
+                timings, mismatches = [], 0
+                for query, ranked in zip(queries_by_profile, expected):
+                    start = time.perf_counter()
+                    result = scorer.top_k(compiled, query, limit)
+                    timings.append(time.perf_counter() - start)
+                    mismatches += result != ranked
+
+                workers_memory = {usage["pid"]: usage for usage in scorer.worker_memory()}.values()
+                private = [
+                    (usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0)) / 1024 for usage in workers_memory
+                ]
+                median = statistics.median(timings)
+                print(
+                    f"{count:>10}{publish_seconds:>11.2f}{median * 1000:>10.2f}{percentile(timings, 0.95) * 1000:>10.2f}"
+                    f"{baseline / median:>9.2f}{shared.nbytes / 2 ** 20:>11.0f}"
+                    f"{(max(private) if private else float('nan')):>19.0f}{mismatches:>12}"
+                )
+                ok = ok and mismatches == 0
+            finally:
+                scorer.shutdown()
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=5000, help="number of distinct skills")
+    parser.add_argument("--radius-km", type=float, default=None, help="also drop jobs farther than this")
+    args = parser.parse_args()
+    main(args.size, args.workers, args.queries, args.limit, args.vocabulary, args.radius_km)
@@ -0,0 +1,120 @@
+"""
+Startup-time benchmark for the API process.
+
+Each run starts a fresh interpreter against a throwaway SQLite database and
+measures:
+- import: importing the `main` module
+- lifespan: running the startup hooks (schema creation, background warm-up)
+- first_request: the first request to the liveness endpoint
+- ready: time until /api/health/ready reports the models as warm
+- first_analysis: the first resume analysis request
+- first_match: the first job match request for that resume
+
+The database is seeded with create_sample_data, and the probe fails unless
+the analysis and the match requests (stored, ?near= and ?stream=) succeed.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = r'''
+import json
+import time
+
+start = time.perf_counter()
+import main
+timings = {"import": time.perf_counter() - start}
+
+from fastapi.testclient import TestClient
+from database import SessionLocal, init_db, create_sample_data
+from models import Resume
+
+SAMPLE = """Jane Doe
+Work Experience
+Senior Python Developer at Acme Corp
+2018 - Present
+- Built Django and FastAPI services on AWS
+Education
+Bachelor of Science in Computer Science
+State University, 2014
+"""
+
+init_db()
+create_sample_data()
+
+start = time.perf_counter()
+with TestClient(main.app) as client:
+    timings["lifespan"] = time.perf_counter() - start
+
+    request_start = time.perf_counter()
+    client.get("/")
+    timings["first_request"] = time.perf_counter() - request_start
+
+    deadline = time.perf_counter() + 120
+    while client.get("/api/health/ready").status_code != 200 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    timings["ready"] = time.perf_counter() - start
+
+    db = SessionLocal()
+    resume = Resume(filename="benchmark.txt", content=SAMPLE)
+    db.add(resume)
+    db.commit()
+    resume_id = resume.id
+    db.close()
+
+    request_start = time.perf_counter()
+    response = client.post(f"/api/resume/analyze/{resume_id}")
+    timings["first_analysis"] = time.perf_counter() - request_start
+    assert response.status_code == 200, response.text
+
+    request_start = time.perf_counter()
+    response = client.get(f"/api/jobs/match/{resume_id}")
+    timings["first_match"] = time.perf_counter() - request_start
+    assert response.status_code == 200 and response.json(), response.text
+    for query in ("near=Austin, TX", "stream=ndjson"):
+        response = client.get(f"/api/jobs/match/{resume_id}?{query}")
+        assert response.status_code == 200 and '"error"' not in response.text, response.text
+
+print("TIMINGS " + json.dumps(timings))
+'''
+
+
+def run_once(workdir: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        env["UPLOAD_DIRECTORY"] = os.path.join(tmp, "uploads")
+        env["TASK_QUEUE_URL"] = f"sqlite:///{os.path.join(tmp, 'task_queue.db')}"
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=workdir, env=env,
+            capture_output=True, text=True, check=True
+        )
+
+    for line in result.stdout.splitlines():
+        if line.startswith("TIMINGS "):
+            return json.loads(line[len("TIMINGS "):])
+    raise RuntimeError(f"Probe produced no timings:\n{result.stderr}")
+
+
+def main(runs: int):
+    workdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = [run_once(workdir) for _ in range(runs)]
+
+    print(f"{'phase':<16}{'median ms':>12}{'max ms':>12}")
+    for phase in samples[0]:
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"{phase:<16}{statistics.median(values):>12.1f}{max(values):>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,34 @@
+"""Build the semantic job index offline.
+
+Run with `python build_semantic_index.py [--dimensions D] [--nlist N]`.
+Embeds every active job (TF-IDF + truncated SVD), clusters the vectors into
+IVF lists and publishes the new version; running API and worker processes
+load it on their next manifest check.
+"""
+import json
+import logging
+import argparse
+
+from database import init_db
+from services.job_matcher import JobMatcher
+from services.semantic_index import SemanticIndexStore, job_document
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run(args):
+    init_db()
+    matcher = JobMatcher()
+    store = SemanticIndexStore(dimensions=args.dimensions, nlist=args.nlist)
+    
+    jobs = matcher.job_index.jobs()
+    if store.build((job.id, job_document(job)) for job in jobs) is None:
+        raise SystemExit("No job text to build a semantic index from")
+    
+    print(json.dumps(store.status(), indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the semantic (dense vector) job index")
+    parser.add_argument("--dimensions", type=int, default=None, help="SVD components")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (0 = sized from the corpus)")
+    run(parser.parse_args())
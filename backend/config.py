@@ -19,6 +19,90 @@ class Settings(BaseSettings):
     # AI Model settings
     spacy_model: str = "en_core_web_sm"
     similarity_threshold: float = 0.7
+    nltk_auto_download: bool = False  # download missing NLTK data at warm-up
+    warm_models_on_startup: bool = True
+    warm_up_retry_interval: float = 30.0  # seconds before retrying a failed required startup phase
+    
+    # Extraction limits
+    analysis_time_budget: float = 2.0  # seconds of pattern matching per resume
+    regex_engine: str = "auto"  # auto (RE2 if installed), re2 or re
+    regex_max_line_length: int = 1000
+    
+    # Analysis execution
+    analysis_backend: str = "inline"  # inline (thread in the API process) or process
+    analysis_workers: int = 2
+    analysis_max_tasks_per_worker: int = 200
+    analysis_task_timeout: float = 30.0
+    analysis_batch_max_size: int = 500
+    
+    # Streaming responses (?stream=ndjson|sse)
+    stream_window: int = 8  # Items analyzed concurrently per stream
+    stream_chunk_size: int = 100  # Rows loaded/committed per database round-trip
+    
+    # Analysis cache (keyed by normalized content hash + model version)
+    analysis_cache_enabled: bool = True
+    analysis_cache_max_entries: int = 1024
+    analysis_cache_ttl: int = 3600  # seconds in the in-process LRU
+    analysis_cache_persist: bool = True
+    
+    # Background task queue (memory:// or sqlite:///path)
+    task_queue_url: str = "sqlite:///./task_queue.db"
+    task_queue_embedded_worker: bool = True  # consume tasks inside the API process
+    task_queue_concurrency: int = 2
+    task_queue_max_attempts: int = 3
+    task_queue_retry_backoff: float = 5.0  # seconds, doubled after each failed attempt
+    task_queue_retry_backoff_max: float = 300.0
+    task_queue_lease_seconds: float = 300.0
+    task_queue_poll_interval: float = 1.0
+    
+    # In-memory job index used by the matcher
+    job_index_refresh_interval: float = 30.0  # seconds between incremental refreshes
+    job_index_rebuild_interval: float = 3600.0  # seconds between full rebuilds (picks up deletes)
+    
+    # In-memory index of analyzed resumes used for candidate search
+    candidate_index_rebuild_interval: float = 3600.0  # seconds between full rebuilds
+    candidate_index_max_delta: int = 10000  # re-analyzed resumes kept apart before the base is recompiled
+    
+    # Corpus-fitted TF-IDF model of job skills
+    tfidf_model_directory: str = "./model_artifacts/tfidf"
+    tfidf_max_features: int = 20000
+    tfidf_refit_interval: float = 86400.0  # seconds between scheduled refits
+    tfidf_reload_interval: float = 60.0  # seconds between checks for a model fitted by another process
+    tfidf_keep_versions: int = 3
+    
+    # Semantic (dense vector) job search
+    semantic_index_directory: str = "./model_artifacts/semantic"
+    semantic_dimensions: int = 128  # SVD components
+    semantic_nlist: int = 0  # IVF lists, 0 = about 4 * sqrt(jobs)
+    semantic_nprobe: int = 8  # lists scanned per query; higher = better recall, slower
+    semantic_max_features: int = 50000
+    semantic_rebuild_interval: float = 86400.0  # seconds between scheduled rebuilds
+    semantic_reload_interval: float = 60.0
+    semantic_keep_versions: int = 2
+    
+    # Full-text job search
+    job_search_max_candidates: int = 2000  # newest keyword matches ranked by BM25 per query
+    
+    # Location matching
+    location_half_life_km: float = 50.0  # distance at which the location match score halves
+    
+    # Bulk job import (JSONL/CSV feeds)
+    job_import_chunk_size: int = 1000  # rows validated and upserted per transaction
+    job_import_task_duration: float = 240.0  # seconds per queued slice, below the task lease
+    
+    # Multi-process exhaustive matching (job arrays in shared memory)
+    match_workers: int = 0  # worker processes scoring job shards in parallel, 0 = in-process
+    match_parallel_min_jobs: int = 50000  # smaller corpora are scored in-process
+    
+    # Materialized job matches per resume
+    job_match_max_per_resume: int = 200  # best matches kept per resume
+    job_match_sync_interval: float = 60.0  # seconds between rescoring changed jobs
+    
+    # Re-analysis backfill after a model version change
+    backfill_chunk_size: int = 100
+    backfill_concurrency: int = 2
+    backfill_max_rate: float = 5.0  # resumes per second, 0 to disable throttling
+    backfill_task_duration: float = 240.0  # seconds per queued slice, below the task lease
     
     # External API settings
     job_api_key: Optional[str] = None
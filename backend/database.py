@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
@@ -45,6 +45,7 @@ def init_db():
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
         
         logger.info("Database initialized successfully")
         
@@ -52,6 +53,44 @@ def init_db():
         logger.error(f"Database initialization error: {str(e)}")
         raise
 
+def add_missing_columns():
+    """
+    Add nullable columns that were added to models after their table was created
+    (create_all only creates missing tables)
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info(f"Added column {table.name}.{column.name}")
+            
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+def dialect_insert(connection, table):
+    """
+    INSERT construct with ON CONFLICT support for the connection's dialect
+    (SQLite, PostgreSQL), or None on databases without it
+    """
+    if connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(table)
+
 def create_sample_data():
     """
     Create sample data for demonstration
@@ -0,0 +1,34 @@
+"""Bulk-import a partner job feed (JSONL or CSV).
+
+Run with `python import_jobs.py FEED [--format jsonl|csv] [--chunk-size N] [--offset BYTES]`.
+Rows are validated and upserted on external_id one chunk per transaction,
+so an interrupted import resumes from the logged offset (or can simply be
+re-run). A running API picks the jobs up on its next job index refresh.
+"""
+import json
+import logging
+import argparse
+
+from database import init_db
+from services.job_import import JobImporter, FORMATS
+from services.job_search import JobSearch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run(args):
+    init_db()
+    # The full-text index triggers must exist before jobs are written
+    JobSearch().ensure()
+    
+    importer = JobImporter(chunk_size=args.chunk_size)
+    report = importer.import_file(args.feed, args.format, offset=args.offset)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import a JSONL or CSV job feed, upserted on external_id")
+    parser.add_argument("feed", help="path of the feed file")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows upserted per transaction")
+    parser.add_argument("--offset", type=int, default=0, help="byte offset to resume an interrupted import from")
+    run(parser.parse_args())
@@ -1,36 +1,139 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, status
+# Imported first so startup timings include the imports below
+from utils.lifecycle import startup_tracker
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 import uvicorn
 import os
 from typing import List, Optional
 import logging
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import json
+import shutil
+import uuid
 
-from database import get_db, engine, Base
+from database import get_db, init_db, SessionLocal
 from models import Resume, Job, User, AnalysisResult
 from schemas import (
     ResumeAnalysisResponse, 
     JobMatchResponse, 
     UserCreate, 
     UserResponse,
-    ResumeUploadResponse
+    ResumeUploadResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    ErrorResponse,
+    TaskSubmitResponse,
+    TaskStatusResponse,
+    TaskResultResponse,
+    ResumeSearchRequest,
+    CandidateMatchResponse,
+    JobSearchRequest,
+    JobListItem
 )
-from services.resume_analyzer import ResumeAnalyzer
-from services.job_matcher import JobMatcher
+from services.match_store import decode_cursor
+from services.job_search import JobSearch
+from services.job_salaries import salary_conditions
+from services.job_geo import GeoPoint, gazetteer, radius_conditions
+from services.job_listing import JobListing, decode_job_cursor, parse_fields
+from services.job_import import FORMATS as FEED_FORMATS, detect_format
 from services.auth_service import AuthService
+from services.task_queue import QueuedTask, SUCCEEDED, DEAD
 from utils.file_processor import FileProcessor
 from utils.error_handler import ErrorHandler
+from utils.streaming import STREAM_FORMATS, stream_events, chunked, bounded_map
 from config import settings
+from app_services import (
+    analysis_pool, analysis_cache, job_matcher, match_store, reanalysis_backfill,
+    analyze_content, build_analysis_record
+)
+from tasks import task_queue, queue_match_materialization
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+async def warm_phase(name: str, func, *args, required: bool = True):
+    """Run a startup phase in a thread. A failed required phase is reported
+    by the readiness probe and retried; a failed optional phase only leaves
+    its feature degraded and startup goes on."""
+    while True:
+        try:
+            with startup_tracker.phase(name):
+                return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            if not required:
+                logger.error(f"Startup phase '{name}' failed, continuing without it: {str(e)}")
+                startup_tracker.mark_degraded(name)
+                return None
+            logger.error(f"Startup phase '{name}' failed, retrying in {settings.warm_up_retry_interval:g}s: {str(e)}")
+            startup_tracker.mark_failing(name)
+            await asyncio.sleep(settings.warm_up_retry_interval)
+
+async def warm_models():
+    """Load NLP models and indexes in the background and mark the app ready"""
+    await warm_phase("model_warm_up", analysis_pool.warm_up)
+    # Parses salaries of jobs stored before the salary columns existed
+    salaries_migrated = await warm_phase("job_salaries", job_matcher.job_salaries.ensure, required=False)
+    # Locates jobs stored before the coordinate columns existed
+    await warm_phase("job_geo", job_matcher.job_geo.ensure, required=False)
+    await warm_phase("job_index", job_matcher.job_index.ensure_fresh)
+    # Loads the persisted TF-IDF model (fits the first one), compiles job vectors
+    # and publishes them to the match scoring workers when MATCH_WORKERS > 1
+    await warm_phase("match_engine", job_matcher.match_engine.warm_up)
+    await warm_phase("candidate_index", job_matcher.candidate_index.ensure_fresh, required=False)
+    # Counts jobs stored before the trend counters existed
+    await warm_phase("job_trends", job_matcher.job_trends.ensure, bool(salaries_migrated), required=False)
+    # Links skills of jobs and analyses stored before the skills tables existed
+    await warm_phase("skill_catalog", job_matcher.skill_catalog.ensure, required=False)
+    startup_tracker.mark_ready()
+
+async def run_embedded_worker(stop_event: asyncio.Event, warm_up_task: Optional[asyncio.Task]):
+    """Consume tasks in-process once warm-up is done. Schedules fire on the
+    first poll; run earlier, they would build the job index ahead of the
+    salary and location migrations and import sklearn alongside warm-up."""
+    if warm_up_task is not None:
+        await asyncio.wait([warm_up_task])
+    if not stop_event.is_set():
+        await task_queue.run_worker(stop_event)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifecycle: schema creation, model warm-up and shutdown"""
+    with startup_tracker.phase("database"):
+        await asyncio.to_thread(init_db)
+    with startup_tracker.phase("job_search"):
+        # Full-text index and its sync triggers must exist before jobs are written
+        await asyncio.to_thread(job_search.ensure)
+    with startup_tracker.phase("job_listing"):
+        await asyncio.to_thread(job_listing.ensure)
+    
+    # Models load in the background; /api/health/ready reports when done
+    warm_up_task = None
+    if settings.warm_models_on_startup:
+        warm_up_task = asyncio.create_task(warm_models())
+    else:
+        startup_tracker.mark_ready()
+    
+    # Without a separate worker.py process, tasks are consumed in-process
+    worker_stop = asyncio.Event()
+    worker_task = None
+    if settings.task_queue_embedded_worker:
+        worker_task = asyncio.create_task(run_embedded_worker(worker_stop, warm_up_task))
+    
+    yield
+    
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    if worker_task is not None:
+        worker_stop.set()
+        await worker_task
+    analysis_pool.shutdown()
+    job_matcher.match_engine.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -38,7 +141,8 @@ app = FastAPI(
     description="Advanced AI-powered resume analysis and job matching system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -48,18 +152,147 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Security
 security = HTTPBearer()
 
-# Initialize services
-resume_analyzer = ResumeAnalyzer()
-job_matcher = JobMatcher()
+# Initialize services (the ones shared with task handlers live in app_services)
+job_search = JobSearch()
+job_listing = JobListing()
 auth_service = AuthService()
 file_processor = FileProcessor()
 error_handler = ErrorHandler()
 
+startup_tracker.mark("imported")
+
+def build_job_response(job: Job, match_score: float = 0.0) -> JobMatchResponse:
+    """Map a Job row onto a JobMatchResponse for job listings"""
+    return JobMatchResponse(
+        job_id=job.id,
+        title=job.title,
+        company=job.company,
+        location=job.location,
+        salary_range=job.salary_range,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        salary_currency=job.salary_currency,
+        salary_period=job.salary_period,
+        description=job.description,
+        required_skills=json.loads(job.required_skills) if job.required_skills else [],
+        preferred_skills=json.loads(job.preferred_skills) if job.preferred_skills else [],
+        industry=job.industry or "",
+        experience_level=job.experience_level or "",
+        employment_type=job.employment_type or "",
+        remote_work=bool(job.remote_work),
+        posted_date=job.posted_date or datetime.utcnow(),
+        match_score=match_score,
+        match_reasons=[]
+    )
+
+def build_task_status(task: QueuedTask) -> TaskStatusResponse:
+    """Map a queued task onto its status response"""
+    return TaskStatusResponse(
+        task_id=task.id,
+        name=task.name,
+        status=task.status,
+        attempts=task.attempts,
+        max_attempts=task.max_attempts,
+        error=task.error,
+        created_at=datetime.utcfromtimestamp(task.created_at),
+        updated_at=datetime.utcfromtimestamp(task.updated_at)
+    )
+
+async def submit_task(name: str, payload: Optional[dict] = None) -> TaskSubmitResponse:
+    """Queue a task off the event loop and return its id without waiting for a worker"""
+    task = await asyncio.to_thread(task_queue.submit, name, payload or {})
+    return TaskSubmitResponse(task_id=task.id, name=task.name, status=task.status)
+
+def check_stream_format(stream: Optional[str]):
+    """Reject unknown ?stream= values"""
+    if stream is not None and stream not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid stream format. Use one of: {', '.join(STREAM_FORMATS)}"
+        )
+
+async def stream_batch_analysis(resume_ids: List[int]):
+    """Yield a result or error event per resume as soon as it is analyzed.
+    
+    Resumes are loaded and analysis rows committed in chunks, and at most
+    settings.stream_window analyses are in flight, so memory does not grow
+    with the batch size.
+    """
+    db = SessionLocal()
+    successful = 0
+    failed = 0
+    records = []
+    
+    def load_resumes():
+        for chunk in chunked(resume_ids, settings.stream_chunk_size):
+            found = {
+                resume.id: resume
+                for resume in db.query(Resume).filter(Resume.id.in_(chunk)).all()
+            }
+            for resume_id in chunk:
+                yield resume_id, found.get(resume_id)
+    
+    async def analyze_item(item):
+        resume_id, resume = item
+        if resume is None:
+            return None
+        return await analyze_content(resume.content, db)
+    
+    async def store_records(records: List[AnalysisResult]):
+        stored_ids = [record.resume_id for record in records]
+        db.add_all(records)
+        db.commit()
+        for resume_id in stored_ids:
+            await queue_match_materialization(resume_id)
+    
+    try:
+        async for (resume_id, _), analysis_result, error in bounded_map(
+            analyze_item, load_resumes(), settings.stream_window
+        ):
+            if error is not None or analysis_result is None:
+                failed += 1
+                if error is not None:
+                    logger.error(f"Batch analysis error for resume {resume_id}: {str(error)}")
+                    payload = error_handler.create_error_response(error, request_id=str(resume_id))
+                else:
+                    payload = ErrorResponse(
+                        error="NotFound",
+                        detail="Resume not found",
+                        timestamp=datetime.utcnow(),
+                        request_id=str(resume_id)
+                    )
+                yield "error", payload
+                continue
+            
+            successful += 1
+            records.append(build_analysis_record(resume_id, analysis_result))
+            if len(records) >= settings.stream_chunk_size:
+                await store_records(records)
+                records = []
+            
+            yield "result", {"resume_id": resume_id, "analysis": analysis_result}
+        
+        await store_records(records)
+        yield "done", {
+            "total_processed": successful + failed,
+            "successful": successful,
+            "failed": failed
+        }
+        
+    except Exception as e:
+        logger.error(f"Batch analysis stream error: {str(e)}")
+        db.rollback()
+        yield "error", error_handler.create_error_response(e)
+        
+    finally:
+        db.close()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -70,6 +303,23 @@ async def root():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.get("/api/health/ready")
+async def readiness():
+    """Readiness probe: reports whether models are warm and startup timings"""
+    ready = startup_tracker.ready
+    body = {
+        "ready": ready,
+        "models_warm": analysis_pool.is_warm,
+        "analysis_backend": analysis_pool.backend,
+        "startup": startup_tracker.as_dict(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=body
+    )
+
 @app.post("/api/auth/register", response_model=UserResponse)
 async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
@@ -151,22 +401,14 @@ async def analyze_resume(
                 detail="Resume not found"
             )
         
-        # Analyze resume
-        analysis_result = await resume_analyzer.analyze_resume(resume.content)
+        # Analyze resume off the event loop (or reuse a cached analysis)
+        analysis_result = await analyze_content(resume.content, db)
         
         # Save analysis result
-        analysis = AnalysisResult(
-            resume_id=resume_id,
-            skills=json.dumps(analysis_result.skills),
-            experience_years=analysis_result.experience_years,
-            education_level=analysis_result.education_level,
-            industry=analysis_result.industry,
-            score=analysis_result.overall_score,
-            suggestions=json.dumps(analysis_result.suggestions),
-            analysis_date=datetime.utcnow()
-        )
+        analysis = build_analysis_record(resume_id, analysis_result)
         db.add(analysis)
         db.commit()
+        await queue_match_materialization(resume_id)
         
         return analysis_result
         
@@ -177,13 +419,237 @@ async def analyze_resume(
             detail=error_handler.handle_error(e)
         )
 
+@app.post("/api/resume/batch/analyze", response_model=BatchAnalysisResponse)
+async def batch_analyze_resumes(
+    request: BatchAnalysisRequest,
+    stream: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Analyze many resumes in one request, optionally streaming results"""
+    check_stream_format(stream)
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    
+    if stream:
+        return stream_events(stream_batch_analysis(resume_ids), stream)
+    
+    if len(resume_ids) > settings.analysis_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size exceeds maximum of {settings.analysis_batch_max_size} resumes"
+        )
+    
+    try:
+        # Load every requested resume in a single query
+        resumes = {
+            resume.id: resume
+            for resume in db.query(Resume).filter(Resume.id.in_(resume_ids)).all()
+        }
+        
+        results = {}
+        errors = []
+        pending = {}  # content hash -> resume ids sharing that content
+        contents = {}
+        for resume_id in resume_ids:
+            resume = resumes.get(resume_id)
+            if resume is None:
+                errors.append(ErrorResponse(
+                    error="NotFound",
+                    detail="Resume not found",
+                    timestamp=datetime.utcnow(),
+                    request_id=str(resume_id)
+                ))
+                continue
+            
+            content_hash = analysis_cache.key_for(resume.content)
+            cached = analysis_cache.get(db, content_hash) if settings.analysis_cache_enabled else None
+            if cached is not None:
+                results[resume_id] = cached
+            else:
+                pending.setdefault(content_hash, []).append(resume_id)
+                contents[content_hash] = resume.content
+        
+        # Identical documents in the batch are analyzed once
+        hashes = list(pending)
+        outcomes = await analysis_pool.analyze_many([contents[content_hash] for content_hash in hashes])
+        
+        for content_hash, outcome in zip(hashes, outcomes):
+            if isinstance(outcome, Exception):
+                for resume_id in pending[content_hash]:
+                    logger.error(f"Batch analysis error for resume {resume_id}: {str(outcome)}")
+                    errors.append(ErrorResponse(**error_handler.create_error_response(
+                        outcome, request_id=str(resume_id)
+                    )))
+                continue
+            
+            if settings.analysis_cache_enabled:
+                analysis_cache.put(db, content_hash, outcome)
+            for resume_id in pending[content_hash]:
+                results[resume_id] = outcome
+        
+        # Persist all analysis rows with a single commit
+        ordered_results = [(resume_id, results[resume_id]) for resume_id in resume_ids if resume_id in results]
+        db.add_all([
+            build_analysis_record(resume_id, analysis_result)
+            for resume_id, analysis_result in ordered_results
+        ])
+        db.commit()
+        for resume_id, _ in ordered_results:
+            await queue_match_materialization(resume_id)
+        
+        return BatchAnalysisResponse(
+            total_processed=len(resume_ids),
+            successful=len(ordered_results),
+            failed=len(errors),
+            results=[analysis_result for _, analysis_result in ordered_results],
+            errors=errors
+        )
+        
+    except Exception as e:
+        logger.error(f"Batch analysis error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.post("/api/tasks/analyze/{resume_id}", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis_task(
+    resume_id: int,
+    db: Session = Depends(get_db)
+):
+    """Queue a resume analysis and return its task id immediately"""
+    if not db.query(Resume.id).filter(Resume.id == resume_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    try:
+        return await submit_task("analyze_resume", {"resume_id": resume_id})
+        
+    except Exception as e:
+        logger.error(f"Task submit error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.post("/api/tasks/backfill", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_backfill_task(restart: bool = False):
+    """Queue re-analysis of resumes analyzed by an older model version"""
+    # The backfill re-queues itself slice by slice; a second chain would
+    # share its checkpoint and analyze the same resumes twice
+    if await asyncio.to_thread(task_queue.broker.has_pending, "reanalysis_backfill"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A re-analysis backfill is already queued or running"
+        )
+    return await submit_task("reanalysis_backfill", {"restart": restart})
+
+@app.post("/api/tasks/tfidf/refit", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_tfidf_refit_task():
+    """Queue a refit of the job skills TF-IDF model outside its schedule"""
+    return await submit_task("refit_tfidf", {"force": True})
+
+@app.post("/api/tasks/semantic-index/build", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_semantic_index_task():
+    """Queue a rebuild of the semantic job index outside its schedule"""
+    return await submit_task("build_semantic_index", {"force": True})
+
+@app.post("/api/tasks/trends/rebuild", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job_trends_rebuild_task():
+    """Queue a recount of the job trend counters (after bulk SQL job changes)"""
+    return await submit_task("rebuild_job_trends")
+
+@app.post("/api/tasks/skills/migrate", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_skill_migration_task():
+    """Queue a relink of the skills tables (after bulk SQL job or analysis changes)"""
+    return await submit_task("migrate_skills")
+
+@app.post("/api/tasks/salaries/migrate", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_salary_migration_task():
+    """Queue a re-parse of the job salary columns (after bulk SQL job changes)"""
+    return await submit_task("migrate_salaries")
+
+@app.post("/api/tasks/locations/migrate", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_location_migration_task():
+    """Queue a re-resolve of the job coordinate columns (after bulk SQL job or gazetteer changes)"""
+    return await submit_task("migrate_locations")
+
+@app.get("/api/tasks/stats")
+async def get_task_stats():
+    """Get task counts per status"""
+    return await asyncio.to_thread(task_queue.stats)
+
+@app.get("/api/tasks/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(task_id: str):
+    """Poll the status of a background task"""
+    task = await asyncio.to_thread(task_queue.get, task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    return build_task_status(task)
+
+@app.get("/api/tasks/{task_id}/result", response_model=TaskResultResponse)
+async def get_task_result(task_id: str):
+    """Get the result of a finished task (202 while it is still pending)"""
+    task = await asyncio.to_thread(task_queue.get, task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    response = TaskResultResponse(**build_task_status(task).model_dump(), result=task.result)
+    if task.status not in (SUCCEEDED, DEAD):
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=response.model_dump(mode="json"))
+    return response
+
+@app.post("/api/tasks/{task_id}/retry", response_model=TaskStatusResponse)
+async def retry_task(task_id: str):
+    """Move a dead-lettered task back to the queue"""
+    task = await asyncio.to_thread(task_queue.requeue, task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only dead-lettered tasks can be retried"
+        )
+    return build_task_status(task)
+
 @app.get("/api/jobs/match/{resume_id}", response_model=List[JobMatchResponse])
 async def get_job_matches(
     resume_id: int,
+    response: Response,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    skill: List[str] = Query([]),
+    salary_min: Optional[float] = Query(None, ge=0),
+    salary_currency: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: Optional[float] = Query(None, gt=0),
+    stream: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get job matches for a resume"""
+    """Get a page of stored job matches for a resume (the next page's cursor is
+    returned in X-Next-Cursor), optionally only jobs listing every ?skill= and
+    paying at least ?salary_min= a year (with its salary_match_score), or
+    stream them live as they are scored. ?near= (a city) scores the best
+    matches live with location scores decaying with the distance from it,
+    within ?radius_km= if given"""
+    check_stream_format(stream)
+    origin = resolve_near(near, radius_km)
+    if origin is not None and (cursor or skill or salary_min is not None or stream):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="near cannot be combined with cursor, skill, salary or stream parameters"
+        )
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     try:
         # Get resume and analysis
         resume = db.query(Resume).filter(Resume.id == resume_id).first()
@@ -195,7 +661,7 @@ async def get_job_matches(
         
         analysis = db.query(AnalysisResult).filter(
             AnalysisResult.resume_id == resume_id
-        ).first()
+        ).order_by(AnalysisResult.analysis_date.desc()).first()
         
         if not analysis:
             raise HTTPException(
@@ -203,8 +669,21 @@ async def get_job_matches(
                 detail="Resume analysis not found. Please analyze the resume first."
             )
         
-        # Get job matches
-        matches = await job_matcher.find_matches(analysis, limit)
+        if stream:
+            return stream_events(
+                job_matcher.stream_matches(analysis, limit),
+                stream
+            )
+        
+        if origin is not None:
+            return await asyncio.to_thread(job_matcher.find_matches, analysis, limit, origin, radius_km)
+        
+        # Serve the materialized matches (recomputed first if out of date)
+        matches, next_cursor = await asyncio.to_thread(
+            match_store.page, db, resume_id, analysis, limit, cursor, skill, salary_min, salary_currency
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         return matches
         
@@ -215,36 +694,223 @@ async def get_job_matches(
             detail=error_handler.handle_error(e)
         )
 
-@app.get("/api/jobs", response_model=List[JobMatchResponse])
+def resolve_near(near: Optional[str], radius_km: Optional[float]) -> Optional[GeoPoint]:
+    """Gazetteer place of a ?near= parameter (400 if unknown, or if radius_km comes without it)"""
+    if near is None:
+        if radius_km is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="radius_km requires near")
+        return None
+    origin = gazetteer.resolve(near)
+    if origin is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown location: {near}")
+    return origin
+
+def check_semantic_index():
+    if job_matcher.semantic_index.index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic job index is not built yet"
+        )
+
+@app.get("/api/jobs/semantic/{resume_id}", response_model=List[JobMatchResponse])
+async def get_semantic_job_matches(
+    resume_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    nprobe: Optional[int] = Query(None, ge=1, description="IVF lists to scan; higher = better recall, slower"),
+    db: Session = Depends(get_db)
+):
+    """Get jobs whose descriptions are closest in meaning to a resume"""
+    check_semantic_index()
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    try:
+        analysis = db.query(AnalysisResult).filter(
+            AnalysisResult.resume_id == resume_id
+        ).order_by(AnalysisResult.analysis_date.desc()).first()
+        
+        return await asyncio.to_thread(
+            job_matcher.find_semantic_matches, analysis, resume.content, limit, nprobe
+        )
+        
+    except Exception as e:
+        logger.error(f"Semantic job search error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.get("/api/jobs/{job_id}/similar", response_model=List[JobMatchResponse])
+async def get_similar_jobs(
+    job_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    nprobe: Optional[int] = Query(None, ge=1, description="IVF lists to scan; higher = better recall, slower")
+):
+    """Get active jobs closest in meaning to a job"""
+    check_semantic_index()
+    try:
+        matches = await asyncio.to_thread(job_matcher.find_similar_jobs, job_id, limit, nprobe)
+        
+    except Exception as e:
+        logger.error(f"Similar jobs error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+    
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return matches
+
+@app.get("/api/jobs/{job_id}/candidates", response_model=List[CandidateMatchResponse])
+async def get_job_candidates(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000)
+):
+    """Get the analyzed resumes that best match a job"""
+    try:
+        candidates = await asyncio.to_thread(job_matcher.find_candidates, job_id, limit, offset)
+        
+    except Exception as e:
+        logger.error(f"Candidate search error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+    
+    if candidates is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return candidates
+
+@app.post("/api/candidates/search", response_model=List[CandidateMatchResponse])
+async def search_candidates(request: ResumeSearchRequest):
+    """Search analyzed resumes by skills, experience, education and industry"""
+    if not 1 <= request.limit <= 100 or not 0 <= request.offset <= 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be between 1 and 100 and offset between 0 and 1000"
+        )
+    
+    try:
+        return await asyncio.to_thread(job_matcher.search_candidates, request)
+        
+    except Exception as e:
+        logger.error(f"Candidate search error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.post("/api/jobs/search", response_model=List[JobMatchResponse])
+async def search_jobs(request: JobSearchRequest, db: Session = Depends(get_db)):
+    """Full-text search of active jobs (keywords ranked by BM25 over title,
+    company and description) with location, structured and annual salary
+    range filters; the relevance is returned as match_score"""
+    if not 1 <= request.limit <= 100 or not 0 <= request.offset <= 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be between 1 and 100 and offset between 0 and 1000"
+        )
+    if request.radius_km is not None:
+        if request.radius_km <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="radius_km must be positive")
+        resolve_near(request.location or "", None)
+    
+    try:
+        results = await asyncio.to_thread(job_search.search, db, request)
+        return [build_job_response(job, round(relevance, 4)) for job, relevance in results]
+        
+    except Exception as e:
+        logger.error(f"Job search error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.post("/api/jobs/import", response_model=TaskSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_jobs(file: UploadFile = File(...), format: Optional[str] = None):
+    """Queue a bulk import of a JSONL or CSV job feed, upserted on external_id
+    (?format= overrides the file extension); the task result reports the
+    inserted, updated and invalid rows and rows/sec"""
+    feed_format = format or detect_format(file.filename)
+    if feed_format not in FEED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown feed format. Use one of: {', '.join(FEED_FORMATS)}"
+        )
+    
+    try:
+        # Spooled to disk so the task can stream it in slices
+        directory = os.path.join(settings.upload_directory, "imports")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.{feed_format}")
+        with open(path, "wb") as handle:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, handle, 1024 * 1024)
+        
+        return await submit_task("import_jobs", {"path": path, "format": feed_format})
+        
+    except Exception as e:
+        logger.error(f"Job import error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.get("/api/jobs", response_model=List[JobListItem], response_model_exclude_unset=True)
 async def get_all_jobs(
-    skip: int = 0,
-    limit: int = 20,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     industry: Optional[str] = None,
+    skill: List[str] = Query([]),
+    required_only: bool = False,
+    salary_min: Optional[float] = Query(None, ge=0),
+    salary_max: Optional[float] = Query(None, ge=0),
+    salary_currency: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: float = Query(50.0, gt=0, le=20000),
     db: Session = Depends(get_db)
 ):
-    """Get all available jobs with optional filtering"""
+    """Get jobs, newest first (the next page's cursor is returned in
+    X-Next-Cursor). ?fields= is a comma-separated list of the response fields
+    to load; ?skill= may repeat and jobs must list every one, as a required
+    skill with required_only; ?salary_min=/?salary_max= keep jobs whose
+    annual salary range overlaps them; ?near= (a city) keeps jobs within
+    ?radius_km= of it"""
+    center = resolve_near(near, None)
     try:
-        query = db.query(Job)
-        
+        field_names = parse_fields(fields)
+        if cursor:
+            decode_job_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        filters = []
         if industry:
-            query = query.filter(Job.industry.ilike(f"%{industry}%"))
-        
-        jobs = query.offset(skip).limit(limit).all()
-        
-        return [
-            JobMatchResponse(
-                job_id=job.id,
-                title=job.title,
-                company=job.company,
-                location=job.location,
-                salary_range=job.salary_range,
-                description=job.description,
-                required_skills=json.loads(job.required_skills) if job.required_skills else [],
-                match_score=0.0,
-                match_reasons=[]
-            )
-            for job in jobs
-        ]
+            filters.append(Job.industry.ilike(f"%{industry}%"))
+        if skill:
+            filters.append(Job.id.in_(job_matcher.skill_catalog.job_filter(db, skill, required_only)))
+        filters.extend(salary_conditions(salary_min, salary_max, salary_currency))
+        if center is not None:
+            filters.extend(radius_conditions(center, radius_km))
+        
+        jobs, next_cursor = await asyncio.to_thread(job_listing.page, db, limit, cursor, field_names, filters)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        
+        return jobs
         
     except Exception as e:
         logger.error(f"Jobs fetch error: {str(e)}")
@@ -274,7 +940,7 @@ async def get_dashboard_analytics(db: Session = Depends(get_db)):
                 {
                     "id": analysis.id,
                     "resume_id": analysis.resume_id,
-                    "score": analysis.score,
+                    "score": analysis.overall_score,
                     "industry": analysis.industry,
                     "analysis_date": analysis.analysis_date.isoformat()
                 }
@@ -289,6 +955,70 @@ async def get_dashboard_analytics(db: Session = Depends(get_db)):
             detail=error_handler.handle_error(e)
         )
 
+@app.get("/api/analytics/trends")
+async def get_job_market_trends(days: Optional[int] = Query(None, ge=1, le=3650)):
+    """Get job market trends of active jobs, or of those posted in the last `days` days"""
+    trends = await job_matcher.analyze_job_market_trends(days)
+    if "error" in trends and trends["error"] != "No jobs found for analysis":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error analyzing job market trends"
+        )
+    return trends
+
+@app.get("/api/analytics/skills")
+async def get_skill_demand(limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
+    """Get the skills most listed by active jobs, with how many resumes have them"""
+    try:
+        return await asyncio.to_thread(job_matcher.skill_catalog.demand, db, limit)
+        
+    except Exception as e:
+        logger.error(f"Skill demand error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.get("/api/analytics/backfill")
+async def get_backfill_analytics():
+    """Get re-analysis backfill progress for the current model version"""
+    try:
+        return await asyncio.to_thread(reanalysis_backfill.status)
+        
+    except Exception as e:
+        logger.error(f"Backfill status error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_handler.handle_error(e)
+        )
+
+@app.get("/api/analytics/cache")
+async def get_cache_analytics():
+    """Get analysis cache hit/miss statistics"""
+    return {
+        "enabled": settings.analysis_cache_enabled,
+        "persist": analysis_cache.persist,
+        **analysis_cache.stats()
+    }
+
+@app.get("/api/analytics/tfidf")
+async def get_tfidf_analytics():
+    """Get the version and size of the current TF-IDF model"""
+    return {
+        "refit_interval": settings.tfidf_refit_interval,
+        **await asyncio.to_thread(job_matcher.tfidf_model.status)
+    }
+
+@app.get("/api/analytics/candidates")
+async def get_candidate_analytics():
+    """Get the size of the candidate search index"""
+    return job_matcher.candidate_index.stats()
+
+@app.get("/api/analytics/semantic")
+async def get_semantic_analytics():
+    """Get the version, size and search parameters of the semantic job index"""
+    return await asyncio.to_thread(job_matcher.semantic_index.status)
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
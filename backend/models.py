@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Float, ForeignKey, Boolean, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 from datetime import datetime
@@ -38,11 +38,23 @@ class Job(Base):
     __tablename__ = "jobs"
     
     id = Column(Integer, primary_key=True, index=True)
+    external_id = Column(String(255))  # partner feed id, the upsert key of bulk imports
     title = Column(String(255), nullable=False, index=True)
     company = Column(String(255), nullable=False, index=True)
     location = Column(String(255), nullable=False)
+    # Resolved from location through the gazetteer by services/job_geo.py
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12))
     salary_range = Column(String(100))
-    description = Column(Text, nullable=False)
+    # Parsed from salary_range by services/job_salaries.py, in annual amounts
+    salary_min = Column(Float, index=True)
+    salary_max = Column(Float, index=True)
+    salary_currency = Column(String(3), index=True)  # ISO code
+    salary_period = Column(String(10))  # period the posting quoted: hour, day, week, month, year
+    # Large columns are loaded on access; listings skip them, full readers
+    # use undefer_group("details")
+    description = deferred(Column(Text, nullable=False), group="details")
     required_skills = Column(Text)  # JSON string
     preferred_skills = Column(Text)  # JSON string
     industry = Column(String(100), index=True)
@@ -52,11 +64,71 @@ class Job(Base):
     posted_date = Column(DateTime, default=datetime.utcnow)
     application_deadline = Column(DateTime)
     is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Additional fields for better matching
     company_size = Column(String(50))  # Startup, Small, Medium, Large, Enterprise
-    benefits = Column(Text)  # JSON string
-    requirements = Column(Text)  # JSON string
+    benefits = deferred(Column(Text), group="details")  # JSON string
+    requirements = deferred(Column(Text), group="details")  # JSON string
+    
+    __table_args__ = (
+        # Newest-first listing with keyset pagination
+        Index("ix_jobs_posted_id", "posted_date", "id"),
+        # Radius queries: geohash prefix ranges, distance checked from the index
+        Index("ix_jobs_geo", "geohash", "latitude", "longitude"),
+        Index("ux_jobs_external_id", "external_id", unique=True),
+    )
+
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    # Canonical skill names; job_skills and resume_skills reference them by id
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)  # display form, as first seen
+    normalized_name = Column(String(255), unique=True, index=True, nullable=False)  # lowercased, single-spaced
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class JobSkill(Base):
+    __tablename__ = "job_skills"
+    
+    # Mirrors Job.required_skills / Job.preferred_skills, kept current by services/skill_catalog.py
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    is_required = Column(Boolean, nullable=False, default=True)  # False: preferred
+    
+    __table_args__ = (
+        # Jobs by skill (and required/preferred) without touching the jobs table
+        Index("ix_job_skills_skill", "skill_id", "is_required", "job_id"),
+    )
+
+class ResumeSkill(Base):
+    __tablename__ = "resume_skills"
+    
+    # Skills of each resume's latest analysis, kept current by services/skill_catalog.py
+    resume_id = Column(Integer, ForeignKey("resumes.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analysis_results.id"), nullable=False, index=True)
+    confidence = Column(Float)  # analyzer confidence (unknown for analyses migrated from JSON)
+    category = Column(String(50))  # Technical, Soft, Language, etc.
+    
+    __table_args__ = (
+        Index("ix_resume_skills_skill", "skill_id", "resume_id"),
+    )
+
+class JobTrendCount(Base):
+    __tablename__ = "job_trend_counts"
+    
+    # Active-job counters per posted day, kept current on every job
+    # insert/update/delete by services/job_trends.py
+    id = Column(Integer, primary_key=True, index=True)
+    dimension = Column(String(30), nullable=False)  # total, skill, industry, experience_level, salary_band, remote
+    value = Column(String(255), nullable=False)
+    posted_day = Column(Date, nullable=False, index=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ux_job_trend_counts_key", "dimension", "value", "posted_day", unique=True),
+    )
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
@@ -90,6 +162,36 @@ class AnalysisResult(Base):
     
     # Relationships
     resume = relationship("Resume", back_populates="analyses")
+    
+    __table_args__ = (
+        Index("ix_analysis_results_resume_version", "resume_id", "model_version"),
+    )
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of normalized resume text
+    model_version = Column(String(50), nullable=False)
+    analysis = Column(Text, nullable=False)  # JSON serialized ResumeAnalysisResponse
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("content_hash", "model_version", name="uq_analysis_cache_key"),
+    )
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    model_version = Column(String(50), unique=True, nullable=False)  # target analyzer version
+    last_resume_id = Column(Integer, default=0, nullable=False)  # keyset position
+    processed = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    status = Column(String(20), default="running", nullable=False)  # running, completed
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime)
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
@@ -118,6 +220,26 @@ class JobMatch(Base):
     # Relationships
     resume = relationship("Resume")
     job = relationship("Job")
+    
+    __table_args__ = (
+        # One row per resume/job pair (upserts), and the ranked page order
+        Index("ux_job_matches_resume_job", "resume_id", "job_id", unique=True),
+        Index("ix_job_matches_resume_rank", "resume_id", "overall_match_score", "job_id"),
+    )
+
+class JobMatchSet(Base):
+    __tablename__ = "job_match_sets"
+    
+    # What a resume's materialized job_matches rows were computed from
+    resume_id = Column(Integer, ForeignKey("resumes.id"), primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analysis_results.id"), nullable=False)
+    scoring_version = Column(String(50))  # TF-IDF model version used for skills similarity
+    jobs_watermark = Column(DateTime, index=True)  # latest Job.updated_at reflected in the rows
+    truncated = Column(Boolean, default=False, nullable=False)  # more jobs passed than were kept
+    min_score = Column(Float)  # lowest kept score when truncated
+    stale = Column(Boolean, default=False, nullable=False)  # needs a full recompute
+    computed_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
@@ -88,6 +88,10 @@ class JobMatchResponse(BaseModel):
     company: str
     location: str
     salary_range: Optional[str] = None
+    salary_min: Optional[float] = None  # annual, parsed from salary_range
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
     description: str
     required_skills: List[str]
     preferred_skills: List[str] = []
@@ -98,6 +102,8 @@ class JobMatchResponse(BaseModel):
     
     # Match Information
     match_score: float
+    salary_match_score: Optional[float] = None  # share of the salary range at or above ?salary_min=
+    distance_km: Optional[float] = None  # from ?near=, when the job location is known
     match_reasons: List[str]
     missing_skills: List[str] = []
     extra_skills: List[str] = []
@@ -109,6 +115,31 @@ class JobMatchResponse(BaseModel):
     posted_date: datetime
     application_deadline: Optional[datetime] = None
 
+class JobListItem(BaseModel):
+    # GET /api/jobs sets only the ?fields= requested (all by default)
+    job_id: int
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    salary_range: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    description: Optional[str] = None
+    required_skills: Optional[List[str]] = None
+    preferred_skills: Optional[List[str]] = None
+    industry: Optional[str] = None
+    experience_level: Optional[str] = None
+    employment_type: Optional[str] = None
+    remote_work: Optional[bool] = None
+    company_size: Optional[str] = None
+    benefits: Optional[List[str]] = None
+    requirements: Optional[List[str]] = None
+    posted_date: Optional[datetime] = None
+    application_deadline: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
 class JobSearchRequest(BaseModel):
     keywords: Optional[str] = None
     location: Optional[str] = None
@@ -116,11 +147,53 @@ class JobSearchRequest(BaseModel):
     experience_level: Optional[str] = None
     employment_type: Optional[str] = None
     remote_work: Optional[bool] = None
-    salary_min: Optional[int] = None
+    salary_min: Optional[int] = None  # annual; jobs whose salary range overlaps the bounds
     salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    radius_km: Optional[float] = None  # jobs within this distance of `location` instead of matching its words
     limit: int = 20
     offset: int = 0
 
+class JobImportRecord(BaseModel):
+    # One job of a bulk feed (JSONL object or CSV row), upserted on external_id.
+    # List fields accept a JSON array or, in CSV cells, comma-separated text
+    external_id: str
+    title: str
+    company: str
+    location: str
+    description: str
+    salary_range: Optional[str] = None
+    required_skills: List[str] = []
+    preferred_skills: List[str] = []
+    industry: Optional[str] = None
+    experience_level: Optional[str] = None
+    employment_type: Optional[str] = None
+    remote_work: bool = False
+    company_size: Optional[str] = None
+    benefits: List[str] = []
+    requirements: List[str] = []
+    posted_date: Optional[datetime] = None  # kept (or now for new jobs) when absent
+    application_deadline: Optional[datetime] = None
+    is_active: bool = True
+    
+    @validator('external_id', 'title', 'company', 'location', 'description')
+    def validate_required_text(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('must not be empty')
+        return v
+    
+    @validator('required_skills', 'preferred_skills', 'benefits', 'requirements', pre=True)
+    def split_list(cls, v):
+        if v is None:
+            return []
+        if isinstance(v, str):
+            v = v.strip()
+            if v.startswith('['):
+                return json.loads(v)
+            return [item.strip() for item in v.split(',') if item.strip()]
+        return v
+
 class ResumeSearchRequest(BaseModel):
     skills: List[str] = []
     experience_years: Optional[float] = None
@@ -130,6 +203,24 @@ class ResumeSearchRequest(BaseModel):
     limit: int = 20
     offset: int = 0
 
+class CandidateMatchResponse(BaseModel):
+    resume_id: int
+    analysis_id: int
+    filename: str
+    
+    # Match Information
+    match_score: float
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    
+    # Latest analysis
+    skills: List[str] = []
+    experience_years: Optional[float] = None
+    education_level: Optional[str] = None
+    industry: Optional[str] = None
+    overall_score: Optional[float] = None
+    analysis_date: Optional[datetime] = None
+
 class DashboardAnalytics(BaseModel):
     total_resumes: int
     total_jobs: int
@@ -168,6 +259,24 @@ class BatchAnalysisResponse(BaseModel):
     results: List[ResumeAnalysisResponse]
     errors: List[ErrorResponse]
 
+class TaskSubmitResponse(BaseModel):
+    task_id: str
+    name: str
+    status: str
+
+class TaskStatusResponse(BaseModel):
+    task_id: str
+    name: str
+    status: str  # queued, running, succeeded, dead
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+class TaskResultResponse(TaskStatusResponse):
+    result: Optional[Any] = None
+
 class UserProfile(BaseModel):
     id: int
     email: str
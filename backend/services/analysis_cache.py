@@ -0,0 +1,142 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import AnalysisCacheEntry
+from schemas import ResumeAnalysisResponse
+from services.resume_analyzer import MODEL_VERSION, clean_resume_text
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Two-level cache of resume analyses keyed by normalized content hash.
+
+    Level one is an in-process LRU with size and TTL eviction, level two is
+    the analysis_cache table. Keys include the analyzer model version, so a
+    version bump never serves stale results.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        persist: Optional[bool] = None,
+        model_version: str = MODEL_VERSION
+    ):
+        self.max_entries = max_entries or settings.analysis_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.analysis_cache_ttl
+        self.persist = settings.analysis_cache_persist if persist is None else persist
+        self.model_version = model_version
+
+        self._entries: "OrderedDict[str, Tuple[float, ResumeAnalysisResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0
+        }
+
+    def key_for(self, resume_content: str) -> str:
+        """Hash the normalized resume text the analyzer actually sees"""
+        normalized = clean_resume_text(resume_content)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, db: Session, content_hash: str) -> Optional[ResumeAnalysisResponse]:
+        """Look up an analysis in memory, then in the persisted table"""
+        analysis = self._get_memory(content_hash)
+        if analysis is not None:
+            self._count("memory_hits")
+            return analysis
+
+        if self.persist:
+            entry = db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.content_hash == content_hash,
+                AnalysisCacheEntry.model_version == self.model_version
+            ).first()
+
+            if entry is not None:
+                analysis = ResumeAnalysisResponse.model_validate_json(entry.analysis)
+                self._put_memory(content_hash, analysis)
+                self._count("persistent_hits")
+                return analysis
+
+        self._count("misses")
+        return None
+
+    def put(self, db: Session, content_hash: str, analysis: ResumeAnalysisResponse):
+        """Store an analysis in both levels (the caller commits the session)"""
+        self._put_memory(content_hash, analysis)
+        self._count("stores")
+
+        if not self.persist:
+            return
+
+        try:
+            # Savepoint so a concurrent insert of the same key doesn't roll
+            # back the caller's transaction
+            with db.begin_nested():
+                db.add(AnalysisCacheEntry(
+                    content_hash=content_hash,
+                    model_version=self.model_version,
+                    analysis=analysis.model_dump_json()
+                ))
+        except IntegrityError:
+            logger.debug(f"Analysis cache entry {content_hash[:12]} already stored")
+
+    def clear(self):
+        """Drop the in-process level"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+
+        lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["model_version"] = self.model_version
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _get_memory(self, content_hash: str) -> Optional[ResumeAnalysisResponse]:
+        with self._lock:
+            item = self._entries.get(content_hash)
+            if item is None:
+                return None
+
+            stored_at, analysis = item
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[content_hash]
+                self._stats["expirations"] += 1
+                return None
+
+            self._entries.move_to_end(content_hash)
+            return analysis
+
+    def _put_memory(self, content_hash: str, analysis: ResumeAnalysisResponse):
+        with self._lock:
+            self._entries[content_hash] = (time.monotonic(), analysis)
+            self._entries.move_to_end(content_hash)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Union
+
+from config import settings
+from schemas import ResumeAnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+# Analyzer owned by a worker process, created once by the pool initializer
+_worker_analyzer = None
+
+
+def _init_worker():
+    """Load spaCy, NLTK resources and skill tables once per worker process"""
+    global _worker_analyzer
+    from services.resume_analyzer import ResumeAnalyzer
+
+    _worker_analyzer = ResumeAnalyzer()
+    _worker_analyzer.warm_up()
+
+
+def _analyze_in_worker(resume_content: str) -> ResumeAnalysisResponse:
+    """Task entry point executed inside a worker process"""
+    return _worker_analyzer.analyze(resume_content)
+
+
+def _ping() -> bool:
+    """No-op task used to spawn and warm up workers"""
+    return _worker_analyzer is not None
+
+
+class AnalysisPool:
+    """Runs resume analysis off the event loop.
+
+    Backends:
+    - inline: analysis runs in a thread of the API process
+    - process: analysis runs in a pool of pre-warmed worker processes that
+      are recycled after a number of tasks
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        task_timeout: Optional[float] = None
+    ):
+        self.backend = backend or settings.analysis_backend
+        self.workers = workers or settings.analysis_workers
+        self.max_tasks_per_worker = max_tasks_per_worker or settings.analysis_max_tasks_per_worker
+        self.task_timeout = task_timeout or settings.analysis_task_timeout
+
+        if self.backend not in ("inline", "process"):
+            raise ValueError(f"Unknown analysis backend: {self.backend}")
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._analyzer = None
+        self._warm = False
+
+    @property
+    def analyzer(self):
+        """In-process analyzer used by the inline backend"""
+        if self._analyzer is None:
+            from services.resume_analyzer import ResumeAnalyzer
+            self._analyzer = ResumeAnalyzer()
+        return self._analyzer
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether models are loaded wherever analysis will run"""
+        if self.backend == "inline":
+            return self._analyzer is not None and self._analyzer.is_warm
+        return self._executor is not None and self._warm
+
+    def warm_up(self):
+        """Load models ahead of the first request (blocking)"""
+        if self.backend == "inline":
+            self.analyzer.warm_up()
+        else:
+            self.start(warm=True)
+
+    def start(self, warm: bool = True):
+        """Create the worker pool and optionally pre-warm every worker"""
+        if self.backend != "process" or self._executor is not None:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            max_tasks_per_child=self.max_tasks_per_worker
+        )
+        logger.info(f"Started analysis pool with {self.workers} workers")
+
+        if warm:
+            futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+            self._warm = True
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self._warm = False
+            logger.info("Analysis pool stopped")
+
+    async def analyze(self, resume_content: str) -> ResumeAnalysisResponse:
+        """Analyze a resume without blocking the event loop"""
+        if self.backend == "inline":
+            return await asyncio.wait_for(
+                asyncio.to_thread(self.analyzer.analyze, resume_content),
+                timeout=self.task_timeout
+            )
+
+        if self._executor is None:
+            self.start(warm=False)
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, _analyze_in_worker, resume_content)
+            return await asyncio.wait_for(future, timeout=self.task_timeout)
+
+        except asyncio.TimeoutError:
+            # The worker keeps running until the task finishes; recycling
+            # bounds how long a slow worker stays around
+            raise Exception(f"Resume analysis timed out after {self.task_timeout}s")
+
+        except BrokenProcessPool:
+            logger.error("Analysis worker died, restarting pool")
+            self.shutdown(wait=False)
+            raise Exception("Resume analysis failed: worker process crashed")
+
+    async def analyze_many(self, resume_contents: List[str]) -> List[Union[ResumeAnalysisResponse, Exception]]:
+        """Analyze several resumes in parallel, at most one per worker at a time.
+
+        Results keep the input order; a failed item yields its exception
+        instead of failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def run(resume_content: str) -> ResumeAnalysisResponse:
+            async with semaphore:
+                return await self.analyze(resume_content)
+
+        return await asyncio.gather(
+            *(run(resume_content) for resume_content in resume_contents),
+            return_exceptions=True
+        )
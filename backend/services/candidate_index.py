@@ -0,0 +1,559 @@
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models import AnalysisResult, Resume
+from services.job_index import IndexedJob
+from services.tfidf_model import TfidfArtifact, TfidfModelStore, skills_text
+
+logger = logging.getLogger(__name__)
+
+# Same ranks as ResumeAnalyzer._get_highest_education_level
+EDUCATION_RANKS = {
+    'phd': 5,
+    'doctorate': 5,
+    'master': 4,
+    'bachelor': 3,
+    'associate': 2,
+    'diploma': 1,
+    'certificate': 1
+}
+
+
+def education_rank(education_level: Optional[str]) -> int:
+    """Rank of a degree name (0 when unknown or not specified)"""
+    level_lower = (education_level or "").lower()
+    return max((rank for level, rank in EDUCATION_RANKS.items() if level in level_lower), default=0)
+
+
+@dataclass(frozen=True)
+class IndexedCandidate:
+    """A resume's latest analysis with its JSON fields parsed"""
+    resume_id: int
+    analysis_id: int
+    filename: str
+    skills: List[str]
+    skills_lower: List[str]
+    skills_lower_set: frozenset
+    experience_years: Optional[float]
+    education_level: Optional[str]
+    education_rank: int
+    industry: Optional[str]
+    overall_score: Optional[float]
+    analysis_date: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class CandidateQuery:
+    """What candidates are ranked against: a job, or an ad-hoc search"""
+    required_skills: Tuple[str, ...]
+    experience_range: Optional[Tuple[float, float]]
+    industry: Optional[str]
+    location_score: float
+    min_education_rank: int = 0
+
+    @property
+    def required_lower(self) -> Tuple[str, ...]:
+        return tuple(skill.lower() for skill in self.required_skills)
+
+    @classmethod
+    def for_job(cls, job: IndexedJob, matcher) -> "CandidateQuery":
+        return cls(
+            required_skills=tuple(job.required_skills),
+            experience_range=job.experience_range,
+            industry=job.industry,
+            location_score=matcher._calculate_location_match(None, job)
+        )
+
+
+class CandidateSegment:
+    """Column-oriented view of a fixed set of candidates, ordered by resume id.
+
+    Skill and TF-IDF term posting lists map each skill / term to the
+    positions of the candidates having it. Candidates are grouped by the
+    attributes the other score components depend on (experience years,
+    industry) plus education rank, so candidates sharing no skill with a
+    query are scored once per group.
+    """
+
+    def __init__(self, candidates: List[IndexedCandidate], tfidf: Optional[TfidfArtifact]):
+        self.candidates = candidates
+        self.tfidf = tfidf
+        n_candidates = len(candidates)
+        self.resume_ids = np.array([candidate.resume_id for candidate in candidates], dtype=np.int64)
+        self.positions = {candidate.resume_id: position for position, candidate in enumerate(candidates)}
+
+        self.skill_ids: Dict[str, int] = {}
+        skill_rows, skill_cols = [], []
+        skill_count = np.zeros(n_candidates)
+        has_years = np.zeros(n_candidates)
+        years = np.zeros(n_candidates)
+        industry_ids: Dict[Optional[str], int] = {}
+        industry_codes = np.zeros(n_candidates)
+        education = np.zeros(n_candidates)
+
+        for row, candidate in enumerate(candidates):
+            for skill in candidate.skills_lower_set:
+                skill_rows.append(row)
+                skill_cols.append(self.skill_ids.setdefault(skill, len(self.skill_ids)))
+            skill_count[row] = len(candidate.skills_lower)
+            if candidate.experience_years is not None:
+                has_years[row] = 1.0
+                years[row] = candidate.experience_years
+            industry_codes[row] = industry_ids.setdefault(candidate.industry, len(industry_ids))
+            education[row] = candidate.education_rank
+
+        # candidate x skill indicator of each resume's skill set
+        self.skills = sparse.csr_matrix(
+            (np.ones(len(skill_rows)), (skill_rows, skill_cols)), shape=(n_candidates, len(self.skill_ids))
+        )
+        self.skill_postings = self.skills.tocsc()
+        self.skill_postings.sort_indices()
+
+        # TF-IDF vectors of the skills text; the matcher only blends in the
+        # similarity for resumes with more than one skill and known terms
+        self.vectors = None
+        self.term_postings = None
+        self.has_terms = np.zeros(n_candidates, dtype=bool)
+        if tfidf is not None and n_candidates:
+            self.vectors = tfidf.transform([skills_text(candidate.skills_lower) for candidate in candidates])
+            self.term_postings = self.vectors.tocsc()
+            self.term_postings.sort_indices()
+            self.has_terms = (skill_count > 1) & (np.diff(self.vectors.indptr) > 0)
+
+        # Facet groups: distinct (experience years, industry, education rank)
+        facets = np.column_stack([has_years, years, industry_codes, education]) if n_candidates else np.zeros((0, 4))
+        groups, self.group_of = np.unique(facets, axis=0, return_inverse=True)
+        self.group_of = self.group_of.ravel()
+        self.group_years = [value if has else None for has, value in groups[:, :2]]
+        self.group_industry_codes = groups[:, 2].astype(np.int64)
+        self.group_education = groups[:, 3].astype(np.int64)
+        self.industries = list(industry_ids)
+
+        # Members of each group in ascending position order
+        self.group_order = np.argsort(self.group_of, kind="stable")
+        self.group_offsets = np.concatenate([[0], np.cumsum(np.bincount(self.group_of, minlength=len(groups)))])
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.group_education)
+
+    def query_skills(self, required_lower: Tuple[str, ...]) -> np.ndarray:
+        """Count of each indexed skill in the required list (duplicates counted like the list scan)"""
+        counts = np.zeros(len(self.skill_ids))
+        for skill in required_lower:
+            column = self.skill_ids.get(skill)
+            if column is not None:
+                counts[column] += 1.0
+        return counts
+
+    def skills_scores(self, rows: np.ndarray, query_skills: np.ndarray, required_count: int,
+                      query_vector: Optional[sparse.csr_matrix]) -> np.ndarray:
+        """Skills component (JobMatcher._calculate_skills_match) for the candidates in rows"""
+        if required_count == 0:
+            return np.full(len(rows), 0.5)  # Neutral score if no required skills specified
+
+        exact = (self.skills[rows] @ query_skills) / required_count
+        if query_vector is None or self.vectors is None:
+            return exact
+        similarity = (self.vectors[rows] @ query_vector.T).toarray().ravel()
+        combined = np.minimum((exact * 0.7) + (similarity * 0.3), 1.0)
+        return np.where(self.has_terms[rows], combined, exact)
+
+    def candidate_positions(self, skill_columns: np.ndarray, term_columns: np.ndarray,
+                            skill_groups: np.ndarray, term_groups: np.ndarray) -> np.ndarray:
+        """Positions of candidates sharing a skill (in skill_groups) or a term
+        (in term_groups), ascending"""
+        lists = [self._postings(self.skill_postings, column, skill_groups) for column in skill_columns]
+        if self.term_postings is not None:
+            lists.extend(self._postings(self.term_postings, column, term_groups) for column in term_columns)
+        lists = [positions for positions in lists if len(positions)]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        if sum(len(positions) for positions in lists) * 16 < len(self):
+            return np.unique(np.concatenate(lists))
+
+        marked = np.zeros(len(self), dtype=bool)
+        for positions in lists:
+            marked[positions] = True
+        return np.flatnonzero(marked)
+
+    def group_members(self, group: int, limit: int, exclude: np.ndarray, excluded_in_group: int) -> np.ndarray:
+        """First `limit` positions of a group that are not in the sorted `exclude` array"""
+        members = self.group_order[self.group_offsets[group]:self.group_offsets[group + 1]]
+        head = members[:limit + excluded_in_group]
+        if excluded_in_group:
+            found = np.minimum(np.searchsorted(exclude, head), len(exclude) - 1)
+            head = head[exclude[found] != head]
+        return head[:limit]
+
+    def _postings(self, matrix: sparse.csc_matrix, column: int, groups: np.ndarray) -> np.ndarray:
+        positions = matrix.indices[matrix.indptr[column]:matrix.indptr[column + 1]]
+        return positions[groups[self.group_of[positions]]]
+
+
+class CandidateIndex:
+    """Long-lived in-memory index of the latest analysis of every resume,
+    for ranking candidates against a job or an ad-hoc search.
+
+    Scores are the job match scores seen from the job side: a candidate's
+    score for a job equals JobMatcher._calculate_match_score of its analysis
+    against that job. Built once from the database, then refreshed on read
+    when a newer AnalysisResult id exists, whichever process stored it:
+    re-analyzed and new resumes go to a small delta segment (their base
+    rows are masked out) that is recompiled on its own,
+    and the base is recompiled only when the delta outgrows max_delta, on
+    the periodic full rebuild, or when the TF-IDF model changes.
+    """
+
+    def __init__(
+        self,
+        matcher,
+        tfidf_model: TfidfModelStore,
+        rebuild_interval: Optional[float] = None,
+        max_delta: Optional[int] = None
+    ):
+        self.matcher = matcher
+        self.tfidf_model = tfidf_model
+        self.rebuild_interval = settings.candidate_index_rebuild_interval if rebuild_interval is None else rebuild_interval
+        self.max_delta = max_delta or settings.candidate_index_max_delta
+
+        self._candidates: Dict[int, IndexedCandidate] = {}
+        self._delta_ids: set = set()
+        self._watermark = 0  # highest AnalysisResult id seen
+        self._from_database = False  # loaded candidates (load()) have no rows to follow
+        # (base segment, sorted positions of superseded base rows, delta segment)
+        self._snapshot: Optional[Tuple[CandidateSegment, np.ndarray, CandidateSegment]] = None
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def ensure_fresh(self):
+        """Build the index if its rebuild interval has passed, else apply
+        analyses stored since the last read"""
+        if self._built_at is None or (
+            self._from_database and time.monotonic() - self._built_at >= self.rebuild_interval
+        ):
+            self.rebuild()
+        elif self._from_database:
+            latest = self._latest_analysis_id()
+            if latest > self._watermark:
+                self.refresh(latest=latest)
+
+    def rebuild(self, db: Optional[Session] = None):
+        """Load the latest analysis of every resume and recompile both segments"""
+        with self._lock:
+            started = time.monotonic()
+            owns_session = db is None
+            db = db or SessionLocal()
+            try:
+                candidates: Dict[int, IndexedCandidate] = {}
+                watermark = 0
+                for row in self._analysis_rows(db).order_by(AnalysisResult.id).yield_per(1000):
+                    watermark = max(watermark, row.id)
+                    self._keep_latest(candidates, row)
+            finally:
+                if owns_session:
+                    db.close()
+
+            self._candidates = candidates
+            self._watermark = watermark
+            self._from_database = True
+            self._compile_base(self.tfidf_model.artifact)
+            self._built_at = time.monotonic()
+            logger.info(f"Candidate index built with {len(candidates)} resumes in {(self._built_at - started) * 1000:.0f}ms")
+
+    def load(self, candidates: Iterable[IndexedCandidate]):
+        """Replace the index with already-parsed candidates (benchmarks, offline tools)"""
+        with self._lock:
+            self._candidates = {candidate.resume_id: candidate for candidate in candidates}
+            self._watermark = max((candidate.analysis_id for candidate in self._candidates.values()), default=0)
+            self._from_database = False
+            self._compile_base(self.tfidf_model.artifact)
+            self._built_at = time.monotonic()
+
+    def refresh(self, db: Optional[Session] = None, latest: int = 0):
+        """Apply analyses stored since the last refresh; the watermark moves
+        to at least latest (the highest id checked), so analyses of deleted
+        resumes are not looked up again"""
+        with self._lock:
+            owns_session = db is None
+            db = db or SessionLocal()
+            try:
+                rows = self._analysis_rows(db).filter(AnalysisResult.id > self._watermark).all()
+            finally:
+                if owns_session:
+                    db.close()
+
+            self._watermark = max(self._watermark, latest)
+            if not rows:
+                return
+
+            candidates = dict(self._candidates)
+            changed = set()
+            for row in rows:
+                self._watermark = max(self._watermark, row.id)
+                if self._keep_latest(candidates, row):
+                    changed.add(row.resume_id)
+            self._candidates = candidates
+            if not changed:
+                return
+
+            base, _, _ = self._snapshot
+            self._delta_ids |= changed
+            if len(self._delta_ids) > self.max_delta or base.tfidf is not self.tfidf_model.artifact:
+                self._compile_base(self.tfidf_model.artifact)
+            else:
+                self._compile_delta(base)
+
+    def segments(self) -> Tuple[CandidateSegment, np.ndarray, CandidateSegment]:
+        """Current (base, superseded base positions, delta), compiled under the current TF-IDF model"""
+        self.ensure_fresh()
+        artifact = self.tfidf_model.artifact
+        if self._snapshot[0].tfidf is not artifact:
+            with self._lock:
+                if self._snapshot[0].tfidf is not artifact:
+                    self._compile_base(artifact)
+        return self._snapshot
+
+    def search(self, query: CandidateQuery, k: int,
+               threshold: float = 0.3) -> List[Tuple[IndexedCandidate, float]]:
+        """Top-k candidates for a query, best first (ties by resume id)"""
+        if k <= 0:
+            return []
+        base, dead, delta = self.segments()
+        ranked = (
+            self._search_segment(base, dead, query, k, threshold) +
+            self._search_segment(delta, np.zeros(0, dtype=np.int64), query, k, threshold)
+        )
+        ranked.sort(key=lambda item: (-round(item[1], 2), item[0].resume_id))
+        return ranked[:k]
+
+    def _search_segment(self, segment: CandidateSegment, dead: np.ndarray, query: CandidateQuery,
+                        k: int, threshold: float) -> List[Tuple[IndexedCandidate, float]]:
+        """Top-k of one segment, pruned like MatchEngine.search: candidates
+        sharing no skill or term with the query score their group's score
+        exactly, so only the first members of the best groups are taken, and
+        posting lists are read only for groups that can reach the cutoff."""
+        if not len(segment):
+            return []
+
+        required_count = len(query.required_lower)
+        group_experience, group_industry, allowed, query_skills, query_vector = self._query_features(segment, query)
+
+        def overall(skills_score, groups: np.ndarray) -> np.ndarray:
+            return self._overall(skills_score, group_experience[groups], group_industry[groups], query.location_score)
+
+        def reaches(scores: np.ndarray, cutoff: float) -> np.ndarray:
+            return (scores > threshold) & (scores >= cutoff)
+
+        # Without required skills everyone scores 0.5 on skills; with them,
+        # candidates sharing nothing score 0 (a lower bound for the rest)
+        all_groups = np.arange(segment.n_groups)
+        group_scores = overall(0.0 if required_count else 0.5, all_groups)
+        group_scores[~allowed] = -1.0
+        group_order = np.argsort(-group_scores, kind="stable")
+        dead_per_group = np.bincount(segment.group_of[dead], minlength=segment.n_groups)
+        group_sizes = (np.diff(segment.group_offsets) - dead_per_group)[group_order]
+        filled = np.searchsorted(np.cumsum(group_sizes), k)
+        cutoff = threshold
+        if filled < len(group_order):
+            cutoff = max(cutoff, round(float(group_scores[group_order[filled]]), 2) - 0.0051)
+
+        candidates = np.zeros(0, dtype=np.int64)
+        if required_count:
+            candidates = segment.candidate_positions(
+                np.flatnonzero(query_skills),
+                query_vector.indices if query_vector is not None else np.zeros(0, dtype=np.int64),
+                skill_groups=allowed & reaches(overall(1.0, all_groups), cutoff),
+                term_groups=allowed & reaches(overall(0.3, all_groups), cutoff)
+            )
+            if len(dead):
+                candidates = candidates[np.isin(candidates, dead, assume_unique=True, invert=True)]
+
+        found_positions: List[np.ndarray] = []
+        found_scores: List[np.ndarray] = []
+        found_count = 0
+
+        def collect(positions: np.ndarray, scores: np.ndarray):
+            nonlocal found_count, cutoff
+            keep = reaches(scores, cutoff)
+            if not keep.any():
+                return
+            found_positions.append(positions[keep])
+            found_scores.append(scores[keep])
+            found_count += int(keep.sum())
+            if found_count >= k:
+                kth = np.partition(np.concatenate(found_scores), -k)[-k]
+                cutoff = max(cutoff, round(float(kth), 2) - 0.0051)
+
+        # Candidates sharing nothing with the query, best groups first
+        exclude = np.union1d(candidates, dead)
+        excluded_per_group = np.bincount(segment.group_of[exclude], minlength=segment.n_groups)
+        for group in group_order:
+            if not allowed[group] or not reaches(group_scores[group:group + 1], cutoff)[0]:
+                break
+            members = segment.group_members(group, k, exclude, int(excluded_per_group[group]))
+            collect(members, np.full(len(members), group_scores[group]))
+
+        # Candidates from the posting lists, best upper bound first
+        if len(candidates):
+            bounds = overall(np.ones(len(candidates)), segment.group_of[candidates])
+            order = np.argsort(-bounds, kind="stable")
+            candidates, bounds = candidates[order], bounds[order]
+            for start in range(0, len(candidates), 4096):
+                if not reaches(bounds[start:start + 1], cutoff)[0]:
+                    break
+                block = candidates[start:start + 4096]
+                skills_score = segment.skills_scores(block, query_skills, required_count, query_vector)
+                collect(block, overall(skills_score, segment.group_of[block]))
+
+        if not found_positions:
+            return []
+        positions = np.concatenate(found_positions)
+        scores = np.concatenate(found_scores)
+        return [(segment.candidates[position], float(score)) for position, score in zip(positions, scores)]
+
+    def score(self, query: CandidateQuery) -> Tuple[List[IndexedCandidate], np.ndarray]:
+        """Match score of every indexed candidate (filtered-out ones score 0),
+        the full scan search() avoids"""
+        base, dead, delta = self.segments()
+        candidates: List[IndexedCandidate] = []
+        scores = [np.zeros(0)]
+        for segment, superseded in ((base, dead), (delta, np.zeros(0, dtype=np.int64))):
+            if not len(segment):
+                continue
+            group_experience, group_industry, allowed, query_skills, query_vector = self._query_features(segment, query)
+            rows = np.setdiff1d(np.arange(len(segment)), superseded)
+            groups = segment.group_of[rows]
+            overall = self._overall(
+                segment.skills_scores(rows, query_skills, len(query.required_lower), query_vector),
+                group_experience[groups], group_industry[groups], query.location_score
+            )
+            scores.append(np.where(allowed[groups], overall, 0.0))
+            candidates.extend(segment.candidates[row] for row in rows)
+        return candidates, np.concatenate(scores)
+
+    def _query_features(self, segment: CandidateSegment, query: CandidateQuery):
+        """Experience and industry scores and education filter per facet group,
+        and the query's skill counts and TF-IDF vector in the segment's columns"""
+        group_experience = np.array([
+            self.matcher._calculate_experience_match(years, query.experience_range)
+            for years in segment.group_years
+        ])
+        industry_scores = np.array([
+            self.matcher._calculate_industry_match(industry, query.industry)
+            for industry in segment.industries
+        ])
+        group_industry = industry_scores[segment.group_industry_codes]
+        allowed = segment.group_education >= query.min_education_rank
+
+        required_lower = query.required_lower
+        query_vector = None
+        if len(required_lower) > 1 and segment.tfidf is not None:
+            vector = segment.tfidf.transform([skills_text(required_lower)])
+            if vector.nnz > 0:
+                query_vector = vector
+        return group_experience, group_industry, allowed, segment.query_skills(required_lower), query_vector
+
+    @staticmethod
+    def _overall(skills_score, experience_score: np.ndarray, industry_score: np.ndarray,
+                 location_score: float) -> np.ndarray:
+        # Same operation order as JobMatcher._calculate_match_score
+        return np.minimum(
+            skills_score * 0.4 +
+            experience_score * 0.3 +
+            industry_score * 0.2 +
+            location_score * 0.1,
+            1.0
+        )
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"built": False}
+        base, dead, delta = snapshot
+        return {
+            "built": True,
+            "resumes": len(self._candidates),
+            "base": len(base) - len(dead),
+            "delta": len(delta),
+            "skills": len(base.skill_ids),
+            "facet_groups": base.n_groups,
+            "tfidf_version": base.tfidf.version if base.tfidf is not None else None
+        }
+
+    def _latest_analysis_id(self) -> int:
+        """Highest stored AnalysisResult id (a primary key lookup)"""
+        db = SessionLocal()
+        try:
+            return db.query(func.max(AnalysisResult.id)).scalar() or 0
+        finally:
+            db.close()
+
+    def _analysis_rows(self, db: Session):
+        # Only the columns the index uses, not the suggestion texts
+        return db.query(
+            AnalysisResult.id, AnalysisResult.resume_id, AnalysisResult.skills,
+            AnalysisResult.experience_years, AnalysisResult.education_level, AnalysisResult.industry,
+            AnalysisResult.overall_score, AnalysisResult.analysis_date, Resume.filename
+        ).join(Resume, Resume.id == AnalysisResult.resume_id)
+
+    def _keep_latest(self, candidates: Dict[int, IndexedCandidate], row) -> bool:
+        """Index the row unless its resume already has a later analysis"""
+        current = candidates.get(row.resume_id)
+        if current is not None and (current.analysis_date or datetime.min, current.analysis_id) > \
+                (row.analysis_date or datetime.min, row.id):
+            return False
+
+        skills = json.loads(row.skills) if row.skills else []
+        skills_lower = [skill.lower() for skill in skills]
+        candidates[row.resume_id] = IndexedCandidate(
+            resume_id=row.resume_id,
+            analysis_id=row.id,
+            filename=row.filename,
+            skills=skills,
+            skills_lower=skills_lower,
+            skills_lower_set=frozenset(skills_lower),
+            experience_years=row.experience_years,
+            education_level=row.education_level,
+            education_rank=education_rank(row.education_level),
+            industry=row.industry,
+            overall_score=row.overall_score,
+            analysis_date=row.analysis_date
+        )
+        return True
+
+    def _compile_base(self, artifact: Optional[TfidfArtifact]):
+        started = time.monotonic()
+        base = CandidateSegment([self._candidates[resume_id] for resume_id in sorted(self._candidates)], artifact)
+        self._delta_ids = set()
+        self._snapshot = (base, np.zeros(0, dtype=np.int64), CandidateSegment([], artifact))
+        logger.info(
+            f"Candidate index compiled {len(base)} resumes, {len(base.skill_ids)} skills, "
+            f"{base.n_groups} groups in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+
+    def _compile_delta(self, base: CandidateSegment):
+        delta_ids = sorted(self._delta_ids)
+        dead = np.array(sorted(
+            base.positions[resume_id] for resume_id in delta_ids if resume_id in base.positions
+        ), dtype=np.int64)
+        delta = CandidateSegment([self._candidates[resume_id] for resume_id in delta_ids], base.tfidf)
+        self._snapshot = (base, dead, delta)
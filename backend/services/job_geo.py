@@ -0,0 +1,371 @@
+import os
+import re
+import csv
+import math
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, bindparam, event, or_, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cities.csv")
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi / 180 * EARTH_RADIUS_KM
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~5 m cells
+MAX_COVER_CELLS = 32  # geohash prefixes probed per radius query
+
+COUNTRY_NAMES = {
+    "US": ["usa", "united states", "united states of america"],
+    "CA": ["canada"],
+    "MX": ["mexico"],
+    "GB": ["uk", "united kingdom", "great britain", "england", "scotland", "wales", "northern ireland"],
+    "IE": ["ireland"],
+    "FR": ["france"],
+    "DE": ["germany"],
+    "NL": ["netherlands", "the netherlands"],
+    "BE": ["belgium"],
+    "LU": ["luxembourg"],
+    "ES": ["spain"],
+    "PT": ["portugal"],
+    "IT": ["italy"],
+    "CH": ["switzerland"],
+    "AT": ["austria"],
+    "CZ": ["czech republic", "czechia"],
+    "PL": ["poland"],
+    "SE": ["sweden"],
+    "DK": ["denmark"],
+    "NO": ["norway"],
+    "FI": ["finland"],
+    "EE": ["estonia"],
+    "LV": ["latvia"],
+    "LT": ["lithuania"],
+    "HU": ["hungary"],
+    "RO": ["romania"],
+    "BG": ["bulgaria"],
+    "RS": ["serbia"],
+    "GR": ["greece"],
+    "UA": ["ukraine"],
+    "TR": ["turkey", "turkiye"],
+    "IL": ["israel"],
+    "AE": ["uae", "united arab emirates"],
+    "SA": ["saudi arabia"],
+    "QA": ["qatar"],
+    "EG": ["egypt"],
+    "MA": ["morocco"],
+    "NG": ["nigeria"],
+    "GH": ["ghana"],
+    "KE": ["kenya"],
+    "RW": ["rwanda"],
+    "ZA": ["south africa"],
+    "PK": ["pakistan"],
+    "IN": ["india"],
+    "BD": ["bangladesh"],
+    "LK": ["sri lanka"],
+    "SG": ["singapore"],
+    "MY": ["malaysia"],
+    "ID": ["indonesia"],
+    "TH": ["thailand"],
+    "VN": ["vietnam", "viet nam"],
+    "PH": ["philippines"],
+    "HK": ["hong kong"],
+    "TW": ["taiwan"],
+    "CN": ["china"],
+    "JP": ["japan"],
+    "KR": ["south korea", "korea"],
+    "AU": ["australia"],
+    "NZ": ["new zealand"],
+    "BR": ["brazil"],
+    "AR": ["argentina"],
+    "CL": ["chile"],
+    "CO": ["colombia"],
+    "PE": ["peru"],
+    "UY": ["uruguay"],
+}
+
+US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "district of columbia": "dc",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id", "illinois": "il",
+    "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny",
+    "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or",
+    "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc", "south dakota": "sd",
+    "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va",
+    "washington": "wa", "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy",
+}
+
+# Other spellings -> gazetteer key
+ALIASES = {
+    "nyc": "new york|ny", "new york city": "new york|ny", "manhattan": "new york|ny", "brooklyn": "new york|ny",
+    "sf": "san francisco|ca", "bay area": "san francisco|ca", "sf bay": "san francisco|ca",
+    "silicon valley": "san jose|ca", "washington dc": "washington|dc", "dc": "washington|dc",
+    "saint louis": "st louis|mo", "saint paul": "st paul|mn", "philly": "philadelphia|pa",
+    "bengaluru": "bangalore", "gurugram": "gurgaon", "bombay": "mumbai", "madras": "chennai",
+    "calcutta": "kolkata", "munchen": "munich", "koln": "cologne", "frankfurt am main": "frankfurt",
+    "kiev": "kyiv", "saigon": "ho chi minh city", "quebec": "quebec city",
+}
+
+PREFIXES = re.compile(r"^(?:(?:fully\s+)?remote|hybrid|on\s*site|onsite|in\s*office|greater)\s+(?:in\s+)?")
+SUFFIXES = re.compile(r"\s+(?:metropolitan area|metro area|metro|area|region|hq|office)$")
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    """A place resolved through the gazetteer"""
+    name: str  # "Austin, TX, US"
+    latitude: float
+    longitude: float
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase ASCII words: accents, dots and punctuation removed"""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower().replace(".", "")
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", text).split())
+
+
+class Gazetteer:
+    """Offline city -> coordinates lookup over the bundled data/cities.csv.
+
+    Places are looked up as "city, region" (state or province code or name,
+    country code or name) and, failing that, as the city alone, which
+    resolves to its most populous namesake.
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH):
+        self.path = path
+        self._places: Optional[Dict[str, GeoPoint]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, GeoPoint]:
+        with self._lock:
+            if self._places is not None:
+                return self._places
+
+            places: Dict[str, GeoPoint] = {}
+            populations: Dict[str, int] = {}
+            with open(self.path, newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle):
+                    city = normalize_place(row["city"])
+                    point = GeoPoint(
+                        name=", ".join(part for part in (row["city"], row["region"], row["country"]) if part),
+                        latitude=float(row["latitude"]),
+                        longitude=float(row["longitude"])
+                    )
+                    regions = [row["region"], row["country"]] + COUNTRY_NAMES.get(row["country"], [])
+                    for region in filter(None, map(normalize_place, regions)):
+                        places.setdefault(f"{city}|{region}", point)
+                    population = int(row["population"] or 0)
+                    if population > populations.get(city, -1):
+                        places[city] = point
+                        populations[city] = population
+
+            logger.info(f"Gazetteer loaded with {len(populations)} places")
+            self._places = places
+            return places
+
+    def resolve(self, text: Optional[str]) -> Optional[GeoPoint]:
+        """Coordinates of a free-text location such as "Austin, TX",
+        "Hybrid - London, UK" or "München" (None for "Remote" or unknown places)"""
+        if not text:
+            return None
+        places = self._places if self._places is not None else self._load()
+
+        text = re.sub(r"\([^)]*\)", " ", text)
+        for segment in re.split(r"\s*(?:/|;|\||\bor\b|&)\s*", text):
+            parts = [normalize_place(part) for part in segment.split(",")]
+            if not parts or not parts[0]:
+                continue
+            city = SUFFIXES.sub("", PREFIXES.sub("", parts[0]))
+            if not city or city == "remote":
+                continue
+            regions = [" ".join(re.sub(r"\d", " ", part).split()) for part in parts[1:]]
+            regions = [US_STATES.get(region, region) for region in regions if region]
+
+            keys = [f"{city}|{region}" for region in regions] + [city]
+            keys += [ALIASES[key] for key in [f"{city} {region}" for region in regions] + [city] if key in ALIASES]
+            for key in keys:
+                point = places.get(key)
+                if point is not None:
+                    return point
+        return None
+
+
+gazetteer = Gazetteer()
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Base-32 geohash of a point"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        bounds, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_cover(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Geohash prefixes of the cells covering a circle: the finest precision
+    needing at most MAX_COVER_CELLS cells for its bounding box"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    widest = math.cos(math.radians(min(max(abs(south), abs(north)), 89.9)))
+    lon_delta = min(lat_delta / widest, 180.0)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits = 5 * precision // 2
+        lon_bits = 5 * precision - lat_bits
+        height, width = 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+        first_row = math.floor((south + 90) / height)
+        rows = min(math.floor((north + 90) / height), 2 ** lat_bits - 1) - first_row + 1
+        first_col = math.floor((longitude - lon_delta + 180) / width)
+        cols = min(math.floor((longitude + lon_delta + 180) / width) - first_col + 1, 2 ** lon_bits)
+        if rows * cols > MAX_COVER_CELLS and precision > 1:
+            continue
+
+        cells = set()
+        for row in range(rows):
+            cell_lat = (first_row + row + 0.5) * height - 90
+            for col in range(cols):
+                cell_lon = ((first_col + col + 0.5) * width) % 360.0 - 180
+                cells.add(geohash_encode(cell_lat, cell_lon, precision))
+        return sorted(cells)
+    return []
+
+
+def geo_values(location: Optional[str]) -> Dict[str, Any]:
+    """Job coordinate column values for a location text"""
+    point = gazetteer.resolve(location)
+    return {
+        "latitude": point.latitude if point else None,
+        "longitude": point.longitude if point else None,
+        "geohash": geohash_encode(point.latitude, point.longitude) if point else None,
+    }
+
+
+def distance_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle (haversine) distances in km from a point; works on scalars and arrays"""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distance_score(distances, half_life_km: Optional[float] = None):
+    """Location score decaying with distance: 1.0 on site, 0.5 at the half-life"""
+    return 0.5 ** (np.asarray(distances) / (half_life_km or settings.location_half_life_km))
+
+
+def radius_conditions(point: GeoPoint, radius_km: float) -> List[Any]:
+    """SQL conditions on jobs located within radius_km of a point: prefix
+    ranges over the geohash index, then an equirectangular distance check on
+    the indexed coordinates (within 1% of the great-circle distance at
+    radii up to a few hundred km)"""
+    cells = geohash_cover(point.latitude, point.longitude, radius_km)
+    in_cells = or_(*[and_(Job.geohash >= cell, Job.geohash < cell + "{") for cell in cells])
+    dy = (Job.latitude - point.latitude) * KM_PER_DEGREE
+    dx = (Job.longitude - point.longitude) * (KM_PER_DEGREE * math.cos(math.radians(point.latitude)))
+    return [in_cells, dx * dx + dy * dy <= radius_km * radius_km]
+
+
+def _on_location_set(job: Job, value, oldvalue, initiator):
+    """Keep the coordinate columns in step with every location assignment"""
+    for name, resolved in geo_values(value).items():
+        setattr(job, name, resolved)
+
+
+class JobGeo:
+    """Job coordinates and geohashes resolved from the free-text Job.location.
+
+    Every ORM assignment to location, including new jobs, resolves it
+    through the offline gazetteer, so radius queries are geohash prefix
+    range scans and the matcher scores distance from precomputed
+    coordinates. Bulk SQL writes bypass the attribute event; migrate()
+    re-resolves every job.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        if not event.contains(Job.location, "set", _on_location_set):
+            event.listen(Job.location, "set", _on_location_set)
+
+    def migrate(self, db: Optional[Session] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """Resolve the coordinates of every job from its location"""
+        owns_session = db is None
+        db = db or self.session_factory()
+        try:
+            connection = db.connection()
+            table = Job.__table__
+            statement = table.update().where(table.c.id == bindparam("job_id")).values(
+                latitude=bindparam("lat"), longitude=bindparam("lon"), geohash=bindparam("hash")
+            )
+            counts = {"jobs": 0, "located": 0}
+            last_id = 0
+            while True:
+                jobs = connection.execute(
+                    select(Job.id, Job.location).where(Job.id > last_id).order_by(Job.id).limit(batch_size)
+                ).all()
+                if not jobs:
+                    break
+                rows = []
+                for job_id, location in jobs:
+                    values = geo_values(location)
+                    rows.append({
+                        "job_id": job_id, "lat": values["latitude"], "lon": values["longitude"], "hash": values["geohash"]
+                    })
+                    counts["located"] += values["geohash"] is not None
+                connection.execute(statement, rows)
+                counts["jobs"] += len(jobs)
+                last_id = jobs[-1][0]
+
+            db.commit()
+            logger.info(f"Locations resolved for {counts['located']} of {counts['jobs']} jobs")
+            return counts
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error migrating job locations: {str(e)}")
+            raise Exception(f"Location migration failed: {str(e)}")
+        finally:
+            if owns_session:
+                db.close()
+
+    def ensure(self) -> bool:
+        """Resolve existing locations once, when jobs exist but none has
+        coordinates yet; returns whether it did"""
+        db = self.session_factory()
+        try:
+            if db.query(Job.id).filter(Job.geohash.isnot(None)).first() is None and (
+                db.query(Job.id).first() is not None
+            ):
+                self.migrate(db)
+                return True
+            return False
+        finally:
+            db.close()
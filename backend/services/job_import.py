@@ -0,0 +1,273 @@
+import os
+import csv
+import json
+import time
+import logging
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import String, select
+
+from config import settings
+from database import SessionLocal, dialect_insert
+from models import Job
+from schemas import JobImportRecord
+from services.job_geo import geo_values
+from services.job_salaries import salary_values
+from services.job_trends import TRACKED, apply_counts, job_counts
+from services.skill_catalog import link_jobs
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+EXTENSIONS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+LIST_COLUMNS = ("required_skills", "preferred_skills", "benefits", "requirements")
+MAX_ERRORS = 100  # invalid rows reported (all are counted)
+LOOKUP_CHUNK = 500  # external ids per IN (...) lookup
+PROGRESS_CHUNKS = 50  # chunks between progress log lines
+
+# Text columns with a length limit, checked before the insert so one long
+# value is reported as an invalid row instead of failing its whole chunk
+LENGTH_LIMITS = {
+    column.name: column.type.length
+    for column in Job.__table__.columns
+    if isinstance(column.type, String) and column.type.length and column.name in JobImportRecord.model_fields
+}
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Feed format from a file name's extension"""
+    return EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+
+class _LineReader:
+    """Decoded lines of a binary file, tracking the byte offset after the last one read"""
+
+    def __init__(self, handle: BinaryIO, offset: int):
+        handle.seek(offset)
+        self.handle = handle
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.handle.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8-sig" if self.offset == len(line) else "utf-8")
+
+
+def read_records(handle: BinaryIO, format: str, offset: int = 0) -> Iterator[Tuple[Any, int]]:
+    """(record, byte offset after it) for each record from offset on: JSONL
+    lines as text, CSV rows as dicts keyed by the header row (empty cells
+    left out). The offset resumes the feed after that record."""
+    if format == "jsonl":
+        lines = _LineReader(handle, offset)
+        for line in lines:
+            if line.strip():
+                yield line, lines.offset
+        return
+
+    header = _LineReader(handle, 0)
+    fieldnames = next(csv.reader(header), None)
+    if not fieldnames:
+        return
+    fieldnames = [name.strip() for name in fieldnames]
+    lines = _LineReader(handle, max(offset, header.offset))
+    for row in csv.reader(lines):
+        if any(row):
+            yield {name: value for name, value in zip(fieldnames, row) if value != ""}, lines.offset
+
+
+@lru_cache(maxsize=16384)
+def _derived_values(location: str, salary_range: Optional[str]) -> Tuple[Tuple[str, Any], ...]:
+    """Coordinate and salary columns; feeds repeat the same places and ranges"""
+    return tuple({**geo_values(location), **salary_values(salary_range)}.items())
+
+
+def row_values(raw: Any, now: datetime) -> Dict[str, Any]:
+    """Validated jobs table values of one feed record (ValueError if invalid)"""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raise ValueError("invalid JSON")
+    if not isinstance(raw, dict):
+        raise ValueError("expected a JSON object")
+
+    values = JobImportRecord.model_validate(raw).model_dump()
+    for name, limit in LENGTH_LIMITS.items():
+        if values[name] is not None and len(values[name]) > limit:
+            raise ValueError(f"{name}: longer than {limit} characters")
+    for name in LIST_COLUMNS:
+        values[name] = json.dumps([str(item) for item in values[name]])
+    values.update(_derived_values(values["location"], values["salary_range"]))
+    values["updated_at"] = now
+    return values
+
+
+def _error_message(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
+
+
+class JobImporter:
+    """Streaming bulk import of partner job feeds (JSONL or CSV), upserted on
+    Job.external_id.
+
+    Records are read, validated and written one chunk at a time, each chunk
+    in its own transaction: one batched INSERT ... ON CONFLICT DO UPDATE
+    (SQLite, PostgreSQL) with the salary and coordinate columns computed in
+    Python, then the chunk's skill links and trend counter deltas written in
+    bulk. The full-text index follows through its triggers (SQLite) or
+    generated column (PostgreSQL), and the job index and stored matches pick
+    the rows up from updated_at. Memory stays bounded by the chunk size
+    whatever the feed size, and since upserts are idempotent an interrupted
+    import can be resumed from the reported offset or simply re-run.
+    """
+
+    def __init__(self, session_factory=SessionLocal, chunk_size: Optional[int] = None):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size or settings.job_import_chunk_size
+
+    def import_file(self, path: str, format: Optional[str] = None, offset: int = 0,
+                    max_duration: Optional[float] = None, report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Import a feed file from a byte offset, stopping at the first chunk
+        boundary after max_duration seconds; continues the counts of a
+        previous slice's report. The report's offset and completed say where
+        to resume."""
+        format = format or detect_format(path)
+        if format not in FORMATS:
+            raise ValueError(f"Unknown feed format for {path}. Use one of: {', '.join(FORMATS)}")
+
+        report = dict(report or {
+            "rows": 0, "inserted": 0, "updated": 0, "invalid": 0, "errors": [], "seconds": 0.0
+        })
+        started = time.perf_counter()
+        chunks = 0
+        try:
+            with open(path, "rb") as handle:
+                chunk: Dict[str, Dict[str, Any]] = {}
+                now = datetime.utcnow()
+                for raw, end in read_records(handle, format, offset):
+                    report["rows"] += 1
+                    try:
+                        values = row_values(raw, now)
+                    except ValueError as e:
+                        report["invalid"] += 1
+                        if len(report["errors"]) < MAX_ERRORS:
+                            report["errors"].append({"row": report["rows"], "error": _error_message(e)})
+                    else:
+                        if values["external_id"] in chunk:
+                            # A later row of the same job replaces the earlier one
+                            report["updated"] += 1
+                        chunk[values["external_id"]] = values
+
+                    if len(chunk) >= self.chunk_size:
+                        self._write_chunk(chunk, report)
+                        chunk, offset, now = {}, end, datetime.utcnow()
+                        chunks += 1
+                        if chunks % PROGRESS_CHUNKS == 0:
+                            self._log_progress(report, started)
+                        if max_duration is not None and time.perf_counter() - started >= max_duration:
+                            return self._finish(report, started, offset, completed=False)
+                    elif not chunk:
+                        # Only invalid rows since the last write
+                        offset = end
+
+                if chunk:
+                    self._write_chunk(chunk, report)
+                return self._finish(report, started, handle.tell(), completed=True)
+
+        except Exception as e:
+            logger.error(f"Error importing jobs from {path} (resume at offset {offset}): {str(e)}")
+            raise Exception(f"Job import failed: {str(e)}")
+
+    def _write_chunk(self, rows: Dict[str, Dict[str, Any]], report: Dict[str, Any]):
+        """Upsert one chunk of jobs and update their skill links and trend counters"""
+        db = self.session_factory()
+        try:
+            connection = db.connection()
+            table = Job.__table__
+            external_ids = list(rows)
+
+            # Trend counts of the jobs being replaced, and their posted dates
+            existing = {}
+            tracked = [table.c[name] for name in TRACKED]
+            for start in range(0, len(external_ids), LOOKUP_CHUNK):
+                part = external_ids[start:start + LOOKUP_CHUNK]
+                for row in connection.execute(select(table.c.external_id, *tracked).where(table.c.external_id.in_(part))):
+                    existing[row.external_id] = row._mapping
+
+            delta: Counter = Counter()
+            for external_id, values in rows.items():
+                previous = existing.get(external_id)
+                if previous is not None:
+                    delta.subtract(job_counts(previous))
+                if values["posted_date"] is None:
+                    values["posted_date"] = previous["posted_date"] if previous is not None else values["updated_at"]
+                delta.update(job_counts(values))
+
+            self._upsert(connection, list(rows.values()), existing)
+
+            ids = {}
+            for start in range(0, len(external_ids), LOOKUP_CHUNK):
+                part = external_ids[start:start + LOOKUP_CHUNK]
+                ids.update(connection.execute(select(table.c.external_id, table.c.id).where(table.c.external_id.in_(part))).all())
+            link_jobs(connection, [
+                (ids[external_id], values["required_skills"], values["preferred_skills"])
+                for external_id, values in rows.items()
+            ])
+            apply_counts(connection, delta)
+            db.commit()
+
+            report["inserted"] += len(rows) - len(existing)
+            report["updated"] += len(existing)
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _upsert(self, connection, rows: List[Dict[str, Any]], existing: Dict[str, Any]):
+        table = Job.__table__
+        statement = dialect_insert(connection, table)
+        if statement is not None:
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=["external_id"],
+                set_={name: statement.excluded[name] for name in rows[0] if name != "external_id"}
+            ), rows)
+            return
+
+        # Other databases: update the jobs that exist, insert the rest
+        updates = [row for row in rows if row["external_id"] in existing]
+        inserts = [row for row in rows if row["external_id"] not in existing]
+        for row in updates:
+            connection.execute(table.update().where(table.c.external_id == row["external_id"]).values(**row))
+        if inserts:
+            connection.execute(table.insert(), inserts)
+
+    def _log_progress(self, report: Dict[str, Any], started: float):
+        elapsed = report["seconds"] + time.perf_counter() - started
+        logger.info(f"Job import: {report['rows']} rows in {elapsed:.0f}s ({report['rows'] / elapsed:.0f} rows/s)")
+
+    def _finish(self, report: Dict[str, Any], started: float, offset: int, completed: bool) -> Dict[str, Any]:
+        report["seconds"] = round(report["seconds"] + time.perf_counter() - started, 3)
+        report["rows_per_second"] = round(report["rows"] / report["seconds"]) if report["seconds"] else 0
+        report["offset"] = offset
+        report["completed"] = completed
+        logger.info(
+            f"Job import {'completed' if completed else 'paused'}: {report['inserted']} inserted, "
+            f"{report['updated']} updated, {report['invalid']} invalid ({report['rows_per_second']} rows/s)"
+        )
+        return report
@@ -0,0 +1,254 @@
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, undefer_group
+
+from config import settings
+from database import SessionLocal
+from models import Job, AnalysisResult
+from services.job_salaries import JobSalary, job_salary
+from services.job_geo import GeoPoint
+
+logger = logging.getLogger(__name__)
+
+
+def _json_list(value: Optional[str]) -> List:
+    return json.loads(value) if value else []
+
+
+@dataclass(frozen=True)
+class IndexedJob:
+    """An active job with its JSON fields parsed and matching features precomputed"""
+    id: int
+    title: str
+    company: str
+    location: str
+    coordinates: Optional[Tuple[float, float]]  # (latitude, longitude), None when not in the gazetteer
+    salary_range: Optional[str]
+    salary: Optional[JobSalary]  # parsed salary_range, None when it has no amount
+    description: str
+    required_skills: List[str]
+    preferred_skills: List[str]
+    benefits: List[str]
+    requirements: List[str]
+    industry: Optional[str]
+    experience_level: Optional[str]
+    employment_type: Optional[str]
+    remote_work: bool
+    company_size: Optional[str]
+    posted_date: Optional[datetime]
+    application_deadline: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    # Matching features
+    required_lower: Tuple[str, ...]  # required skills, lowercased, in listing order
+    job_skills_lower: frozenset  # required + preferred, lowercased
+    experience_range: Optional[Tuple[float, float]]  # None when the level is unset
+
+
+@dataclass(frozen=True)
+class ResumeProfile:
+    """Matching view of an analysis, parsed once per request"""
+    skills: List[str]
+    skills_lower: List[str]
+    skills_lower_set: frozenset
+    experience_years: Optional[float]
+    industry: Optional[str]
+    education_score: Optional[float]
+    origin: Optional[GeoPoint] = None  # where the candidate is looking, for distance scoring
+
+    @classmethod
+    def from_analysis(cls, analysis: AnalysisResult) -> "ResumeProfile":
+        skills = _json_list(analysis.skills)
+        skills_lower = [skill.lower() for skill in skills]
+        return cls(
+            skills=skills,
+            skills_lower=skills_lower,
+            skills_lower_set=frozenset(skills_lower),
+            experience_years=analysis.experience_years,
+            industry=analysis.industry,
+            education_score=analysis.education_score
+        )
+
+
+class JobIndex:
+    """Long-lived in-memory index of active jobs.
+
+    Built once from the database and then refreshed incrementally from
+    Job.updated_at, with a periodic full rebuild to pick up hard deletes.
+    Refreshes swap in a new snapshot, so readers iterating the previous one
+    are never affected.
+    """
+
+    def __init__(
+        self,
+        experience_range: Callable[[str], Tuple[float, float]],
+        refresh_interval: Optional[float] = None,
+        rebuild_interval: Optional[float] = None
+    ):
+        self.experience_range = experience_range
+        self.refresh_interval = settings.job_index_refresh_interval if refresh_interval is None else refresh_interval
+        self.rebuild_interval = settings.job_index_rebuild_interval if rebuild_interval is None else rebuild_interval
+
+        self._jobs: Dict[int, IndexedJob] = {}
+        self._snapshot: List[IndexedJob] = []
+        self._watermark: Optional[datetime] = None
+        self._version = 0
+        self._built_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the set of indexed jobs changes"""
+        return self._version
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Latest Job.updated_at reflected in the index"""
+        return self._watermark
+
+    def jobs(self) -> List[IndexedJob]:
+        """Current snapshot of active jobs, ordered by id"""
+        self.ensure_fresh()
+        return self._snapshot
+
+    def get(self, job_id: int) -> Optional[IndexedJob]:
+        return self._jobs.get(job_id)
+
+    def ensure_fresh(self):
+        """Build or refresh the index if its refresh interval has passed"""
+        now = time.monotonic()
+        if self._built_at is None or now - self._built_at >= self.rebuild_interval:
+            self.rebuild()
+        elif now - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+
+    def index_job(self, job: Job) -> IndexedJob:
+        """Parse a Job row into its indexed form"""
+        required_skills = _json_list(job.required_skills)
+        preferred_skills = _json_list(job.preferred_skills)
+
+        return IndexedJob(
+            id=job.id,
+            title=job.title,
+            company=job.company,
+            location=job.location,
+            coordinates=(job.latitude, job.longitude) if job.geohash else None,
+            salary_range=job.salary_range,
+            salary=job_salary(job),
+            description=job.description,
+            required_skills=required_skills,
+            preferred_skills=preferred_skills,
+            benefits=_json_list(job.benefits),
+            requirements=_json_list(job.requirements),
+            industry=job.industry,
+            experience_level=job.experience_level,
+            employment_type=job.employment_type,
+            remote_work=job.remote_work,
+            company_size=job.company_size,
+            posted_date=job.posted_date,
+            application_deadline=job.application_deadline,
+            updated_at=job.updated_at,
+            required_lower=tuple(skill.lower() for skill in required_skills),
+            job_skills_lower=frozenset(skill.lower() for skill in required_skills + preferred_skills),
+            experience_range=self.experience_range(job.experience_level) if job.experience_level else None
+        )
+
+    def rebuild(self, db: Optional[Session] = None):
+        """Load every active job from the database"""
+        with self._lock:
+            started = time.monotonic()
+            owns_session = db is None
+            db = db or SessionLocal()
+            try:
+                jobs: Dict[int, IndexedJob] = {}
+                watermark = None
+                query = db.query(Job).options(undefer_group("details")).filter(Job.is_active == True).order_by(Job.id)
+                for job in query.yield_per(1000):
+                    jobs[job.id] = self.index_job(job)
+                    if job.updated_at and (watermark is None or job.updated_at > watermark):
+                        watermark = job.updated_at
+            finally:
+                if owns_session:
+                    db.close()
+
+            self._publish(jobs)
+            self._watermark = watermark
+            self._built_at = self._refreshed_at = time.monotonic()
+            logger.info(f"Job index built with {len(jobs)} jobs in {(self._built_at - started) * 1000:.0f}ms")
+
+    def refresh(self, db: Optional[Session] = None):
+        """Apply jobs changed since the last refresh"""
+        with self._lock:
+            owns_session = db is None
+            db = db or SessionLocal()
+            try:
+                query = db.query(Job).options(undefer_group("details"))
+                if self._watermark is not None:
+                    # >= so rows sharing the watermark timestamp are not missed
+                    query = query.filter(Job.updated_at >= self._watermark)
+                else:
+                    query = query.filter(Job.updated_at.isnot(None))
+                changed = [job for job in query.all() if self._has_changed(job)]
+            finally:
+                if owns_session:
+                    db.close()
+
+            self._refreshed_at = time.monotonic()
+            if not changed:
+                return
+
+            jobs = dict(self._jobs)
+            for job in changed:
+                if job.is_active:
+                    jobs[job.id] = self.index_job(job)
+                else:
+                    jobs.pop(job.id, None)
+                if job.updated_at and (self._watermark is None or job.updated_at > self._watermark):
+                    self._watermark = job.updated_at
+
+            self._publish(jobs)
+
+    def load(self, jobs: Iterable[IndexedJob]):
+        """Replace the index with already-parsed jobs (benchmarks, offline tools)"""
+        with self._lock:
+            jobs = {job.id: job for job in jobs}
+            self._publish(jobs)
+            self._watermark = max((job.updated_at for job in jobs.values() if job.updated_at), default=None)
+            self._built_at = self._refreshed_at = time.monotonic()
+
+    def _has_changed(self, job: Job) -> bool:
+        indexed = self._jobs.get(job.id)
+        if indexed is None:
+            return bool(job.is_active)
+        return not job.is_active or indexed.updated_at != job.updated_at
+
+    def invalidate(self):
+        """Force a refresh on the next read (call after bulk job changes)"""
+        self._refreshed_at = float("-inf")
+
+    def _publish(self, jobs: Dict[int, IndexedJob]):
+        self._jobs = jobs
+        self._snapshot = [jobs[job_id] for job_id in sorted(jobs)]
+        self._version += 1
+
+    def stats(self) -> Dict:
+        return {
+            "jobs": len(self._snapshot),
+            "version": self._version,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "built": self.is_built
+        }
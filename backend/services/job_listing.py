@@ -0,0 +1,103 @@
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.orm import Session, load_only
+
+from database import SessionLocal
+from models import Job
+from schemas import JobListItem
+
+logger = logging.getLogger(__name__)
+
+JSON_FIELDS = {"required_skills", "preferred_skills", "benefits", "requirements"}
+
+# Response field -> Job column
+FIELD_COLUMNS = {name: ("id" if name == "job_id" else name) for name in JobListItem.model_fields}
+
+
+def encode_job_cursor(posted_date: datetime, job_id: int) -> str:
+    """Opaque keyset cursor for the job after which the next page starts"""
+    return base64.urlsafe_b64encode(json.dumps([posted_date.isoformat(), job_id]).encode()).decode()
+
+
+def decode_job_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        posted_date, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(posted_date), int(job_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Requested response fields (all when none are given); job_id is always included"""
+    if not fields:
+        return list(FIELD_COLUMNS)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ["job_id"] + [name for name in dict.fromkeys(names) if name != "job_id"]
+
+
+class JobListing:
+    """Newest-first job listing with keyset pagination and column projection.
+
+    Pages continue from an opaque (posted_date, id) cursor through the
+    ix_jobs_posted_id index, so a deep page costs the same as the first.
+    Only the columns of the requested fields are loaded; the large detail
+    columns are deferred on the model and skipped unless asked for.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def ensure(self):
+        """Date jobs stored without a posted_date, which keyset pages cannot order"""
+        db = self.session_factory()
+        try:
+            updated = db.execute(
+                update(Job).where(Job.posted_date.is_(None)).values(
+                    posted_date=Job.updated_at
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            updated += db.execute(
+                update(Job).where(Job.posted_date.is_(None)).values(
+                    posted_date=datetime.utcnow()
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if updated:
+                logger.info(f"Set posted_date on {updated} jobs")
+        finally:
+            db.close()
+
+    def page(self, db: Session, limit: int = 20, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+             filters: Optional[list] = None) -> Tuple[List[JobListItem], Optional[str]]:
+        """One page of jobs, newest first, and the cursor of the next page"""
+        fields = fields or list(FIELD_COLUMNS)
+        columns = {FIELD_COLUMNS[name] for name in fields} | {"id", "posted_date"}
+
+        # load_only also loads the deferred detail columns that were asked for
+        query = db.query(Job).options(load_only(*[getattr(Job, name) for name in columns]))
+        for condition in filters or []:
+            query = query.filter(condition)
+        if cursor:
+            posted_date, job_id = decode_job_cursor(cursor)
+            query = query.filter(tuple_(Job.posted_date, Job.id) < tuple_(posted_date, job_id))
+
+        jobs = query.order_by(Job.posted_date.desc(), Job.id.desc()).limit(limit + 1).all()
+        next_cursor = encode_job_cursor(jobs[limit - 1].posted_date, jobs[limit - 1].id) if len(jobs) > limit else None
+        return [self._to_item(job, fields) for job in jobs[:limit]], next_cursor
+
+    def _to_item(self, job: Job, fields: List[str]) -> JobListItem:
+        values = {}
+        for name in fields:
+            value = getattr(job, FIELD_COLUMNS[name])
+            if name in JSON_FIELDS:
+                value = json.loads(value) if value else []
+            values[name] = value
+        return JobListItem(**values)
@@ -1,27 +1,34 @@
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import heapq
+import math
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from dataclasses import replace
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime
 from sqlalchemy.orm import Session
 
 from models import Job, AnalysisResult
-from schemas import JobMatchResponse
+from schemas import JobMatchResponse, CandidateMatchResponse, ResumeSearchRequest
 from database import SessionLocal
+from config import settings
+from services.job_index import JobIndex, IndexedJob, ResumeProfile
+from services.match_engine import MatchEngine
+from services.match_shards import ShardedScorer
+from services.tfidf_model import TfidfModelStore, skills_text
+from services.semantic_index import SemanticIndexStore, job_document
+from services.job_trends import JobTrends
+from services.skill_catalog import SkillCatalog
+from services.job_salaries import JobSalaries
+from services.job_geo import GeoPoint, JobGeo, distance_km, distance_score
+from services.candidate_index import CandidateIndex, CandidateQuery, IndexedCandidate, education_rank
 
 logger = logging.getLogger(__name__)
 
 class JobMatcher:
     def __init__(self):
         """Initialize the job matcher with similarity algorithms"""
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        
         # Skill importance weights
         self.skill_weights = {
             'programming_languages': 1.0,
@@ -42,81 +49,223 @@ class JobMatcher:
             'principal': (8, 15),
             'executive': (10, 20)
         }
+        
+        # Pre-parsed active jobs, built on first use, the TF-IDF model fitted
+        # over them and the vectorized scorer compiled from both
+        self.job_index = JobIndex(self.experience_range)
+        self.tfidf_model = TfidfModelStore()
+        self.match_engine = MatchEngine(
+            self.job_index, self, self.tfidf_model,
+            scorer=ShardedScorer() if settings.match_workers > 1 else None
+        )
+        
+        # Dense job embeddings with an IVF index for "jobs like this" searches
+        self.semantic_index = SemanticIndexStore()
+        
+        # Latest analysis of every resume, for ranking candidates against a job
+        self.candidate_index = CandidateIndex(self, self.tfidf_model)
+        
+        # Market trend counters, kept current as jobs are written
+        self.job_trends = JobTrends()
+        
+        # Skills by id with job/resume association tables, for SQL skill filters
+        self.skill_catalog = SkillCatalog()
+        
+        # Numeric salary columns parsed from salary_range, for SQL salary filters
+        self.job_salaries = JobSalaries()
+        
+        # Job coordinates from the offline gazetteer, for radius filters and distance scoring
+        self.job_geo = JobGeo()
 
-    async def find_matches(self, analysis: AnalysisResult, limit: int = 10) -> List[JobMatchResponse]:
-        """Find job matches for a resume analysis"""
+    def find_matches(self, analysis: AnalysisResult, limit: int = 10, origin: Optional[GeoPoint] = None,
+                     radius_km: Optional[float] = None) -> List[JobMatchResponse]:
+        """Find job matches for a resume analysis; with an origin, location
+        scores decay with the distance from it and radius_km keeps only jobs
+        within that distance"""
         try:
-            db = SessionLocal()
-            
-            # Get all active jobs
-            jobs = db.query(Job).filter(Job.is_active == True).all()
+            # Only jobs with reasonable match, best first; the skill index
+            # skips jobs that can't reach the threshold or the top `limit`
+            profile = ResumeProfile.from_analysis(analysis)
+            if origin is not None:
+                profile = replace(profile, origin=origin)
+            jobs, top = self.match_engine.search(profile, limit, threshold=0.3, radius_km=radius_km)
             
             if not jobs:
                 logger.warning("No active jobs found in database")
                 return []
             
-            # Calculate match scores for each job
-            matches = []
-            for job in jobs:
-                match_score = self._calculate_match_score(analysis, job)
-                
-                if match_score > 0.3:  # Only include jobs with reasonable match
-                    match_reasons = self._get_match_reasons(analysis, job, match_score)
-                    missing_skills = self._get_missing_skills(analysis, job)
-                    extra_skills = self._get_extra_skills(analysis, job)
-                    
-                    job_match = JobMatchResponse(
-                        job_id=job.id,
-                        title=job.title,
-                        company=job.company,
-                        location=job.location,
-                        salary_range=job.salary_range,
-                        description=job.description,
-                        required_skills=json.loads(job.required_skills) if job.required_skills else [],
-                        preferred_skills=json.loads(job.preferred_skills) if job.preferred_skills else [],
-                        industry=job.industry,
-                        experience_level=job.experience_level,
-                        employment_type=job.employment_type,
-                        remote_work=job.remote_work,
-                        match_score=round(match_score, 2),
-                        match_reasons=match_reasons,
-                        missing_skills=missing_skills,
-                        extra_skills=extra_skills,
-                        company_size=job.company_size,
-                        benefits=json.loads(job.benefits) if job.benefits else [],
-                        requirements=json.loads(job.requirements) if job.requirements else [],
-                        posted_date=job.posted_date,
-                        application_deadline=job.application_deadline
-                    )
-                    
-                    matches.append(job_match)
-            
-            db.close()
-            
-            # Sort by match score and return top matches
-            matches.sort(key=lambda x: x.match_score, reverse=True)
-            return matches[:limit]
+            return [self._build_match(profile, jobs[position], score) for position, score in top]
             
         except Exception as e:
             logger.error(f"Error finding job matches: {str(e)}")
             raise Exception(f"Job matching failed: {str(e)}")
 
-    def _calculate_match_score(self, analysis: AnalysisResult, job: Job) -> float:
-        """Calculate overall match score between analysis and job"""
+    def find_similar_jobs(self, job_id: int, limit: int = 10,
+                          nprobe: Optional[int] = None) -> Optional[List[JobMatchResponse]]:
+        """Active jobs closest in meaning to a job (None if the job is not active)"""
+        self.job_index.ensure_fresh()
+        job = self.job_index.get(job_id)
+        if job is None:
+            return None
+        
+        hits = self._semantic_hits(job_document(job), limit, nprobe, exclude=job_id)
+        return [
+            self._build_match(None, similar, score, [f"Similar to {job.title} at {job.company}"])
+            for similar, score in hits
+        ]
+
+    def find_semantic_matches(self, analysis: Optional[AnalysisResult], resume_text: str, limit: int = 10,
+                              nprobe: Optional[int] = None) -> List[JobMatchResponse]:
+        """Active jobs closest in meaning to a resume's text; the analysis, if any,
+        fills in match reasons and skill gaps"""
+        self.job_index.ensure_fresh()
+        profile = ResumeProfile.from_analysis(analysis) if analysis is not None else None
+        hits = self._semantic_hits(resume_text, limit, nprobe)
+        reasons = None if profile is not None else ["Description similar to the resume"]
+        return [self._build_match(profile, job, score, reasons) for job, score in hits]
+
+    def _semantic_hits(self, text: str, limit: int, nprobe: Optional[int],
+                       exclude: Optional[int] = None) -> List[Tuple[IndexedJob, float]]:
+        """Approximate nearest jobs still active in the job index, best first"""
+        # Over-fetch: the on-disk index may hold jobs deactivated since it was built
+        hits = self.semantic_index.search(text, limit * 2 + 10, nprobe)
+        results = []
+        for job_id, similarity in hits:
+            job = self.job_index.get(job_id)
+            if job is not None and job_id != exclude:
+                results.append((job, max(similarity, 0.0)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def find_candidates(self, job_id: int, limit: int = 20,
+                        offset: int = 0) -> Optional[List[CandidateMatchResponse]]:
+        """Best candidates for a job, scored like its job matches (None if the job is not active)"""
+        self.job_index.ensure_fresh()
+        job = self.job_index.get(job_id)
+        if job is None:
+            return None
+        return self._find_candidates(CandidateQuery.for_job(job, self), limit, offset)
+
+    def search_candidates(self, request: ResumeSearchRequest) -> List[CandidateMatchResponse]:
+        """Best candidates for an ad-hoc search, scored as if it were a job
+        requiring the skills and at least experience_years; education_level
+        is a minimum and filters"""
+        query = CandidateQuery(
+            required_skills=tuple(request.skills),
+            experience_range=(request.experience_years, math.inf) if request.experience_years is not None else None,
+            industry=request.industry,
+            location_score=0.5,  # resumes carry no location to compare
+            min_education_rank=education_rank(request.education_level)
+        )
+        return self._find_candidates(query, request.limit, request.offset)
+
+    def _find_candidates(self, query: CandidateQuery, limit: int, offset: int) -> List[CandidateMatchResponse]:
         try:
-            # Extract skills from analysis
-            analysis_skills = json.loads(analysis.skills) if analysis.skills else []
-            analysis_skills_lower = [skill.lower() for skill in analysis_skills]
+            ranked = self.candidate_index.search(query, offset + limit)
+            return [self._build_candidate(query, candidate, score) for candidate, score in ranked[offset:]]
             
-            # Extract required skills from job
-            required_skills = json.loads(job.required_skills) if job.required_skills else []
-            required_skills_lower = [skill.lower() for skill in required_skills]
+        except Exception as e:
+            logger.error(f"Error finding candidates: {str(e)}")
+            raise Exception(f"Candidate search failed: {str(e)}")
+
+    def _build_candidate(self, query: CandidateQuery, candidate: IndexedCandidate,
+                         match_score: float) -> CandidateMatchResponse:
+        required_lower = set(query.required_lower)
+        return CandidateMatchResponse(
+            resume_id=candidate.resume_id,
+            analysis_id=candidate.analysis_id,
+            filename=candidate.filename,
+            match_score=round(match_score, 2),
+            matched_skills=[skill for skill in candidate.skills if skill.lower() in required_lower],
+            missing_skills=[
+                skill for skill in dict.fromkeys(query.required_skills)
+                if skill.lower() not in candidate.skills_lower_set
+            ],
+            skills=candidate.skills,
+            experience_years=candidate.experience_years,
+            education_level=candidate.education_level,
+            industry=candidate.industry,
+            overall_score=candidate.overall_score,
+            analysis_date=candidate.analysis_date
+        )
+
+    def iter_matches(self, analysis: AnalysisResult) -> Iterator[JobMatchResponse]:
+        """Yield job matches as they are scored, in job id order"""
+        profile = ResumeProfile.from_analysis(analysis)
+        jobs, scores = self.match_engine.score(profile)
+        
+        for position in np.flatnonzero(scores > 0.3):  # Same threshold as find_matches
+            yield self._build_match(profile, jobs[position], float(scores[position]))
+
+    def stream_matches(self, analysis: AnalysisResult, limit: int = 10) -> Iterator[Tuple[str, Any]]:
+        """Stream ("match", match) events, then a ("done", summary) event.
+        
+        The summary ranks the best `limit` job ids, tracked in a bounded heap
+        while the matches are streamed.
+        """
+        try:
+            top: List[Tuple[float, int, int]] = []
+            total = 0
+            for match in self.iter_matches(analysis):
+                total += 1
+                # Ties keep scan order, like the stable sort in find_matches
+                entry = (match.match_score, -total, match.job_id)
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+                yield "match", match
             
+            yield "done", {
+                "total_matches": total,
+                "top_job_ids": [job_id for _, _, job_id in sorted(top, reverse=True)]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error streaming job matches: {str(e)}")
+            yield "error", {"error": type(e).__name__, "detail": "Error finding job matches"}
+
+    def _build_match(self, profile: Optional[ResumeProfile], job: IndexedJob, match_score: float,
+                     match_reasons: Optional[List[str]] = None) -> JobMatchResponse:
+        """Build the match response for a scored job (without a profile, skill gaps are left empty)"""
+        return JobMatchResponse(
+            job_id=job.id,
+            title=job.title,
+            company=job.company,
+            location=job.location,
+            salary_range=job.salary_range,
+            salary_min=job.salary.min if job.salary else None,
+            salary_max=job.salary.max if job.salary else None,
+            salary_currency=job.salary.currency if job.salary else None,
+            salary_period=job.salary.period if job.salary else None,
+            description=job.description,
+            required_skills=job.required_skills,
+            preferred_skills=job.preferred_skills,
+            industry=job.industry or "",
+            experience_level=job.experience_level or "",
+            employment_type=job.employment_type or "",
+            remote_work=bool(job.remote_work),
+            match_score=round(match_score, 2),
+            distance_km=self._get_distance(profile, job),
+            match_reasons=match_reasons if match_reasons is not None else self._get_match_reasons(profile, job, match_score),
+            missing_skills=self._get_missing_skills(profile, job) if profile is not None else [],
+            extra_skills=self._get_extra_skills(profile, job) if profile is not None else [],
+            company_size=job.company_size,
+            benefits=job.benefits,
+            requirements=job.requirements,
+            posted_date=job.posted_date or datetime.utcnow(),
+            application_deadline=job.application_deadline
+        )
+
+    def _calculate_match_score(self, profile: ResumeProfile, job: IndexedJob) -> float:
+        """Calculate overall match score between analysis and job"""
+        try:
             # Calculate different match components
-            skills_score = self._calculate_skills_match(analysis_skills_lower, required_skills_lower)
-            experience_score = self._calculate_experience_match(analysis.experience_years, job.experience_level)
-            industry_score = self._calculate_industry_match(analysis.industry, job.industry)
-            location_score = self._calculate_location_match(analysis, job)
+            skills_score = self._calculate_skills_match(profile.skills_lower, job.required_lower)
+            experience_score = self._calculate_experience_match(profile.experience_years, job.experience_range)
+            industry_score = self._calculate_industry_match(profile.industry, job.industry)
+            location_score = self._calculate_location_match(profile, job)
             
             # Weighted combination
             overall_score = (
@@ -147,13 +296,10 @@ class JobMatcher:
         # Calculate partial matches using TF-IDF similarity
         if len(analysis_skills) > 1 and len(required_skills) > 1:
             try:
-                # Create text representations
-                analysis_text = " ".join(analysis_skills)
-                required_text = " ".join(required_skills)
-                
-                # Calculate TF-IDF similarity
-                tfidf_matrix = self.vectorizer.fit_transform([analysis_text, required_text])
-                similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+                # Cosine under the TF-IDF model fitted over the job corpus
+                similarity = self.tfidf_model.similarity(skills_text(analysis_skills), skills_text(required_skills))
+                if similarity is None:
+                    return exact_score
                 
                 # Combine exact and similarity scores
                 combined_score = (exact_score * 0.7) + (similarity * 0.3)
@@ -165,24 +311,27 @@ class JobMatcher:
         
         return exact_score
 
-    def _calculate_experience_match(self, experience_years: float, job_level: str) -> float:
-        """Calculate experience level matching score"""
-        if not job_level or experience_years is None:
-            return 0.5
-        
+    def experience_range(self, job_level: str) -> Tuple[float, float]:
+        """Expected years of experience for a job level"""
         job_level_lower = job_level.lower()
         
-        # Get expected experience range for job level
         if job_level_lower in self.experience_levels:
-            min_exp, max_exp = self.experience_levels[job_level_lower]
-        else:
-            # Default ranges for unknown levels
-            if 'senior' in job_level_lower or 'lead' in job_level_lower:
-                min_exp, max_exp = 5, 10
-            elif 'junior' in job_level_lower or 'entry' in job_level_lower:
-                min_exp, max_exp = 0, 3
-            else:
-                min_exp, max_exp = 2, 6
+            return self.experience_levels[job_level_lower]
+        
+        # Default ranges for unknown levels
+        if 'senior' in job_level_lower or 'lead' in job_level_lower:
+            return 5, 10
+        elif 'junior' in job_level_lower or 'entry' in job_level_lower:
+            return 0, 3
+        return 2, 6
+
+    def _calculate_experience_match(self, experience_years: float,
+                                    experience_range: Optional[Tuple[float, float]]) -> float:
+        """Calculate experience level matching score"""
+        if experience_range is None or experience_years is None:
+            return 0.5
+        
+        min_exp, max_exp = experience_range
         
         # Calculate match score
         if min_exp <= experience_years <= max_exp:
@@ -235,11 +384,8 @@ class JobMatcher:
         
         return 0.3  # Different industries
 
-    def _calculate_location_match(self, analysis: AnalysisResult, job: Job) -> float:
+    def _calculate_location_match(self, profile: Optional[ResumeProfile], job: IndexedJob) -> float:
         """Calculate location matching score"""
-        # This is a simplified implementation
-        # In a real system, you'd use geocoding and distance calculations
-        
         if not job.location:
             return 0.5  # Remote or location not specified
         
@@ -247,40 +393,48 @@ class JobMatcher:
         if job.remote_work:
             return 1.0  # Perfect match for remote work
         
-        # For now, return a neutral score
-        # In a real implementation, you'd check if the candidate's location
-        # matches the job location or is within a reasonable distance
-        return 0.7
+        # Without a place the candidate is looking from, a neutral score
+        if profile is None or profile.origin is None:
+            return 0.7
+        if job.coordinates is None:
+            return 0.5  # Job location not in the gazetteer
+        
+        # Decays with the distance from the candidate's origin
+        distance = distance_km(profile.origin.latitude, profile.origin.longitude, *job.coordinates)
+        return float(distance_score(distance))
+
+    def _get_distance(self, profile: Optional[ResumeProfile], job: IndexedJob) -> Optional[float]:
+        """Distance in km from the candidate's origin to the job, when both are known"""
+        if profile is None or profile.origin is None or job.coordinates is None:
+            return None
+        return round(float(distance_km(profile.origin.latitude, profile.origin.longitude, *job.coordinates)), 1)
 
-    def _get_match_reasons(self, analysis: AnalysisResult, job: Job, match_score: float) -> List[str]:
+    def _get_match_reasons(self, profile: ResumeProfile, job: IndexedJob, match_score: float) -> List[str]:
         """Get reasons why this job is a good match"""
         reasons = []
         
         # Skills match reasons
-        analysis_skills = json.loads(analysis.skills) if analysis.skills else []
-        required_skills = json.loads(job.required_skills) if job.required_skills else []
-        
-        if analysis_skills and required_skills:
-            matching_skills = [skill for skill in required_skills 
-                             if skill.lower() in [s.lower() for s in analysis_skills]]
+        if profile.skills and job.required_skills:
+            matching_skills = [skill for skill in job.required_skills 
+                             if skill.lower() in profile.skills_lower_set]
             
             if matching_skills:
                 reasons.append(f"Matches {len(matching_skills)} required skills: {', '.join(matching_skills[:3])}")
         
         # Experience match reasons
-        if analysis.experience_years and job.experience_level:
-            if 'senior' in job.experience_level.lower() and analysis.experience_years >= 5:
+        if profile.experience_years and job.experience_level:
+            if 'senior' in job.experience_level.lower() and profile.experience_years >= 5:
                 reasons.append("Experience level matches senior position requirements")
-            elif 'junior' in job.experience_level.lower() and analysis.experience_years <= 3:
+            elif 'junior' in job.experience_level.lower() and profile.experience_years <= 3:
                 reasons.append("Experience level suitable for junior position")
         
         # Industry match reasons
-        if analysis.industry and job.industry:
-            if analysis.industry.lower() == job.industry.lower():
-                reasons.append(f"Industry experience in {analysis.industry}")
+        if profile.industry and job.industry:
+            if profile.industry.lower() == job.industry.lower():
+                reasons.append(f"Industry experience in {profile.industry}")
         
         # Education match reasons
-        if analysis.education_score and analysis.education_score >= 80:
+        if profile.education_score and profile.education_score >= 80:
             reasons.append("Strong educational background")
         
         # Overall score reasons
@@ -293,39 +447,31 @@ class JobMatcher:
         
         return reasons[:3]  # Limit to top 3 reasons
 
-    def _get_missing_skills(self, analysis: AnalysisResult, job: Job) -> List[str]:
+    def _get_missing_skills(self, profile: ResumeProfile, job: IndexedJob) -> List[str]:
         """Get skills that are required but missing from the resume"""
-        analysis_skills = json.loads(analysis.skills) if analysis.skills else []
-        required_skills = json.loads(job.required_skills) if job.required_skills else []
-        
-        if not analysis_skills or not required_skills:
+        if not profile.skills or not job.required_skills:
             return []
         
-        analysis_skills_lower = [skill.lower() for skill in analysis_skills]
-        missing_skills = [skill for skill in required_skills 
-                         if skill.lower() not in analysis_skills_lower]
+        missing_skills = [skill for skill in job.required_skills 
+                         if skill.lower() not in profile.skills_lower_set]
         
         return missing_skills[:5]  # Limit to top 5 missing skills
 
-    def _get_extra_skills(self, analysis: AnalysisResult, job: Job) -> List[str]:
+    def _get_extra_skills(self, profile: ResumeProfile, job: IndexedJob) -> List[str]:
         """Get skills that the candidate has but aren't required for the job"""
-        analysis_skills = json.loads(analysis.skills) if analysis.skills else []
-        required_skills = json.loads(job.required_skills) if job.required_skills else []
-        preferred_skills = json.loads(job.preferred_skills) if job.preferred_skills else []
-        
-        if not analysis_skills:
+        if not profile.skills:
             return []
         
-        all_job_skills = [skill.lower() for skill in required_skills + preferred_skills]
-        extra_skills = [skill for skill in analysis_skills 
-                       if skill.lower() not in all_job_skills]
+        extra_skills = [skill for skill in profile.skills 
+                       if skill.lower() not in job.job_skills_lower]
         
         return extra_skills[:5]  # Limit to top 5 extra skills
 
     async def get_job_recommendations(self, analysis: AnalysisResult, limit: int = 5) -> List[Dict[str, Any]]:
         """Get personalized job recommendations based on analysis"""
         try:
-            matches = await self.find_matches(analysis, limit * 2)  # Get more matches for filtering
+            # Get more matches for filtering; scoring is CPU-bound, so off the event loop
+            matches = await asyncio.to_thread(self.find_matches, analysis, limit * 2)
             
             recommendations = []
             for match in matches:
@@ -369,85 +515,17 @@ class JobMatcher:
         
         return steps[:3]
 
-    async def analyze_job_market_trends(self) -> Dict[str, Any]:
-        """Analyze current job market trends"""
+    async def analyze_job_market_trends(self, days: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze current job market trends, optionally of jobs posted in the last `days` days"""
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            
-            # Get all active jobs
-            jobs = db.query(Job).filter(Job.is_active == True).all()
-            
-            if not jobs:
+            trends = self.job_trends.trends(db, days)
+            if not trends['total_jobs']:
                 return {"error": "No jobs found for analysis"}
-            
-            # Analyze trends
-            trends = {
-                'total_jobs': len(jobs),
-                'top_skills': self._get_top_skills(jobs),
-                'industry_distribution': self._get_industry_distribution(jobs),
-                'experience_level_distribution': self._get_experience_distribution(jobs),
-                'salary_ranges': self._get_salary_ranges(jobs),
-                'remote_work_percentage': self._get_remote_work_percentage(jobs)
-            }
-            
-            db.close()
             return trends
             
         except Exception as e:
             logger.error(f"Error analyzing job market trends: {str(e)}")
             return {"error": str(e)}
-
-    def _get_top_skills(self, jobs: List[Job]) -> List[Dict[str, Any]]:
-        """Get most in-demand skills"""
-        skill_counts = {}
-        
-        for job in jobs:
-            if job.required_skills:
-                skills = json.loads(job.required_skills)
-                for skill in skills:
-                    skill_counts[skill] = skill_counts.get(skill, 0) + 1
-        
-        # Sort by count and return top 10
-        top_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        return [{"skill": skill, "count": count} for skill, count in top_skills]
-
-    def _get_industry_distribution(self, jobs: List[Job]) -> List[Dict[str, Any]]:
-        """Get industry distribution"""
-        industry_counts = {}
-        
-        for job in jobs:
-            if job.industry:
-                industry_counts[job.industry] = industry_counts.get(job.industry, 0) + 1
-        
-        return [{"industry": industry, "count": count} 
-                for industry, count in industry_counts.items()]
-
-    def _get_experience_distribution(self, jobs: List[Job]) -> List[Dict[str, Any]]:
-        """Get experience level distribution"""
-        experience_counts = {}
-        
-        for job in jobs:
-            if job.experience_level:
-                experience_counts[job.experience_level] = experience_counts.get(job.experience_level, 0) + 1
-        
-        return [{"level": level, "count": count} 
-                for level, count in experience_counts.items()]
-
-    def _get_salary_ranges(self, jobs: List[Job]) -> List[Dict[str, Any]]:
-        """Get salary range distribution"""
-        salary_ranges = {}
-        
-        for job in jobs:
-            if job.salary_range:
-                salary_ranges[job.salary_range] = salary_ranges.get(job.salary_range, 0) + 1
-        
-        return [{"range": range_str, "count": count} 
-                for range_str, count in salary_ranges.items()]
-
-    def _get_remote_work_percentage(self, jobs: List[Job]) -> float:
-        """Get percentage of jobs offering remote work"""
-        if not jobs:
-            return 0.0
-        
-        remote_jobs = sum(1 for job in jobs if job.remote_work)
-        return round((remote_jobs / len(jobs)) * 100, 2)
+        finally:
+            db.close()
@@ -0,0 +1,213 @@
+import re
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR", "¥": "JPY"}
+CURRENCY_PREFIXES = {"ca$": "CAD", "c$": "CAD", "a$": "AUD", "au$": "AUD", "s$": "SGD", "nz$": "NZD", "rs": "INR"}
+CURRENCY_CODES = {"USD", "EUR", "GBP", "INR", "JPY", "CAD", "AUD", "CHF", "SGD", "NZD", "SEK", "NOK", "DKK", "PLN"}
+
+# Period -> (pattern, occurrences per year)
+PERIODS = {
+    "hour": (r"\b(?:per\s+|an\s+|/\s*)?(?:hours?|hrs?|hourly|h)\b", 2080),
+    "day": (r"\b(?:per\s+|a\s+|/\s*)?(?:days?|daily)\b", 260),
+    "week": (r"\b(?:per\s+|a\s+|/\s*)?(?:weeks?|wk|weekly)\b", 52),
+    "month": (r"\b(?:per\s+|a\s+|/\s*)?(?:months?|mo|monthly)\b", 12),
+    "year": (r"\b(?:per\s+|a\s+|/\s*)?(?:years?|yr|annum|annual|annually|p\.?a)\b", 1),
+}
+
+AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(?:([km])(?![a-z]))?", re.IGNORECASE)
+MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+HOURLY_BELOW = 500  # amounts without a period below this are hourly rates
+
+
+@dataclass(frozen=True)
+class JobSalary:
+    """A salary range parsed from Job.salary_range, in annual amounts"""
+    min: float
+    max: float
+    currency: Optional[str]  # ISO code, None when the text names none
+    period: str  # period the posting quoted: hour, day, week, month or year
+
+
+def _currency(text: str) -> Optional[str]:
+    lowered = text.lower()
+    for prefix, code in CURRENCY_PREFIXES.items():
+        if re.search(rf"(?<![a-z]){re.escape(prefix)}", lowered):
+            return code
+    for code in re.findall(r"\b[A-Z]{3}\b", text.upper()):
+        if code in CURRENCY_CODES:
+            return code
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return code
+    return None
+
+
+def parse_salary(text: Optional[str]) -> Optional[JobSalary]:
+    """Parse free-text salaries such as "$120,000 - $150,000", "€60k-80k a year"
+    or "$35/hr" (None when no amount is found). A single amount, as in
+    "up to $90k", is both the minimum and the maximum."""
+    if not text:
+        return None
+
+    amounts = []
+    for number, suffix in AMOUNT.findall(text):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        amounts.append((value, suffix.lower()))
+    amounts = amounts[:2]
+    if not amounts or all(value <= 0 for value, _ in amounts):
+        return None
+
+    # "60-80k": a bare number before a suffixed one takes its multiplier
+    if len(amounts) == 2 and amounts[1][1] and not amounts[0][1] and amounts[0][0] < 1000:
+        amounts[0] = (amounts[0][0], amounts[1][1])
+    values = [value * MULTIPLIERS.get(suffix, 1) for value, suffix in amounts]
+    low, high = min(values), max(values)
+
+    lowered = text.lower()
+    period = next((name for name, (pattern, _) in PERIODS.items() if re.search(pattern, lowered)), None)
+    if period is None:
+        period = "hour" if high < HOURLY_BELOW else "year"
+    per_year = PERIODS[period][1]
+
+    return JobSalary(
+        min=round(low * per_year, 2),
+        max=round(high * per_year, 2),
+        currency=_currency(text),
+        period=period
+    )
+
+
+def salary_values(text: Optional[str]) -> Dict[str, Any]:
+    """Job salary column values for a salary_range text"""
+    salary = parse_salary(text)
+    return {
+        "salary_min": salary.min if salary else None,
+        "salary_max": salary.max if salary else None,
+        "salary_currency": salary.currency if salary else None,
+        "salary_period": salary.period if salary else None,
+    }
+
+
+def job_salary(job) -> Optional[JobSalary]:
+    """Parsed salary stored on a Job row (None when it has none)"""
+    if job.salary_max is None:
+        return None
+    return JobSalary(job.salary_min, job.salary_max, job.salary_currency, job.salary_period)
+
+
+def salary_conditions(salary_min: Optional[float] = None, salary_max: Optional[float] = None,
+                      currency: Optional[str] = None) -> List[Any]:
+    """SQL conditions on jobs whose annual salary range overlaps [salary_min, salary_max];
+    jobs without a parsed salary never match"""
+    conditions = []
+    if salary_min is not None:
+        conditions.append(Job.salary_max >= salary_min)
+    if salary_max is not None:
+        conditions.append(Job.salary_min <= salary_max)
+    if currency:
+        conditions.append(Job.salary_currency == currency.upper())
+    return conditions
+
+
+def salary_score(salary: Optional[JobSalary], desired: Optional[float]) -> Optional[float]:
+    """Share of the job's salary range at or above the desired annual salary
+    (None without both)"""
+    if salary is None or desired is None:
+        return None
+    if salary.min >= desired:
+        return 1.0
+    if salary.max < desired:
+        return 0.0
+    return round((salary.max - desired) / (salary.max - salary.min), 2)
+
+
+def _on_salary_set(job: Job, value, oldvalue, initiator):
+    """Keep the parsed columns in step with every salary_range assignment"""
+    for name, parsed in salary_values(value).items():
+        setattr(job, name, parsed)
+
+
+class JobSalaries:
+    """Numeric salary columns parsed from the free-text Job.salary_range.
+
+    Every ORM assignment to salary_range, including new jobs, re-parses it
+    into indexed annual salary_min/salary_max with the currency and quoted
+    period, so salary filters are range scans on those columns. Bulk SQL
+    writes bypass the attribute event; migrate() re-parses every job.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        if not event.contains(Job.salary_range, "set", _on_salary_set):
+            event.listen(Job.salary_range, "set", _on_salary_set)
+
+    def migrate(self, db: Optional[Session] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """Parse the salary columns of every job from salary_range"""
+        owns_session = db is None
+        db = db or self.session_factory()
+        try:
+            connection = db.connection()
+            table = Job.__table__
+            statement = table.update().where(table.c.id == bindparam("job_id")).values(
+                salary_min=bindparam("min"), salary_max=bindparam("max"),
+                salary_currency=bindparam("currency"), salary_period=bindparam("period")
+            )
+            counts = {"jobs": 0, "parsed": 0}
+            last_id = 0
+            while True:
+                jobs = connection.execute(
+                    select(Job.id, Job.salary_range).where(Job.id > last_id).order_by(Job.id).limit(batch_size)
+                ).all()
+                if not jobs:
+                    break
+                rows = []
+                for job_id, salary_range in jobs:
+                    values = salary_values(salary_range)
+                    rows.append({
+                        "job_id": job_id, "min": values["salary_min"], "max": values["salary_max"],
+                        "currency": values["salary_currency"], "period": values["salary_period"]
+                    })
+                    counts["parsed"] += values["salary_max"] is not None
+                connection.execute(statement, rows)
+                counts["jobs"] += len(jobs)
+                last_id = jobs[-1][0]
+
+            db.commit()
+            logger.info(f"Salaries parsed for {counts['parsed']} of {counts['jobs']} jobs")
+            return counts
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error migrating job salaries: {str(e)}")
+            raise Exception(f"Salary migration failed: {str(e)}")
+        finally:
+            if owns_session:
+                db.close()
+
+    def ensure(self) -> bool:
+        """Parse existing salaries once, when jobs have salary text but no job
+        has parsed columns yet; returns whether it did"""
+        db = self.session_factory()
+        try:
+            if db.query(Job.id).filter(Job.salary_period.isnot(None)).first() is None and (
+                db.query(Job.id).filter(Job.salary_range.isnot(None)).first() is not None
+            ):
+                self.migrate(db)
+                return True
+            return False
+        finally:
+            db.close()
@@ -0,0 +1,220 @@
+import re
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, inspect, literal, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session, undefer_group
+
+from config import settings
+from database import engine as default_engine
+from models import Job
+from schemas import JobSearchRequest
+from services.job_salaries import salary_conditions
+from services.job_geo import gazetteer, radius_conditions
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+FTS_TABLE = "jobs_fts"
+
+# Structured filters are indexed as columns too, so FTS5 intersects their
+# postings with the keyword postings instead of every match being checked
+# against the jobs table
+FILTER_COLUMNS = ("location", "industry", "experience_level", "employment_type", "remote_work")
+FTS_COLUMNS = ("title", "company", "description") + FILTER_COLUMNS
+
+# BM25 column weights: title, company, description (filter columns do not rank)
+BM25_WEIGHTS = (10.0, 5.0, 1.0) + (0.0,) * len(FILTER_COLUMNS)
+
+
+def _values(prefix: str) -> str:
+    return ", ".join(f"{prefix}{name}" for name in FTS_COLUMNS)
+
+
+# SQLite: external-content FTS5 index of the active jobs, kept in sync by
+# triggers so ORM writes, bulk SQL and other processes are all covered
+SQLITE_SCHEMA = [
+    f"CREATE VIEW {FTS_TABLE}_source AS SELECT id, {_values('')} FROM jobs WHERE is_active",
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({', '.join(FTS_COLUMNS)}, "
+    f"content='{FTS_TABLE}_source', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON jobs WHEN new.is_active BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_values('')}) VALUES (new.id, {_values('new.')}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON jobs WHEN old.is_active BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_values('')}) VALUES ('delete', old.id, {_values('old.')}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_values('')}, is_active ON jobs BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_values('')}) SELECT 'delete', old.id, {_values('old.')} WHERE old.is_active; "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_values('')}) SELECT new.id, {_values('new.')} WHERE new.is_active; END",
+]
+
+# PostgreSQL: weighted tsvector generated from the same columns, GIN indexed
+POSTGRES_SCHEMA = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_location_search ON jobs USING GIN (to_tsvector('simple', coalesce(location, '')))",
+]
+
+# ts_rank_cd weights for {D, C, B, A}
+POSTGRES_WEIGHTS = "{0.0, 0.1, 0.5, 1.0}"
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def fts5_query(request: JobSearchRequest) -> Tuple[Optional[str], bool]:
+    """FTS5 MATCH expression for the request (every keyword in title, company
+    or description, the location words, the structured filters) and whether
+    it has keywords to rank by. User input is quoted, so it cannot inject
+    FTS5 syntax."""
+    parts = []
+    terms = TOKEN.findall(request.keywords or "")
+    if terms:
+        parts.append("{title company description} : (" + " ".join(map(_phrase, terms)) + ")")
+    places = TOKEN.findall(request.location or "") if request.radius_km is None else []
+    if places:
+        parts.append("location : (" + " ".join(map(_phrase, places)) + ")")
+
+    for name in FILTER_COLUMNS[1:]:
+        value = getattr(request, name)
+        if isinstance(value, bool):
+            parts.append(f"{name} : {_phrase(str(int(value)))}")
+        elif value and TOKEN.search(value):
+            parts.append(f"{name} : {_phrase(value)}")
+    return " AND ".join(parts) or None, bool(terms)
+
+
+class JobSearch:
+    """Full-text job search: BM25 over title, company and description
+    (SQLite FTS5, or a weighted tsvector with ts_rank_cd on PostgreSQL)
+    combined with location (words, or a radius around a gazetteer place),
+    structured and salary range filters.
+
+    Keyword matches are ranked among the newest max_candidates jobs that
+    pass the filters, so a term found in most postings costs the same as a
+    rare one; below that many matches the ranking is exact. Without
+    keywords the newest jobs come first. Other databases fall back to
+    unindexed LIKE matching.
+    """
+
+    def __init__(self, engine=default_engine, max_candidates: Optional[int] = None):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.max_candidates = max_candidates or settings.job_search_max_candidates
+
+    def ensure(self):
+        """Create the full-text index (and index existing jobs) if it does not exist"""
+        try:
+            if self.dialect == "sqlite":
+                if FTS_TABLE in inspect(self.engine).get_table_names():
+                    return
+                with self.engine.begin() as conn:
+                    for statement in SQLITE_SCHEMA:
+                        conn.execute(text(statement))
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                logger.info("Created the jobs full-text index")
+            elif self.dialect == "postgresql":
+                with self.engine.begin() as conn:
+                    for statement in POSTGRES_SCHEMA:
+                        conn.execute(text(statement))
+            else:
+                logger.warning(f"No full-text index for {self.dialect}; job search falls back to LIKE")
+
+        except Exception as e:
+            logger.error(f"Error creating the jobs full-text index: {str(e)}")
+            raise Exception(f"Job search index creation failed: {str(e)}")
+
+    def search(self, db: Session, request: JobSearchRequest) -> List[Tuple[Job, float]]:
+        """Active jobs matching the request, best first, with their relevance"""
+        try:
+            if self.dialect == "sqlite":
+                statement = self._sqlite_statement(request)
+            elif self.dialect == "postgresql":
+                statement = self._postgres_statement(request)
+            else:
+                statement = self._like_statement(request)
+            ranked = db.execute(statement).all()
+
+            jobs = {job.id: job for job in db.query(Job).options(undefer_group("details")).filter(Job.id.in_([job_id for job_id, _ in ranked]))}
+            return [(jobs[job_id], float(relevance)) for job_id, relevance in ranked if job_id in jobs]
+
+        except Exception as e:
+            logger.error(f"Error searching jobs: {str(e)}")
+            raise Exception(f"Job search failed: {str(e)}")
+
+    def _sqlite_statement(self, request: JobSearchRequest):
+        match, ranked = fts5_query(request)
+        if match is None:
+            return self._newest(request)
+
+        fts = table(FTS_TABLE, column("rowid"))
+        relevance = (-func.bm25(literal_column(FTS_TABLE), *BM25_WEIGHTS)) if ranked else literal(0.0)
+        # Exact filters are re-checked on the (few) rows the filter columns let through
+        statement = self._filter(
+            select(Job.id.label("id"), relevance.label("relevance")).join_from(fts, Job, Job.id == fts.c.rowid).where(
+                text(f"{FTS_TABLE} MATCH :match").bindparams(match=match)
+            ),
+            request
+        ).order_by(fts.c.rowid.desc())
+        if not ranked:
+            return statement.limit(request.limit).offset(request.offset)
+
+        candidates = statement.limit(max(self.max_candidates, request.offset + request.limit)).subquery()
+        return select(candidates.c.id, candidates.c.relevance).order_by(
+            candidates.c.relevance.desc(), candidates.c.id.desc()
+        ).limit(request.limit).offset(request.offset)
+
+    def _postgres_statement(self, request: JobSearchRequest):
+        if not TOKEN.search(request.keywords or ""):
+            statement = self._newest(request)
+        else:
+            search_vector = literal_column("jobs.search_vector")
+            query = func.websearch_to_tsquery("english", request.keywords)
+            rank = func.ts_rank_cd(literal_column(f"'{POSTGRES_WEIGHTS}'::float4[]"), search_vector, query)
+            statement = self._filter(
+                select(Job.id, rank.label("relevance")).where(search_vector.op("@@")(query)), request
+            ).order_by(rank.desc(), Job.id.desc()).limit(request.limit).offset(request.offset)
+        if request.radius_km is None and TOKEN.search(request.location or ""):
+            statement = statement.where(
+                func.to_tsvector("simple", func.coalesce(Job.location, "")).op("@@")(
+                    func.plainto_tsquery("simple", request.location)
+                )
+            )
+        return statement
+
+    def _like_statement(self, request: JobSearchRequest):
+        statement = self._newest(request)
+        for term in TOKEN.findall(request.keywords or ""):
+            pattern = f"%{term}%"
+            statement = statement.where(or_(
+                Job.title.ilike(pattern), Job.company.ilike(pattern), Job.description.ilike(pattern)
+            ))
+        if request.location and request.radius_km is None:
+            statement = statement.where(Job.location.ilike(f"%{request.location}%"))
+        return statement
+
+    def _newest(self, request: JobSearchRequest):
+        return self._filter(select(Job.id, literal(0.0)), request).order_by(
+            Job.id.desc()
+        ).limit(request.limit).offset(request.offset)
+
+    def _filter(self, statement, request: JobSearchRequest):
+        conditions = [Job.is_active == True]
+        if request.industry:
+            conditions.append(Job.industry == request.industry)
+        if request.experience_level:
+            conditions.append(Job.experience_level == request.experience_level)
+        if request.employment_type:
+            conditions.append(Job.employment_type == request.employment_type)
+        if request.remote_work is not None:
+            conditions.append(Job.remote_work == request.remote_work)
+        conditions.extend(salary_conditions(request.salary_min, request.salary_max, request.salary_currency))
+        if request.radius_km is not None:
+            center = gazetteer.resolve(request.location)
+            if center is None:
+                raise ValueError(f"Unknown location: {request.location}")
+            conditions.extend(radius_conditions(center, request.radius_km))
+        return statement.where(and_(*conditions))
@@ -0,0 +1,217 @@
+import json
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, dialect_insert
+from models import Job, JobTrendCount
+
+logger = logging.getLogger(__name__)
+
+# Job columns the counters depend on
+TRACKED = (
+    "is_active", "posted_date", "required_skills", "industry", "experience_level",
+    "salary_range", "salary_min", "salary_max", "salary_currency", "remote_work"
+)
+
+SALARY_BAND = 25000  # width of the annual salary bands jobs are counted in
+
+PENDING = "job_trends_pending"  # session.info key: counts removed by the flush in progress
+
+CounterKey = Tuple[str, str, date]  # (dimension, value, posted day)
+
+
+def job_counts(values) -> Counter:
+    """Counters one job contributes (none when inactive); values maps the TRACKED columns"""
+    counts: Counter = Counter()
+    if not values["is_active"]:
+        return counts
+
+    day = (values["posted_date"] or datetime.utcnow()).date()
+    counts[("total", "", day)] += 1
+    for skill in json.loads(values["required_skills"]) if values["required_skills"] else []:
+        counts[("skill", str(skill)[:255], day)] += 1
+    for dimension in ("industry", "experience_level"):
+        if values[dimension]:
+            counts[(dimension, values[dimension], day)] += 1
+    if values["salary_max"] is not None:
+        counts[("salary_band", salary_band(values), day)] += 1
+    if values["remote_work"]:
+        counts[("remote", "", day)] += 1
+    return counts
+
+
+def salary_band(values) -> str:
+    """Counter value of the band holding the midpoint of a job's annual salary
+    range: "<currency>:<band start>" (no currency when the text named none)"""
+    midpoint = (values["salary_min"] + values["salary_max"]) / 2
+    return f"{values['salary_currency'] or ''}:{int(midpoint // SALARY_BAND) * SALARY_BAND}"
+
+
+def _salary_ranges(bands: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    ranges = []
+    for value, count in bands:
+        currency, start = value.split(":")
+        start = int(start)
+        ranges.append({
+            "range": f"{currency + ' ' if currency else ''}{start:,} - {start + SALARY_BAND:,}",
+            "currency": currency or None,
+            "min": start,
+            "max": start + SALARY_BAND,
+            "count": count
+        })
+    ranges.sort(key=lambda item: (item["currency"] or "", item["min"]))
+    return ranges
+
+
+def _job_values(job: Job) -> Dict[str, Any]:
+    return {name: getattr(job, name) for name in TRACKED}
+
+
+def _has_tracked_changes(job: Job) -> bool:
+    attrs = inspect(job).attrs
+    return any(attrs[name].history.has_changes() for name in TRACKED)
+
+
+def _before_flush(session: Session, flush_context, instances):
+    """Read what changed and deleted jobs counted before this flush overwrites them"""
+    changed = [job for job in session.dirty if isinstance(job, Job) and _has_tracked_changes(job)]
+    deleted = [job for job in session.deleted if isinstance(job, Job)]
+    job_ids = [inspect(job).identity[0] for job in changed + deleted if inspect(job).identity]
+
+    removed: Counter = Counter()
+    if job_ids:
+        columns = [getattr(Job, name) for name in TRACKED]
+        for row in session.connection().execute(select(*columns).where(Job.id.in_(job_ids))):
+            removed.update(job_counts(row._mapping))
+    session.info[PENDING] = (removed, changed)
+
+
+def _after_flush(session: Session, flush_context):
+    """Apply the difference between the counts after and before the flush"""
+    removed, changed = session.info.pop(PENDING, (Counter(), []))
+    delta: Counter = Counter()
+    for job in list(session.new) + changed:
+        if isinstance(job, Job) and job not in session.deleted:
+            delta.update(job_counts(_job_values(job)))
+    delta.subtract(removed)
+    apply_counts(session.connection(), delta)
+
+
+def apply_counts(connection, delta: Counter):
+    """Add (dimension, value, day) -> delta to the counters in one statement"""
+    rows = [
+        {"dimension": dimension, "value": value, "posted_day": day, "count": count}
+        for (dimension, value, day), count in delta.items() if count
+    ]
+    if not rows:
+        return
+
+    table = JobTrendCount.__table__
+    statement = dialect_insert(connection, table)
+    if statement is not None:
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["dimension", "value", "posted_day"],
+            set_={"count": table.c.count + statement.excluded["count"]}
+        ), rows)
+        return
+
+    # Other databases: update, then insert the keys that did not exist yet
+    for row in rows:
+        updated = connection.execute(
+            table.update().where(
+                (table.c.dimension == row["dimension"]) &
+                (table.c.value == row["value"]) &
+                (table.c.posted_day == row["posted_day"])
+            ).values(count=table.c.count + row["count"])
+        )
+        if updated.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+class JobTrends:
+    """Job market trends from per-posted-day counters of active jobs.
+
+    Counters (total, required skill, industry, experience level, annual
+    salary band, remote) are updated in the same transaction as every ORM job
+    insert, update, deactivation or delete, so reading trends is one grouped
+    query over the counters whatever the number of jobs. Bulk SQL updates
+    bypass the session events; rebuild() recounts from the jobs table.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        if not event.contains(session_factory, "before_flush", _before_flush):
+            event.listen(session_factory, "before_flush", _before_flush)
+            event.listen(session_factory, "after_flush", _after_flush)
+
+    def trends(self, db: Session, days: Optional[int] = None, top_skills: int = 10) -> Dict[str, Any]:
+        """Trends of the active jobs, or of those posted in the last `days` days"""
+        query = db.query(
+            JobTrendCount.dimension, JobTrendCount.value, func.sum(JobTrendCount.count)
+        )
+        if days:
+            query = query.filter(JobTrendCount.posted_day >= datetime.utcnow().date() - timedelta(days=days - 1))
+        rows = query.group_by(JobTrendCount.dimension, JobTrendCount.value).having(
+            func.sum(JobTrendCount.count) > 0
+        ).all()
+
+        counts: Dict[str, List[Tuple[str, int]]] = {}
+        for dimension, value, count in rows:
+            counts.setdefault(dimension, []).append((value, int(count)))
+        for values in counts.values():
+            values.sort(key=lambda item: (-item[1], item[0]))
+
+        total = sum(count for _, count in counts.get("total", []))
+        remote = sum(count for _, count in counts.get("remote", []))
+        return {
+            'total_jobs': total,
+            'top_skills': [{"skill": skill, "count": count} for skill, count in counts.get("skill", [])[:top_skills]],
+            'industry_distribution': [{"industry": value, "count": count} for value, count in counts.get("industry", [])],
+            'experience_level_distribution': [{"level": value, "count": count} for value, count in counts.get("experience_level", [])],
+            'salary_ranges': _salary_ranges(counts.get("salary_band", [])),
+            'remote_work_percentage': round((remote / total) * 100, 2) if total else 0.0
+        }
+
+    def rebuild(self, db: Optional[Session] = None) -> int:
+        """Recount every counter from the jobs table; returns the active jobs counted"""
+        owns_session = db is None
+        db = db or self.session_factory()
+        try:
+            counts: Counter = Counter()
+            columns = [getattr(Job, name) for name in TRACKED]
+            for row in db.execute(select(*columns).where(Job.is_active == True).execution_options(yield_per=1000)):
+                counts.update(job_counts(row._mapping))
+
+            db.query(JobTrendCount).delete(synchronize_session=False)
+            apply_counts(db.connection(), counts)
+            db.commit()
+
+            total = sum(count for (dimension, _, _), count in counts.items() if dimension == "total")
+            logger.info(f"Job trend counters rebuilt from {total} active jobs")
+            return total
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error rebuilding job trend counters: {str(e)}")
+            raise Exception(f"Job trend rebuild failed: {str(e)}")
+        finally:
+            if owns_session:
+                db.close()
+
+    def ensure(self, rebuild: bool = False):
+        """Count existing jobs once, when the counters table is still empty or
+        holds the per-string salary_range counters of earlier versions (or
+        when `rebuild` is set)"""
+        db = self.session_factory()
+        try:
+            if rebuild or db.query(JobTrendCount.id).filter(JobTrendCount.dimension == "salary_range").first():
+                self.rebuild(db)
+            elif db.query(JobTrendCount.id).first() is None and db.query(Job.id).filter(Job.is_active == True).first():
+                self.rebuild(db)
+        finally:
+            db.close()
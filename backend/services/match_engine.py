@@ -0,0 +1,479 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from services.job_geo import GeoPoint, distance_km, distance_score
+from services.job_index import IndexedJob, JobIndex, ResumeProfile
+from services.skill_index import SkillIndex
+from services.tfidf_model import TfidfArtifact, TfidfModelStore, skills_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompiledJobs:
+    """Column-oriented view of a JobIndex snapshot"""
+    version: int
+    jobs: List[IndexedJob]
+
+    # job x skill counts of required skills (duplicates counted like the list scan)
+    skill_ids: Dict[str, int]
+    required: sparse.csr_matrix
+    required_count: np.ndarray
+
+    # L2-normalized TF-IDF vectors of the required skills text under the
+    # corpus model (None until a model is fitted)
+    tfidf: Optional[TfidfArtifact]
+    job_vectors: Optional[sparse.csr_matrix]
+    job_has_terms: np.ndarray
+
+    # Experience, industry and location features
+    has_experience_range: np.ndarray
+    experience_min: np.ndarray
+    experience_max: np.ndarray
+    industries: List[Optional[str]]
+    industry_codes: np.ndarray
+    location_score: np.ndarray  # without an origin to measure distance from
+
+    # Coordinates (NaN when unknown) and the jobs whose location score
+    # decays with the distance from a profile's origin
+    latitude: np.ndarray
+    longitude: np.ndarray
+    distance_scored: np.ndarray
+
+    # Posting lists and facet groups for pruned top-k search
+    skill_index: SkillIndex
+
+
+@dataclass
+class ScoringQuery:
+    """One profile's query against the compiled job arrays, small enough to
+    send to the worker processes of a sharded scorer"""
+    skill_columns: np.ndarray  # columns of the resume's skills in the job x skill matrix
+    n_skills: int
+    resume_vector: Optional[sparse.csr_matrix]  # TF-IDF vector, None when the similarity term doesn't apply
+    has_skills: bool
+    experience_years: Optional[float]
+    industry_scores: np.ndarray  # per industry code
+    origin: Optional[GeoPoint] = None
+    radius_km: Optional[float] = None
+
+    def resume_skills(self) -> np.ndarray:
+        """Indicator vector of the resume's skills"""
+        resume_skills = np.zeros(self.n_skills)
+        resume_skills[self.skill_columns] = 1.0
+        return resume_skills
+
+
+def skills_scores(features, has_skills: bool, resume_skills: np.ndarray,
+                  resume_vector: Optional[sparse.csr_matrix], rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Skills component for every job of features (CompiledJobs or one shard
+    of it), or only for the job positions in rows"""
+    required_count = features.required_count if rows is None else features.required_count[rows]
+    has_required = required_count > 0
+    scores = np.full(len(required_count), 0.5)  # Neutral score if no required skills specified
+
+    if not has_skills:
+        scores[has_required] = 0.0
+        return scores
+
+    required = features.required if rows is None else features.required[rows]
+    exact = np.zeros(len(required_count))
+    np.divide(required @ resume_skills, required_count, out=exact, where=has_required)
+    scores[has_required] = exact[has_required]
+
+    if resume_vector is not None:
+        job_vectors = features.job_vectors if rows is None else features.job_vectors[rows]
+        job_has_terms = features.job_has_terms if rows is None else features.job_has_terms[rows]
+        similarity = (job_vectors @ resume_vector.T).toarray().ravel()
+
+        # Without shared vocabulary on either side the matcher keeps the exact score
+        fitted = (required_count > 1) & job_has_terms
+        combined = np.minimum((exact * 0.7) + (similarity * 0.3), 1.0)
+        scores[fitted] = combined[fitted]
+
+    return scores
+
+
+def location_scores(features, origin: GeoPoint) -> Tuple[np.ndarray, np.ndarray]:
+    """Location score of every job decaying with its distance from origin,
+    and the distances (NaN where the job has no coordinates)"""
+    distances = distance_km(origin.latitude, origin.longitude, features.latitude, features.longitude)
+    located = ~np.isnan(distances)
+    decayed = np.full(len(distances), 0.5)  # Job location not in the gazetteer
+    decayed[located] = distance_score(distances[located])
+    return np.where(features.distance_scored, decayed, features.location_score), distances
+
+
+def experience_scores(has_range: np.ndarray, low: np.ndarray, high: np.ndarray,
+                      experience_years: Optional[float]) -> np.ndarray:
+    if experience_years is None:
+        return np.full(len(has_range), 0.5)
+
+    years = float(experience_years)
+    scores = np.where(
+        (low <= years) & (years <= high),
+        1.0,
+        np.where(
+            years < low,
+            np.maximum(0.0, 1.0 - ((low - years) * 0.2)),  # Underqualified
+            np.maximum(0.5, 1.0 - ((years - high) * 0.1))  # Overqualified
+        )
+    )
+    return np.where(has_range, scores, 0.5)
+
+
+def overall_scores(features, query: ScoringQuery) -> np.ndarray:
+    """Overall match score of every job of features (CompiledJobs or one shard
+    of it); with an origin and radius_km, jobs farther than that score 0"""
+    location_score = features.location_score
+    if query.origin is not None:
+        location_score, distances = location_scores(features, query.origin)
+    skills_score = skills_scores(features, query.has_skills, query.resume_skills(), query.resume_vector)
+    experience_score = experience_scores(
+        features.has_experience_range, features.experience_min, features.experience_max,
+        query.experience_years
+    )
+    industry_score = query.industry_scores[features.industry_codes]
+
+    overall = (
+        skills_score * 0.4 +
+        experience_score * 0.3 +
+        industry_score * 0.2 +
+        location_score * 0.1
+    )
+    overall = np.minimum(overall, 1.0)
+    if query.origin is not None and query.radius_km is not None:
+        overall[~(distances <= query.radius_km)] = 0.0
+    return overall
+
+
+def rank_top_k(scores: np.ndarray, k: int, threshold: float = 0.3, offset: int = 0) -> List[Tuple[int, float]]:
+    """Positions (plus offset) and scores of the k best jobs above threshold.
+
+    Ranked like JobMatcher.find_matches: by score rounded to two decimals,
+    ties kept in job order. Per-shard results ranked with an offset of the
+    shard's first position merge into the same ranking (merge_top_k).
+    """
+    candidates = np.flatnonzero(scores > threshold)
+    if k <= 0 or len(candidates) == 0:
+        return []
+
+    if len(candidates) > k:
+        # Everything that can round to at least the k-th best rounded score
+        kth = np.partition(scores[candidates], -k)[-k]
+        cutoff = round(float(kth), 2) - 0.0051
+        candidates = candidates[scores[candidates] >= cutoff]
+
+    return merge_top_k([(int(position) + offset, float(scores[position])) for position in candidates], k)
+
+
+def merge_top_k(items: List[Tuple[int, float]], k: int) -> List[Tuple[int, float]]:
+    """The k best (position, score) items in find_matches order"""
+    return sorted(items, key=lambda item: (-round(item[1], 2), item[0]))[:k]
+
+
+class MatchEngine:
+    """Scores one resume against every indexed job with sparse/dense array operations.
+
+    Produces the same scores as JobMatcher._calculate_match_score (0.4 skills,
+    0.3 experience, 0.2 industry, 0.1 location). The TF-IDF cosine of the
+    skills component comes from the corpus-fitted model: job vectors are
+    compiled once per index snapshot and model version, and a query is one
+    sparse matrix-vector product against the transformed resume.
+    """
+
+    def __init__(self, job_index: JobIndex, matcher, tfidf_model: TfidfModelStore, scorer=None):
+        self.job_index = job_index
+        self.matcher = matcher
+        self.tfidf_model = tfidf_model
+        # Optional ShardedScorer (services/match_shards.py) for exhaustive scoring
+        self.scorer = scorer
+        self._compiled: Optional[CompiledJobs] = None
+        self._lock = threading.Lock()
+
+    def compiled(self) -> CompiledJobs:
+        """Compiled arrays for the current index snapshot and TF-IDF model"""
+        jobs = self.job_index.jobs()
+        tfidf = self.tfidf_model.ensure(lambda: jobs)
+        if self._is_current(self._compiled, tfidf):
+            return self._compiled
+
+        with self._lock:
+            if not self._is_current(self._compiled, tfidf):
+                self._compiled = self._compile(jobs, self.job_index.version, tfidf)
+            return self._compiled
+
+    def warm_up(self):
+        """Compile the current snapshot and, with a sharded scorer, start its
+        workers and publish the arrays to them"""
+        compiled = self.compiled()
+        if self.scorer is not None and self.scorer.applies(len(compiled.jobs)):
+            self.scorer.publish(compiled)
+
+    def shutdown(self):
+        if self.scorer is not None:
+            self.scorer.shutdown()
+
+    def _is_current(self, compiled: Optional[CompiledJobs], tfidf: Optional[TfidfArtifact]) -> bool:
+        return (
+            compiled is not None and
+            compiled.version == self.job_index.version and
+            compiled.tfidf is tfidf
+        )
+
+    def _compile(self, jobs: List[IndexedJob], version: int, tfidf: Optional[TfidfArtifact]) -> CompiledJobs:
+        n_jobs = len(jobs)
+        skill_ids: Dict[str, int] = {}
+        skill_rows, skill_cols = [], []
+        required_count = np.zeros(n_jobs)
+        has_range = np.zeros(n_jobs, dtype=bool)
+        experience_min = np.zeros(n_jobs)
+        experience_max = np.zeros(n_jobs)
+        industry_ids: Dict[Optional[str], int] = {}
+        industry_codes = np.zeros(n_jobs, dtype=np.int64)
+        location_score = np.zeros(n_jobs)
+        latitude = np.full(n_jobs, np.nan)
+        longitude = np.full(n_jobs, np.nan)
+        distance_scored = np.zeros(n_jobs, dtype=bool)
+
+        for row, job in enumerate(jobs):
+            for skill in job.required_lower:
+                skill_rows.append(row)
+                skill_cols.append(skill_ids.setdefault(skill, len(skill_ids)))
+            required_count[row] = len(job.required_lower)
+
+            if job.experience_range is not None:
+                has_range[row] = True
+                experience_min[row], experience_max[row] = job.experience_range
+
+            industry_codes[row] = industry_ids.setdefault(job.industry, len(industry_ids))
+            location_score[row] = self.matcher._calculate_location_match(None, job)
+            if job.coordinates is not None:
+                latitude[row], longitude[row] = job.coordinates
+            distance_scored[row] = bool(job.location) and not job.remote_work
+
+        required = sparse.csr_matrix(
+            (np.ones(len(skill_rows)), (skill_rows, skill_cols)), shape=(n_jobs, len(skill_ids))
+        )
+        job_vectors = self.tfidf_model.job_vectors(tfidf, jobs) if tfidf is not None else None
+        job_has_terms = np.diff(job_vectors.indptr) > 0 if job_vectors is not None else np.zeros(n_jobs, dtype=bool)
+
+        logger.info(
+            f"Match engine compiled {n_jobs} jobs, {len(skill_ids)} skills, "
+            f"TF-IDF model {tfidf.version if tfidf else 'none'}"
+        )
+        return CompiledJobs(
+            version=version,
+            jobs=jobs,
+            skill_ids=skill_ids,
+            required=required,
+            required_count=required_count,
+            tfidf=tfidf,
+            job_vectors=job_vectors,
+            job_has_terms=job_has_terms,
+            has_experience_range=has_range,
+            experience_min=experience_min,
+            experience_max=experience_max,
+            industries=list(industry_ids),
+            industry_codes=industry_codes,
+            location_score=location_score,
+            latitude=latitude,
+            longitude=longitude,
+            distance_scored=distance_scored,
+            skill_index=SkillIndex(
+                required, job_vectors, required_count, has_range,
+                experience_min, experience_max, industry_codes, location_score
+            )
+        )
+
+    def score(self, profile: ResumeProfile, radius_km: Optional[float] = None) -> Tuple[List[IndexedJob], np.ndarray]:
+        """Overall match score of the profile against every indexed job; with
+        radius_km, jobs farther than that from the profile's origin score 0"""
+        compiled = self.compiled()
+        return compiled.jobs, overall_scores(compiled, self.scoring_query(compiled, profile, radius_km))
+
+    def scoring_query(self, compiled: CompiledJobs, profile: ResumeProfile,
+                      radius_km: Optional[float] = None) -> ScoringQuery:
+        resume_skills, resume_vector = self._resume_query(compiled, profile)
+        return ScoringQuery(
+            skill_columns=np.flatnonzero(resume_skills),
+            n_skills=len(resume_skills),
+            resume_vector=resume_vector,
+            has_skills=bool(profile.skills_lower),
+            experience_years=profile.experience_years,
+            industry_scores=self._industry_scores(compiled, profile.industry),
+            origin=profile.origin,
+            radius_km=radius_km
+        )
+
+    def search(self, profile: ResumeProfile, k: int, threshold: float = 0.3, block_size: int = 4096,
+               radius_km: Optional[float] = None) -> Tuple[List[IndexedJob], List[Tuple[int, float]]]:
+        """Same result as top_k(score(profile)) without scoring every job.
+
+        Score = 0.4 * skills + facet score (experience, industry, location),
+        where the facet score is shared by every job of a facet group.
+        MaxScore-style pruning on top of the skill index:
+        - every job with required skills scores at least its bucket score
+          (skills >= 0), so bucket sizes alone give a first cutoff for the k-th
+          best score before any posting list is read;
+        - skill posting lists are read only for groups whose facet score plus
+          a perfect skills score reaches the cutoff;
+        - TF-IDF term lists are non-essential: a job sharing terms but no
+          skill scores at most 0.3 on skills, so they are read only for groups
+          where that can still reach the cutoff;
+        - jobs sharing nothing score their bucket score exactly, so only the
+          first members of each bucket are taken (lower positions win ties);
+        - candidates are scored in blocks by descending upper bound, stopping
+          once no remaining bound reaches the current k-th best score.
+        A profile with an origin gives every job its own location score, so
+        it is scored exhaustively instead (still one pass over the arrays),
+        fanned out over the sharded scorer's worker processes when there is
+        one and the corpus is large enough.
+        """
+        if profile.origin is not None:
+            compiled = self.compiled()
+            if self.scorer is not None and self.scorer.applies(len(compiled.jobs)):
+                query = self.scoring_query(compiled, profile, radius_km)
+                return compiled.jobs, self.scorer.top_k(compiled, query, k, threshold)
+            jobs, scores = self.score(profile, radius_km)
+            return jobs, self.top_k(scores, k, threshold)
+        
+        compiled = self.compiled()
+        index = compiled.skill_index
+        if k <= 0 or not compiled.jobs:
+            return compiled.jobs, []
+
+        # Experience, industry and location scores per facet group
+        group_experience = self._experience_scores(
+            index.group_has_experience_range, index.group_experience_min, index.group_experience_max,
+            profile.experience_years
+        )
+        group_industry = self._industry_scores(compiled, profile.industry)[index.group_industry_codes]
+        group_location = index.group_location_score
+
+        def overall(skills_score, groups: np.ndarray) -> np.ndarray:
+            # Same operation order as score() so results are bit-identical
+            return np.minimum(
+                skills_score * 0.4 +
+                group_experience[groups] * 0.3 +
+                group_industry[groups] * 0.2 +
+                group_location[groups] * 0.1,
+                1.0
+            )
+
+        def reaches(scores: np.ndarray, cutoff: float) -> np.ndarray:
+            return (scores > threshold) & (scores >= cutoff)
+
+        # Bucket scores: exact for members sharing nothing, a lower bound for the rest
+        bucket_groups = index.bucket_groups()
+        bucket_has_required = index.bucket_has_required()
+        bucket_scores = overall(np.where(bucket_has_required, 0.0, 0.5), bucket_groups)
+        bucket_order = np.argsort(-bucket_scores, kind="stable")
+        bucket_sizes = np.diff(index.bucket_offsets)[bucket_order]
+        filled = np.searchsorted(np.cumsum(bucket_sizes), k)
+        cutoff = threshold
+        if filled < len(bucket_order):
+            cutoff = max(cutoff, round(float(bucket_scores[bucket_order[filled]]), 2) - 0.0051)
+
+        query = self._resume_query(compiled, profile)
+        resume_skills, resume_vector = query
+        all_groups = np.arange(index.n_groups)
+        candidates = index.candidates(
+            np.flatnonzero(resume_skills),
+            resume_vector.indices if resume_vector is not None else (),
+            skill_groups=reaches(overall(1.0, all_groups), cutoff),
+            term_groups=reaches(overall(0.3, all_groups), cutoff)
+        )
+
+        found_positions: List[np.ndarray] = []
+        found_scores: List[np.ndarray] = []
+        found_count = 0
+
+        def collect(positions: np.ndarray, scores: np.ndarray):
+            nonlocal found_count, cutoff
+            keep = reaches(scores, cutoff)
+            if not keep.any():
+                return
+            found_positions.append(positions[keep])
+            found_scores.append(scores[keep])
+            found_count += int(keep.sum())
+            if found_count >= k:
+                # Anything below this can't round up to the k-th best score
+                kth = np.partition(np.concatenate(found_scores), -k)[-k]
+                cutoff = max(cutoff, round(float(kth), 2) - 0.0051)
+
+        # Jobs sharing nothing with the resume. Any bucket still reaching the
+        # cutoff lies in a group whose postings were all read above.
+        candidates_per_bucket = np.bincount(index.bucket_of[candidates], minlength=len(bucket_scores))
+        for bucket in bucket_order:
+            if not reaches(bucket_scores[bucket:bucket + 1], cutoff)[0]:
+                break
+            if index.bucket_offsets[bucket + 1] - index.bucket_offsets[bucket] == candidates_per_bucket[bucket]:
+                continue
+            members = index.bucket_members(bucket, k, candidates, int(candidates_per_bucket[bucket]))
+            collect(members, np.full(len(members), bucket_scores[bucket]))
+
+        # Jobs from the posting lists, best upper bound first
+        if len(candidates):
+            bounds = overall(np.ones(len(candidates)), index.group_of[candidates])
+            order = np.argsort(-bounds, kind="stable")
+            candidates, bounds = candidates[order], bounds[order]
+            for start in range(0, len(candidates), block_size):
+                if not reaches(bounds[start:start + 1], cutoff)[0]:
+                    break
+                block = candidates[start:start + block_size]
+                skills_score = self._skills_scores(compiled, profile, query, rows=block)
+                collect(block, overall(skills_score, index.group_of[block]))
+
+        if not found_positions:
+            return compiled.jobs, []
+        positions = np.concatenate(found_positions)
+        scores = np.concatenate(found_scores)
+        return compiled.jobs, merge_top_k(
+            [(int(position), float(score)) for position, score in zip(positions, scores)], k
+        )
+
+    def _resume_query(self, compiled: CompiledJobs,
+                      profile: ResumeProfile) -> Tuple[np.ndarray, Optional[sparse.csr_matrix]]:
+        """Indicator vector of the resume's skills and its TF-IDF vector
+        (None when the similarity term doesn't apply)"""
+        resume_skills = np.zeros(len(compiled.skill_ids))
+        for skill in profile.skills_lower_set:
+            column = compiled.skill_ids.get(skill)
+            if column is not None:
+                resume_skills[column] = 1.0
+
+        resume_vector = None
+        if len(profile.skills_lower) > 1 and compiled.tfidf is not None:
+            vector = compiled.tfidf.transform([skills_text(profile.skills_lower)])
+            if vector.nnz > 0:
+                resume_vector = vector
+        return resume_skills, resume_vector
+
+    def _skills_scores(self, compiled: CompiledJobs, profile: ResumeProfile,
+                       query: Tuple[np.ndarray, Optional[sparse.csr_matrix]],
+                       rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Skills component for every job, or only for the job positions in rows"""
+        resume_skills, resume_vector = query
+        return skills_scores(compiled, bool(profile.skills_lower), resume_skills, resume_vector, rows)
+
+    def _industry_scores(self, compiled: CompiledJobs, industry: Optional[str]) -> np.ndarray:
+        """Industry score per distinct job industry (indexed by industry code)"""
+        return np.array([
+            self.matcher._calculate_industry_match(industry, job_industry)
+            for job_industry in compiled.industries
+        ] or [0.0])
+
+    @staticmethod
+    def _experience_scores(has_range: np.ndarray, low: np.ndarray, high: np.ndarray,
+                           experience_years: Optional[float]) -> np.ndarray:
+        return experience_scores(has_range, low, high, experience_years)
+
+    def top_k(self, scores: np.ndarray, k: int, threshold: float = 0.3) -> List[Tuple[int, float]]:
+        """Positions and scores of the k best jobs above threshold (see rank_top_k)"""
+        return rank_top_k(scores, k, threshold)
@@ -0,0 +1,240 @@
+import os
+import uuid
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from config import settings
+from services.match_engine import CompiledJobs, ScoringQuery, merge_top_k, overall_scores, rank_top_k
+
+logger = logging.getLogger(__name__)
+
+ALIGNMENT = 64  # byte alignment of each array in a shared block
+
+# Dense per-job arrays of CompiledJobs that scoring reads
+DENSE_FIELDS = (
+    "required_count", "job_has_terms", "has_experience_range", "experience_min", "experience_max",
+    "industry_codes", "location_score", "latitude", "longitude", "distance_scored",
+)
+SPARSE_FIELDS = ("required", "job_vectors")
+
+# Shared blocks attached by a worker process: name -> (block, shards built from it)
+_worker_blocks: Dict[str, Tuple[SharedMemory, Dict[int, "JobShard"]]] = {}
+
+
+class JobShard:
+    """A contiguous range of jobs as read-only views over a shared block;
+    has the CompiledJobs attributes overall_scores reads"""
+
+    def __init__(self, buffer, manifest: Dict[str, Any], index: int):
+        self.start, self.end = manifest["shards"][index]
+        arrays = {
+            key: _view(buffer, *layout)
+            for key, layout in manifest["arrays"].items() if key.startswith(f"{index}.")
+        }
+        for name in DENSE_FIELDS:
+            setattr(self, name, arrays[f"{index}.{name}"])
+        for name in SPARSE_FIELDS:
+            shape = manifest["sparse_shapes"][index].get(name)
+            setattr(self, name, sparse.csr_matrix(
+                (arrays[f"{index}.{name}.data"], arrays[f"{index}.{name}.indices"], arrays[f"{index}.{name}.indptr"]),
+                shape=shape, copy=False
+            ) if shape is not None else None)
+
+
+def _view(buffer, offset: int, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+    array.flags.writeable = False
+    return array
+
+
+def _shard_arrays(compiled: CompiledJobs, index: int, start: int, end: int) -> Tuple[Dict[str, np.ndarray], Dict]:
+    arrays = {f"{index}.{name}": getattr(compiled, name)[start:end] for name in DENSE_FIELDS}
+    shapes = {}
+    for name in SPARSE_FIELDS:
+        matrix = getattr(compiled, name)
+        if matrix is None:
+            continue
+        rows = matrix[start:end]  # re-based indptr, own copy of the shard's entries
+        arrays[f"{index}.{name}.data"] = rows.data
+        arrays[f"{index}.{name}.indices"] = rows.indices
+        arrays[f"{index}.{name}.indptr"] = rows.indptr
+        shapes[name] = rows.shape
+    return arrays, shapes
+
+
+class SharedJobs:
+    """The scoring arrays of one compiled snapshot, split into shards and
+    copied once into a single shared memory block that every worker maps"""
+
+    def __init__(self, compiled: CompiledJobs, n_shards: int):
+        n_jobs = len(compiled.jobs)
+        bounds = np.linspace(0, n_jobs, n_shards + 1).astype(int)
+        shards = [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+        arrays: Dict[str, np.ndarray] = {}
+        sparse_shapes = []
+        for index, (start, end) in enumerate(shards):
+            shard_arrays, shapes = _shard_arrays(compiled, index, start, end)
+            arrays.update(shard_arrays)
+            sparse_shapes.append(shapes)
+
+        layout: Dict[str, Tuple[int, str, Tuple[int, ...]]] = {}
+        size = 0
+        for key, array in arrays.items():
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout[key] = (size, array.dtype.str, array.shape)
+            size += array.nbytes
+
+        self.block = SharedMemory(name=f"jobs_{os.getpid()}_{uuid.uuid4().hex[:12]}", create=True, size=max(size, 1))
+        for key, array in arrays.items():
+            offset, dtype, shape = layout[key]
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.block.buf, offset=offset)[...] = array
+
+        self.compiled = compiled
+        self.nbytes = size
+        self.manifest = {"name": self.block.name, "shards": shards, "arrays": layout, "sparse_shapes": sparse_shapes}
+
+    def close(self):
+        """Unlink the block; workers still mapping it keep their mapping until they detach"""
+        self.block.close()
+        self.block.unlink()
+
+
+def _worker_shard(manifest: Dict[str, Any], index: int) -> JobShard:
+    name = manifest["name"]
+    if name not in _worker_blocks:
+        # A new snapshot: detach from the previous ones
+        for block, _ in _worker_blocks.values():
+            block.close()
+        _worker_blocks.clear()
+        _worker_blocks[name] = (SharedMemory(name=name), {})
+    block, shards = _worker_blocks[name]
+    if index not in shards:
+        shards[index] = JobShard(block.buf, manifest, index)
+    return shards[index]
+
+
+def _score_shard(manifest: Dict[str, Any], index: int, query: ScoringQuery, k: int,
+                 threshold: float) -> List[Tuple[int, float]]:
+    """Task entry point executed inside a worker process: the shard's k best jobs"""
+    shard = _worker_shard(manifest, index)
+    return rank_top_k(overall_scores(shard, query), k, threshold, offset=shard.start)
+
+
+def _worker_memory() -> Dict[str, Any]:
+    """Resident and private memory of a worker process in kB (Linux), for benchmarks"""
+    usage = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/smaps_rollup") as handle:
+            for line in handle:
+                name, _, value = line.partition(":")
+                if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean", "Shared_Dirty"):
+                    usage[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return usage
+
+
+def _ping() -> bool:
+    """No-op task used to spawn workers"""
+    return True
+
+
+class ShardedScorer:
+    """Exhaustive match scoring fanned out over a pool of worker processes.
+
+    The dense and sparse job arrays of the current compiled snapshot are
+    split into one shard per worker and copied once into a shared memory
+    block; workers map it read-only, so the job features are held once
+    whatever the number of workers. A query sends only the resume's skill
+    columns, TF-IDF vector and facet scores; each worker scores its shard
+    and returns its own top k, and the per-shard results merge into the
+    same ranking as scoring every job in one process. A new snapshot is
+    published on the first query after a recompile; the previous block is
+    unlinked at the following publish, once queries against it are done.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_jobs: Optional[int] = None):
+        self.workers = workers if workers is not None else settings.match_workers
+        self.min_jobs = min_jobs if min_jobs is not None else settings.match_parallel_min_jobs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._published: List[SharedJobs] = []  # current snapshot last
+        self._lock = threading.Lock()
+
+    def applies(self, n_jobs: int) -> bool:
+        """Whether to score this many jobs in the workers (smaller corpora cost less in-process)"""
+        return self.workers > 1 and n_jobs >= self.min_jobs
+
+    def start(self):
+        """Create the worker pool and spawn every worker"""
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+            logger.info(f"Started match scoring pool with {self.workers} workers")
+
+    def publish(self, compiled: CompiledJobs) -> SharedJobs:
+        """Shared arrays of a compiled snapshot, copied into a new block when it is not the current one"""
+        if self._executor is None:
+            self.start()
+        with self._lock:
+            if self._published and self._published[-1].compiled is compiled:
+                return self._published[-1]
+
+            shared = SharedJobs(compiled, self.workers)
+            # Keep the previous block for queries still reading it
+            while len(self._published) > 1:
+                self._published.pop(0).close()
+            self._published.append(shared)
+            logger.info(
+                f"Published {len(compiled.jobs)} jobs in {len(shared.manifest['shards'])} shards "
+                f"({shared.nbytes / 2 ** 20:.0f} MB shared)"
+            )
+            return shared
+
+    def top_k(self, compiled: CompiledJobs, query: ScoringQuery, k: int,
+              threshold: float = 0.3) -> List[Tuple[int, float]]:
+        """Positions and scores of the k best jobs, like rank_top_k over every job"""
+        shared = self.publish(compiled)
+        try:
+            futures = [
+                self._executor.submit(_score_shard, shared.manifest, index, query, k, threshold)
+                for index in range(len(shared.manifest["shards"]))
+            ]
+            return merge_top_k([item for future in futures for item in future.result()], k)
+
+        except BrokenProcessPool:
+            logger.error("Match scoring worker died, restarting pool")
+            self.shutdown()
+            raise Exception("Job matching failed: scoring worker process crashed")
+
+    def worker_memory(self) -> List[Dict[str, Any]]:
+        """Memory use reported by the workers (one sample per worker slot)"""
+        if self._executor is None:
+            return []
+        return [future.result() for future in [self._executor.submit(_worker_memory) for _ in range(self.workers)]]
+
+    def shutdown(self):
+        """Stop the workers and unlink the shared blocks"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+                logger.info("Match scoring pool stopped")
+            for shared in self._published:
+                shared.close()
+            self._published = []
@@ -0,0 +1,311 @@
+import json
+import base64
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import AnalysisResult, Job, JobMatch, JobMatchSet
+from schemas import JobMatchResponse
+from services.job_index import IndexedJob, ResumeProfile
+from services.job_salaries import salary_conditions, salary_score
+
+logger = logging.getLogger(__name__)
+
+MATCH_THRESHOLD = 0.3  # same cutoff as JobMatcher.find_matches
+
+
+def encode_cursor(score: float, job_id: int) -> str:
+    """Opaque keyset cursor for the row after which the next page starts"""
+    return base64.urlsafe_b64encode(json.dumps([score, job_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(job_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class MatchStore:
+    """Materialized job matches per resume in the job_matches table.
+
+    A resume's best matches (up to max_per_resume above the match threshold)
+    are computed once after analysis and served with keyset pagination on
+    (score desc, job id). A JobMatchSet row records what they were computed
+    from:
+    - a newer analysis or TF-IDF model version triggers a full recompute
+      when the matches are next read;
+    - jobs added, edited or deactivated since the set's jobs watermark are
+      rescored row by row by sync_jobs, leaving all other rows untouched.
+    """
+
+    def __init__(self, matcher, max_per_resume: Optional[int] = None):
+        self.matcher = matcher
+        self.max_per_resume = max_per_resume or settings.job_match_max_per_resume
+        self._locks: Dict[int, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, resume_id: int) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(resume_id, threading.Lock())
+
+    def _scoring_version(self) -> Optional[str]:
+        artifact = self.matcher.tfidf_model.artifact
+        return artifact.version if artifact is not None else None
+
+    def is_current(self, match_set: Optional[JobMatchSet], analysis: AnalysisResult) -> bool:
+        return (
+            match_set is not None and
+            not match_set.stale and
+            match_set.analysis_id == analysis.id and
+            match_set.scoring_version == self._scoring_version()
+        )
+
+    def ensure_current(self, db: Session, resume_id: int, analysis: AnalysisResult) -> JobMatchSet:
+        """Materialize a resume's matches unless they are already up to date"""
+        match_set = db.query(JobMatchSet).filter(JobMatchSet.resume_id == resume_id).first()
+        if self.is_current(match_set, analysis):
+            return match_set
+        with self._lock_for(resume_id):
+            # Another thread may have materialized while we waited
+            db.expire_all()
+            match_set = db.query(JobMatchSet).filter(JobMatchSet.resume_id == resume_id).first()
+            if self.is_current(match_set, analysis):
+                return match_set
+            return self._materialize(db, resume_id, analysis)
+
+    def materialize(self, db: Session, resume_id: int, analysis: AnalysisResult) -> JobMatchSet:
+        """Recompute and store every match of a resume"""
+        with self._lock_for(resume_id):
+            return self._materialize(db, resume_id, analysis)
+
+    def _materialize(self, db: Session, resume_id: int, analysis: AnalysisResult) -> JobMatchSet:
+        try:
+            # Watermark before scoring, so changes made meanwhile are synced later
+            watermark = self.matcher.job_index.watermark
+            profile = ResumeProfile.from_analysis(analysis)
+            jobs, top = self.matcher.match_engine.search(profile, self.max_per_resume, threshold=MATCH_THRESHOLD)
+            scored = {jobs[position].id: (jobs[position], score) for position, score in top}
+
+            existing = {
+                row.job_id: row
+                for row in db.query(JobMatch).filter(JobMatch.resume_id == resume_id).all()
+            }
+            for job_id, row in existing.items():
+                if job_id not in scored:
+                    db.delete(row)
+            for job_id, (job, score) in scored.items():
+                self._store_row(db, existing.get(job_id), resume_id, profile, job, score)
+
+            match_set = db.query(JobMatchSet).filter(JobMatchSet.resume_id == resume_id).first()
+            if match_set is None:
+                match_set = JobMatchSet(resume_id=resume_id)
+                db.add(match_set)
+            match_set.analysis_id = analysis.id
+            match_set.scoring_version = self._scoring_version()
+            match_set.jobs_watermark = watermark
+            match_set.truncated = len(top) >= self.max_per_resume
+            match_set.min_score = round(top[-1][1], 2) if match_set.truncated else None
+            match_set.stale = False
+            match_set.computed_at = datetime.utcnow()
+            db.commit()
+
+            logger.info(f"Materialized {len(scored)} job matches for resume {resume_id}")
+            return match_set
+
+        except IntegrityError:
+            # Another process stored the same rows first; theirs are as recent
+            db.rollback()
+            logger.info(f"Job matches for resume {resume_id} were materialized concurrently")
+            return db.query(JobMatchSet).filter(JobMatchSet.resume_id == resume_id).first()
+
+        except Exception as e:
+            logger.error(f"Error materializing job matches: {str(e)}")
+            db.rollback()
+            raise Exception(f"Job match materialization failed: {str(e)}")
+
+    def _store_row(self, db: Session, row: Optional[JobMatch], resume_id: int,
+                   profile: ResumeProfile, job: IndexedJob, score: float):
+        """Insert or update one match row; view/apply flags are kept"""
+        if row is None:
+            row = JobMatch(resume_id=resume_id, job_id=job.id)
+            db.add(row)
+        row.overall_match_score = round(score, 2)  # ranked like find_matches
+        row.skills_match_score = self.matcher._calculate_skills_match(profile.skills_lower, job.required_lower)
+        row.experience_match_score = self.matcher._calculate_experience_match(
+            profile.experience_years, job.experience_range
+        )
+        row.location_match_score = self.matcher._calculate_location_match(profile, job)
+        row.match_reasons = json.dumps(self.matcher._get_match_reasons(profile, job, score))
+        row.missing_skills = json.dumps(self.matcher._get_missing_skills(profile, job))
+        row.extra_skills = json.dumps(self.matcher._get_extra_skills(profile, job))
+        row.match_date = datetime.utcnow()
+
+    def page(self, db: Session, resume_id: int, analysis: AnalysisResult, limit: int = 10,
+             cursor: Optional[str] = None, skills: Optional[List[str]] = None,
+             salary_min: Optional[float] = None,
+             salary_currency: Optional[str] = None) -> Tuple[List[JobMatchResponse], Optional[str]]:
+        """One page of a resume's matches, best first, and the cursor of the next page;
+        `skills` keeps jobs listing all of them (required or preferred), and
+        `salary_min` jobs paying at least that a year, scored by salary_score"""
+        after = decode_cursor(cursor) if cursor else None
+        skill_filter = self.matcher.skill_catalog.job_filter(db, skills) if skills else None
+        salary_filter = salary_conditions(salary_min, None, salary_currency)
+
+        self.ensure_current(db, resume_id, analysis)
+        self.matcher.job_index.ensure_fresh()
+        matches: List[JobMatchResponse] = []
+        batch_size = limit + 1
+        while True:
+            query = db.query(JobMatch).filter(JobMatch.resume_id == resume_id)
+            if skill_filter is not None:
+                query = query.filter(JobMatch.job_id.in_(skill_filter))
+            if salary_filter:
+                query = query.filter(JobMatch.job_id.in_(select(Job.id).where(*salary_filter)))
+            if after is not None:
+                score, job_id = after
+                query = query.filter(or_(
+                    JobMatch.overall_match_score < score,
+                    and_(JobMatch.overall_match_score == score, JobMatch.job_id > job_id)
+                ))
+            rows = query.order_by(JobMatch.overall_match_score.desc(), JobMatch.job_id).limit(batch_size).all()
+
+            for row in rows:
+                # Jobs deactivated since the last sync are skipped
+                job = self.matcher.job_index.get(row.job_id)
+                if job is None:
+                    after = (row.overall_match_score, row.job_id)
+                    continue
+                if len(matches) == limit:
+                    # An active match exists past this page
+                    return matches, encode_cursor(*after)
+                matches.append(self._to_response(row, job, salary_min))
+                after = (row.overall_match_score, row.job_id)
+
+            if len(rows) < batch_size:
+                return matches, None
+
+    def _to_response(self, row: JobMatch, job: IndexedJob, salary_min: Optional[float] = None) -> JobMatchResponse:
+        response = self.matcher._build_match(None, job, row.overall_match_score, json.loads(row.match_reasons or "[]"))
+        response.salary_match_score = salary_score(job.salary, salary_min)
+        response.missing_skills = json.loads(row.missing_skills or "[]")
+        response.extra_skills = json.loads(row.extra_skills or "[]")
+        return response
+
+    def sync_jobs(self, db: Session, batch_size: int = 500) -> Dict[str, int]:
+        """Rescore only the rows of jobs added, edited or deactivated since each
+        set's watermark; sets marked stale are recomputed in full"""
+        try:
+            counts = {"sets": 0, "jobs": 0, "upserted": 0, "removed": 0, "recomputed": 0}
+
+            for match_set in db.query(JobMatchSet).filter(JobMatchSet.stale == True).limit(batch_size).all():
+                analysis = db.query(AnalysisResult).filter(
+                    AnalysisResult.resume_id == match_set.resume_id
+                ).order_by(AnalysisResult.analysis_date.desc()).first()
+                if analysis is not None:
+                    self.ensure_current(db, match_set.resume_id, analysis)
+                    counts["recomputed"] += 1
+
+            # Jobs are taken from the index so rows agree with what search sees
+            self.matcher.job_index.ensure_fresh()
+            watermark = self.matcher.job_index.watermark
+            if watermark is None:
+                return counts
+
+            sets = db.query(JobMatchSet).filter(
+                JobMatchSet.stale == False,
+                or_(JobMatchSet.jobs_watermark < watermark, JobMatchSet.jobs_watermark.is_(None))
+            ).all()
+            if not sets:
+                return counts
+
+            oldest = min((match_set.jobs_watermark for match_set in sets if match_set.jobs_watermark), default=None)
+            query = db.query(Job.id, Job.updated_at).filter(Job.updated_at <= watermark)
+            if oldest is not None and all(match_set.jobs_watermark for match_set in sets):
+                # >= so jobs sharing a watermark timestamp are not missed
+                query = query.filter(Job.updated_at >= oldest)
+            changed = sorted(query.all(), key=lambda item: item[1])
+            changed_times = [updated_at for _, updated_at in changed]
+            counts["jobs"] = len(changed)
+
+            for match_set in sets:
+                start = bisect.bisect_left(changed_times, match_set.jobs_watermark) if match_set.jobs_watermark else 0
+                job_ids = [job_id for job_id, _ in changed[start:]]
+                if job_ids:
+                    upserted, removed = self._sync_set(db, match_set, job_ids)
+                    counts["upserted"] += upserted
+                    counts["removed"] += removed
+                match_set.jobs_watermark = watermark
+                counts["sets"] += 1
+                if counts["sets"] % batch_size == 0:
+                    db.commit()
+
+            db.commit()
+            if counts["upserted"] or counts["removed"]:
+                logger.info(f"Job match sync: {counts}")
+            return counts
+
+        except Exception as e:
+            logger.error(f"Error syncing job matches: {str(e)}")
+            db.rollback()
+            raise Exception(f"Job match sync failed: {str(e)}")
+
+    def _sync_set(self, db: Session, match_set: JobMatchSet, job_ids: List[int]) -> Tuple[int, int]:
+        """Rescore the given jobs for one resume and upsert or delete their rows"""
+        analysis = db.query(AnalysisResult).filter(AnalysisResult.id == match_set.analysis_id).first()
+        if analysis is None:
+            match_set.stale = True
+            return 0, 0
+
+        profile = ResumeProfile.from_analysis(analysis)
+        rows = {
+            row.job_id: row
+            for row in db.query(JobMatch).filter(
+                JobMatch.resume_id == match_set.resume_id, JobMatch.job_id.in_(job_ids)
+            ).all()
+        }
+
+        upserted = removed = 0
+        for job_id in job_ids:
+            job = self.matcher.job_index.get(job_id)  # None once deactivated
+            score = self.matcher._calculate_match_score(profile, job) if job is not None else 0.0
+            # A truncated set only keeps scores that could rank among its rows
+            keep = score > MATCH_THRESHOLD and (
+                not match_set.truncated or round(score, 2) >= match_set.min_score
+            )
+            row = rows.get(job_id)
+            if keep:
+                self._store_row(db, row, match_set.resume_id, profile, job, score)
+                upserted += 1
+            elif row is not None:
+                db.delete(row)
+                removed += 1
+                if match_set.truncated:
+                    # A job below the kept rows may now belong in them
+                    match_set.stale = True
+
+        if match_set.truncated and upserted:
+            db.flush()
+            self._trim(db, match_set)
+        return upserted, removed
+
+    def _trim(self, db: Session, match_set: JobMatchSet):
+        """Drop the lowest rows beyond max_per_resume"""
+        overflow = db.query(JobMatch).filter(JobMatch.resume_id == match_set.resume_id).order_by(
+            JobMatch.overall_match_score.desc(), JobMatch.job_id
+        ).offset(self.max_per_resume).all()
+        for row in overflow:
+            db.delete(row)
+        lowest = db.query(JobMatch.overall_match_score).filter(
+            JobMatch.resume_id == match_set.resume_id
+        ).order_by(JobMatch.overall_match_score.desc(), JobMatch.job_id).offset(self.max_per_resume - 1).first()
+        if overflow and lowest is not None:
+            match_set.min_score = lowest[0]
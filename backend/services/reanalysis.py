@@ -0,0 +1,195 @@
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models import AnalysisResult, BackfillCheckpoint, Resume
+from schemas import ResumeAnalysisResponse
+from services.resume_analyzer import MODEL_VERSION
+from utils.streaming import bounded_map
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+COMPLETED = "completed"
+
+
+class ReanalysisBackfill:
+    """Re-analyzes resumes whose latest analyses predate the current model version.
+
+    Resumes are visited in id order in chunks. Each chunk's new AnalysisResult
+    rows and the checkpoint (last resume id, counters) commit together, so a
+    crashed run resumes after the last committed chunk. Throughput is capped at
+    max_rate resumes per second to leave capacity for online requests.
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[str, Session], Awaitable[ResumeAnalysisResponse]],
+        build_record: Callable[[int, ResumeAnalysisResponse], AnalysisResult],
+        model_version: str = MODEL_VERSION,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_rate: Optional[float] = None
+    ):
+        self.analyze = analyze
+        self.build_record = build_record
+        self.model_version = model_version
+        self.chunk_size = chunk_size or settings.backfill_chunk_size
+        self.concurrency = concurrency or settings.backfill_concurrency
+        self.max_rate = settings.backfill_max_rate if max_rate is None else max_rate
+
+    def _pending_query(self, db: Session, after_id: int, columns=(Resume.id,)):
+        """Resumes with an analysis from another model version and none from this one"""
+        stale = exists().where(
+            AnalysisResult.resume_id == Resume.id,
+            or_(AnalysisResult.model_version != self.model_version, AnalysisResult.model_version.is_(None))
+        )
+        current = exists().where(
+            AnalysisResult.resume_id == Resume.id,
+            AnalysisResult.model_version == self.model_version
+        )
+        return db.query(*columns).filter(Resume.id > after_id, stale, ~current)
+
+    def _load_checkpoint(self, db: Session, restart: bool) -> BackfillCheckpoint:
+        checkpoint = db.query(BackfillCheckpoint).filter(
+            BackfillCheckpoint.model_version == self.model_version
+        ).first()
+
+        if checkpoint is None:
+            checkpoint = BackfillCheckpoint(model_version=self.model_version)
+            db.add(checkpoint)
+        elif restart:
+            checkpoint.last_resume_id = 0
+            checkpoint.processed = 0
+            checkpoint.failed = 0
+            checkpoint.status = RUNNING
+            checkpoint.started_at = datetime.utcnow()
+            checkpoint.completed_at = None
+
+        db.commit()
+        return checkpoint
+
+    def status(self) -> Dict[str, Any]:
+        """Progress of the backfill for the current model version"""
+        db = SessionLocal()
+        try:
+            checkpoint = db.query(BackfillCheckpoint).filter(
+                BackfillCheckpoint.model_version == self.model_version
+            ).first()
+            after_id = checkpoint.last_resume_id if checkpoint else 0
+            remaining = self._pending_query(db, after_id).count()
+
+            if checkpoint is None:
+                return {"model_version": self.model_version, "status": "not_started", "remaining": remaining}
+            return self._progress(checkpoint, remaining)
+        finally:
+            db.close()
+
+    def _progress(self, checkpoint: BackfillCheckpoint, remaining: int,
+                  run_items: int = 0, run_seconds: float = 0.0) -> Dict[str, Any]:
+        rate = run_items / run_seconds if run_seconds > 0 else None
+        return {
+            "model_version": self.model_version,
+            "status": checkpoint.status,
+            "processed": checkpoint.processed,
+            "failed": checkpoint.failed,
+            "remaining": remaining,
+            "last_resume_id": checkpoint.last_resume_id,
+            "rate_per_second": round(rate, 2) if rate else None,
+            "eta_seconds": round(remaining / rate, 1) if rate else None,
+            "started_at": checkpoint.started_at.isoformat() if checkpoint.started_at else None,
+            "updated_at": checkpoint.updated_at.isoformat() if checkpoint.updated_at else None,
+            "completed_at": checkpoint.completed_at.isoformat() if checkpoint.completed_at else None
+        }
+
+    async def run(self, max_duration: Optional[float] = None, restart: bool = False) -> Dict[str, Any]:
+        """Process chunks until done or until max_duration seconds have passed"""
+        db = SessionLocal()
+        try:
+            checkpoint = self._load_checkpoint(db, restart)
+            remaining = self._pending_query(db, checkpoint.last_resume_id).count()
+            if remaining == 0:
+                checkpoint.status = COMPLETED
+                checkpoint.completed_at = checkpoint.completed_at or datetime.utcnow()
+                db.commit()
+                return self._progress(checkpoint, 0)
+
+            checkpoint.status = RUNNING
+            db.commit()
+            logger.info(f"Backfill to model {self.model_version}: {remaining} resumes pending")
+
+            run_started = time.monotonic()
+            run_items = 0
+            while True:
+                rows: List[Tuple[int, str]] = self._pending_query(
+                    db, checkpoint.last_resume_id, (Resume.id, Resume.content)
+                ).order_by(Resume.id).limit(self.chunk_size).all()
+
+                if not rows:
+                    checkpoint.status = COMPLETED
+                    checkpoint.completed_at = datetime.utcnow()
+                    db.commit()
+                    break
+
+                succeeded, failed = await self._process_chunk(db, rows)
+
+                # Results and checkpoint commit together
+                checkpoint.last_resume_id = rows[-1][0]
+                checkpoint.processed += succeeded
+                checkpoint.failed += failed
+                db.commit()
+
+                run_items += len(rows)
+                remaining = max(remaining - len(rows), 0)
+                elapsed = time.monotonic() - run_started
+                progress = self._progress(checkpoint, remaining, run_items, elapsed)
+                logger.info(
+                    f"Backfill {self.model_version}: {checkpoint.processed} done, {checkpoint.failed} failed, "
+                    f"{remaining} remaining, {progress['rate_per_second']}/s, ETA {progress['eta_seconds']}s"
+                )
+
+                if max_duration is not None and elapsed >= max_duration:
+                    break
+
+                # Throttle: sleep until the average rate is back under max_rate
+                if self.max_rate:
+                    delay = run_items / self.max_rate - elapsed
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+            remaining = 0 if checkpoint.status == COMPLETED else remaining
+            return self._progress(checkpoint, remaining, run_items, time.monotonic() - run_started)
+
+        except Exception as e:
+            logger.error(f"Backfill error: {str(e)}")
+            db.rollback()
+            raise Exception(f"Reanalysis backfill failed: {str(e)}")
+
+        finally:
+            db.close()
+
+    async def _process_chunk(self, db: Session, rows: List[Tuple[int, str]]) -> Tuple[int, int]:
+        """Analyze a chunk with bounded concurrency and stage its results"""
+        async def analyze_row(row: Tuple[int, str]) -> ResumeAnalysisResponse:
+            return await self.analyze(row[1], db)
+
+        succeeded = 0
+        failed = 0
+        records = []
+        async for (resume_id, _), analysis_result, error in bounded_map(analyze_row, rows, self.concurrency):
+            if error is not None:
+                failed += 1
+                logger.warning(f"Backfill could not analyze resume {resume_id}: {str(error)}")
+                continue
+            succeeded += 1
+            records.append(self.build_record(resume_id, analysis_result))
+
+        db.add_all(records)
+        return succeeded, failed
@@ -1,50 +1,72 @@
-import spacy
 import re
 import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
 
+from config import settings
 from schemas import ResumeAnalysisResponse, SkillAnalysis, EducationInfo, ExperienceInfo
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+from services.skill_matcher import SkillMatcher
+from services.resume_parser import ResumeSegmenter, ResumeDocument
+from utils.safe_regex import SafePattern, ExtractionBudget
 
 logger = logging.getLogger(__name__)
 
+# Version of the extraction and scoring logic. Bump it whenever skill lists,
+# patterns or scoring change so stored analyses can be recognised as stale.
+MODEL_VERSION = "1.1"
+
+# NLTK resources used by the analyzer (name -> data path)
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet'
+}
+
+def ensure_nltk_resources(download: Optional[bool] = None) -> Dict[str, bool]:
+    """Check required NLTK data, downloading missing resources only if allowed"""
+    import nltk
+    
+    if download is None:
+        download = settings.nltk_auto_download
+    
+    available = {}
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+            available[name] = True
+        except LookupError:
+            available[name] = bool(download) and bool(nltk.download(name, quiet=True))
+            if not available[name]:
+                logger.warning(f"NLTK resource '{name}' is not available")
+    
+    return available
+
+def clean_resume_text(text: str) -> str:
+    """Clean and normalize resume text (the analyzer's view of the content)"""
+    # Normalize bullet glyphs at line start so entries keep their structure
+    text = re.sub(r'(?m)^[ \t]*[•▪◦●·\*]', '-', text)
+    
+    # Remove special characters but keep alphanumeric and basic punctuation
+    text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)@]', ' ', text)
+    
+    # Collapse whitespace but keep line breaks, which delimit sections and
+    # entries, and keep at most one blank line between blocks
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r' ?\n ?', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = text.strip()
+    
+    return text.lower()
+
 class ResumeAnalyzer:
     def __init__(self):
         """Initialize the resume analyzer with NLP models and skill databases"""
-        try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("spaCy model not found. Please install: python -m spacy download en_core_web_sm")
-            self.nlp = None
-        
-        # Initialize NLTK components
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        # NLP models are loaded lazily on first use or by warm_up()
+        self._nlp = None
+        self._nlp_loaded = False
+        self._lemmatizer = None
+        self._stop_words = None
         
         # Skill databases
         self.technical_skills = self._load_technical_skills()
@@ -52,6 +74,16 @@ class ResumeAnalyzer:
         self.programming_languages = self._load_programming_languages()
         self.frameworks = self._load_frameworks()
         self.tools = self._load_tools()
+        self.skill_aliases = self._load_skill_aliases()
+        
+        # Compiled matcher over all extractable skills and their aliases
+        self.skill_matcher = self._build_skill_matcher()
+        
+        # Splits a resume into sections and entries once per analysis
+        self.segmenter = ResumeSegmenter()
+        
+        # Extraction patterns, compiled once with bounded worst-case cost
+        self.patterns = self._compile_patterns()
         
         # Education keywords
         self.education_keywords = {
@@ -77,6 +109,49 @@ class ResumeAnalyzer:
             'manufacturing': ['manufacturing', 'production', 'engineering', 'industrial']
         }
 
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access (None if unavailable)"""
+        if not self._nlp_loaded:
+            try:
+                import spacy
+                self._nlp = spacy.load(settings.spacy_model)
+            except (ImportError, OSError):
+                logger.warning(f"spaCy model not found. Please install: python -m spacy download {settings.spacy_model}")
+                self._nlp = None
+            self._nlp_loaded = True
+        return self._nlp
+
+    @property
+    def lemmatizer(self):
+        """NLTK WordNet lemmatizer, created on first access"""
+        if self._lemmatizer is None:
+            from nltk.stem import WordNetLemmatizer
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @property
+    def stop_words(self) -> set:
+        """English stop words, empty if the NLTK corpus is unavailable"""
+        if self._stop_words is None:
+            if ensure_nltk_resources().get('stopwords'):
+                from nltk.corpus import stopwords
+                self._stop_words = set(stopwords.words('english'))
+            else:
+                self._stop_words = set()
+        return self._stop_words
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether NLP models and resources have been loaded"""
+        return self._nlp_loaded and self._stop_words is not None
+
+    def warm_up(self):
+        """Load NLP models and resources ahead of the first analysis"""
+        self.nlp
+        self.stop_words
+        self.lemmatizer
+
     def _load_technical_skills(self) -> List[str]:
         """Load technical skills database"""
         return [
@@ -130,22 +205,141 @@ class ResumeAnalyzer:
             'linux', 'ubuntu', 'centos', 'windows', 'macos', 'bash', 'powershell'
         ]
 
+    def _load_skill_aliases(self) -> Dict[str, str]:
+        """Load skill aliases and synonyms (alias -> canonical skill)"""
+        return {
+            'k8s': 'kubernetes',
+            'js': 'javascript',
+            'ts': 'typescript',
+            'reactjs': 'react',
+            'react.js': 'react',
+            'angularjs': 'angular',
+            'vuejs': 'vue',
+            'vue.js': 'vue',
+            'nodejs': 'node.js',
+            'expressjs': 'express',
+            'postgres': 'postgresql',
+            'mongo': 'mongodb',
+            'elastic search': 'elasticsearch',
+            'amazon web services': 'aws',
+            'microsoft azure': 'azure',
+            'google cloud': 'gcp',
+            'google cloud platform': 'gcp',
+            'cicd': 'ci/cd',
+            'continuous integration': 'ci/cd',
+            'ml': 'machine learning',
+            'artificial intelligence': 'ai',
+            'sklearn': 'scikit-learn',
+            'scikit learn': 'scikit-learn',
+            'powerbi': 'power bi',
+            'restful api': 'rest api',
+            'rest apis': 'rest api',
+            'micro services': 'microservices',
+            'problem-solving': 'problem solving',
+            'team work': 'teamwork',
+            'detail-oriented': 'detail oriented',
+            'self-motivated': 'self motivated',
+            'time-management': 'time management'
+        }
+
+    def _build_skill_matcher(self) -> SkillMatcher:
+        """Compile technical and soft skills with their aliases into one matcher"""
+        matcher = SkillMatcher(normalizer=self._clean_text)
+        
+        for skill in self.technical_skills:
+            matcher.add_skill(skill, "Technical")
+        for skill in self.soft_skills:
+            matcher.add_skill(skill, "Soft Skills")
+        for alias, skill in self.skill_aliases.items():
+            matcher.add_alias(alias, skill)
+        
+        matcher.compile()
+        return matcher
+
+    def _compile_patterns(self) -> Dict[str, Any]:
+        """Compile the extraction patterns"""
+        degree = r'bachelor|master|phd|doctorate|associate|diploma|certificate'
+        segment = SafePattern.SEGMENT_START
+        number = SafePattern.NUMBER_START
+        
+        # name -> list of (pattern, guard)
+        patterns = {
+            'experience_years': [
+                (r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)', number),
+                (r'(\d+)\s*-\s*(\d+)\s*years?\s*(?:of\s*)?(?:experience|exp)', number),
+                (r'(\d+)\s*years?\s*(?:of\s*)?(?:experience|exp)', number)
+            ],
+            'date_range': [
+                (r'(\d{4})\s*-\s*(\d{4})', ''),
+                (r'(\d{4})\s*-\s*(present)', ''),
+                (r'(\d{4})\s*-\s*(current)', '')
+            ],
+            'duration': (r'(\d{4})\s*-\s*(\d{4}|present|current)', ''),
+            'degree': (rf'({degree})\s*(?:of|in)?\s*([^,\n]+)', ''),
+            'institution': [
+                (rf'([^,\n]*{keyword}[^,\n]*)', segment)
+                for keyword in ['university', 'college', 'institute', 'school']
+            ],
+            'year': (r'\b((?:19|20)\d{2})\b', ''),
+            'job_entry': (
+                r'(senior|junior|lead|principal|staff)?\s*([^,\n]+)\s*(?:\b(?:at|in)\b|@)\s*([^,\n]+)',
+                segment
+            ),
+            'job_titles': [
+                (r'(senior|junior|lead|principal|staff)?\s*([^,\n]+)\s*(?:developer|engineer|manager|analyst|specialist|consultant)', segment),
+                (r'(software|data|web|frontend|backend|full.?stack|devops|cloud|security)\s*([^,\n]+)', '')
+            ],
+            'companies': [
+                (r'(?:at|@|in)\s*([A-Z][a-zA-Z\s&]+(?:Inc|LLC|Corp|Ltd|Company|Technologies|Solutions|Systems)?)', ''),
+                (r'([A-Z][a-zA-Z\s&]+(?:Inc|LLC|Corp|Ltd|Company|Technologies|Solutions|Systems))', '')
+            ]
+        }
+        
+        # Company patterns are case sensitive, everything else is not
+        compiled = {}
+        for name, value in patterns.items():
+            flags = 0 if name == 'companies' else re.IGNORECASE
+            if isinstance(value, list):
+                compiled[name] = [
+                    SafePattern(pattern, flags, name=f"{name}[{index}]", guard=guard)
+                    for index, (pattern, guard) in enumerate(value)
+                ]
+            else:
+                pattern, guard = value
+                compiled[name] = SafePattern(pattern, flags, name=name, guard=guard)
+        
+        return compiled
+
     async def analyze_resume(self, resume_content: str) -> ResumeAnalysisResponse:
         """Main method to analyze a resume"""
+        return self.analyze(resume_content)
+
+    def analyze(self, resume_content: str) -> ResumeAnalysisResponse:
+        """Analyze a resume synchronously (used by worker processes and threads)"""
         start_time = datetime.now()
+        budget = ExtractionBudget()
         
         try:
             # Clean and preprocess the resume content
             cleaned_content = self._clean_text(resume_content)
             
-            # Extract different components
-            skills = self._extract_skills(cleaned_content)
-            experience_years = self._extract_experience_years(cleaned_content)
-            education = self._extract_education(cleaned_content)
-            experience = self._extract_experience(cleaned_content)
-            industry = self._identify_industry(cleaned_content)
-            job_titles = self._extract_job_titles(cleaned_content)
-            companies = self._extract_companies(cleaned_content)
+            # Extract different components. Patterns share one time budget and
+            # return partial results once it is spent.
+            with budget.activate():
+                document = self.segmenter.parse(cleaned_content)
+                skills = self._extract_skills(cleaned_content)
+                experience_years = self._extract_experience_years(cleaned_content)
+                education = self._extract_education(document)
+                experience = self._extract_experience(document)
+                industry = self._identify_industry(cleaned_content)
+                job_titles = self._extract_job_titles(cleaned_content)
+                companies = self._extract_companies(cleaned_content)
+            
+            if budget.degraded:
+                logger.warning(
+                    f"Extraction budget of {budget.seconds}s exhausted, partial results for: "
+                    f"{', '.join(budget.degraded_patterns)}"
+                )
             
             # Calculate scores
             skills_score = self._calculate_skills_score(skills)
@@ -186,53 +380,26 @@ class ResumeAnalyzer:
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # Remove special characters but keep alphanumeric and basic punctuation
-        text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)]', ' ', text)
-        
-        return text.lower()
+        return clean_resume_text(text)
 
     def _extract_skills(self, text: str) -> List[SkillAnalysis]:
         """Extract skills from resume text"""
-        skills = []
-        text_lower = text.lower()
-        
-        # Extract technical skills
-        for skill in self.technical_skills:
-            if skill.lower() in text_lower:
-                confidence = self._calculate_skill_confidence(skill, text_lower)
-                skills.append(SkillAnalysis(
-                    skill=skill.title(),
-                    confidence=confidence,
-                    category="Technical"
-                ))
-        
-        # Extract soft skills
-        for skill in self.soft_skills:
-            if skill.lower() in text_lower:
-                confidence = self._calculate_skill_confidence(skill, text_lower)
-                skills.append(SkillAnalysis(
-                    skill=skill.title(),
-                    confidence=confidence,
-                    category="Soft Skills"
-                ))
-        
-        # Remove duplicates and sort by confidence
-        unique_skills = {}
-        for skill in skills:
-            if skill.skill not in unique_skills or skill.confidence > unique_skills[skill.skill].confidence:
-                unique_skills[skill.skill] = skill
+        # Single pass over the text finds every skill and its occurrence count
+        skill_counts = self.skill_matcher.find_all(text)
+        
+        skills = [
+            SkillAnalysis(
+                skill=skill.title(),
+                confidence=self._calculate_skill_confidence(count),
+                category=self.skill_matcher.category_of(skill)
+            )
+            for skill, count in skill_counts.items()
+        ]
         
-        return sorted(unique_skills.values(), key=lambda x: x.confidence, reverse=True)
+        return sorted(skills, key=lambda x: x.confidence, reverse=True)
 
-    def _calculate_skill_confidence(self, skill: str, text: str) -> float:
-        """Calculate confidence score for a skill"""
-        # Count occurrences
-        count = text.count(skill.lower())
-        
+    def _calculate_skill_confidence(self, count: int) -> float:
+        """Calculate confidence score for a skill from its occurrence count"""
         # Base confidence on frequency and context
         if count == 0:
             return 0.0
@@ -246,16 +413,10 @@ class ResumeAnalyzer:
     def _extract_experience_years(self, text: str) -> float:
         """Extract years of experience from resume"""
         # Look for patterns like "5 years", "3+ years", "2-4 years"
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)',
-            r'(\d+)\s*-\s*(\d+)\s*years?\s*(?:of\s*)?(?:experience|exp)',
-            r'(\d+)\s*years?\s*(?:of\s*)?(?:experience|exp)'
-        ]
-        
         max_years = 0
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self.patterns['experience_years']:
+            matches = pattern.findall(text)
             for match in matches:
                 if isinstance(match, tuple):
                     # Range pattern
@@ -273,16 +434,10 @@ class ResumeAnalyzer:
     def _estimate_experience_from_jobs(self, text: str) -> float:
         """Estimate experience from job entries"""
         # Look for date patterns in job descriptions
-        date_patterns = [
-            r'(\d{4})\s*-\s*(\d{4})',
-            r'(\d{4})\s*-\s*present',
-            r'(\d{4})\s*-\s*current'
-        ]
-        
         total_months = 0
         
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self.patterns['date_range']:
+            matches = pattern.findall(text)
             for match in matches:
                 if len(match) == 2:
                     if match[1].lower() in ['present', 'current']:
@@ -297,119 +452,108 @@ class ResumeAnalyzer:
         
         return total_months / 12 if total_months > 0 else 0
 
-    def _extract_education(self, text: str) -> List[EducationInfo]:
-        """Extract education information"""
+    def _extract_education(self, document: ResumeDocument) -> List[EducationInfo]:
+        """Extract education information from the education section entries"""
         education = []
         
         # Look for degree patterns
-        degree_patterns = [
-            r'(bachelor|master|phd|doctorate|associate|diploma|certificate)\s*(?:of|in)?\s*([^,\n]+)',
-            r'([^,\n]+)\s*(?:bachelor|master|phd|doctorate|associate|diploma|certificate)'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) == 2:
-                    degree = match[0].strip()
-                    field = match[1].strip()
-                    
-                    # Extract institution
-                    institution = self._extract_institution(text, field)
-                    
-                    education.append(EducationInfo(
-                        degree=degree.title(),
-                        institution=institution,
-                        graduation_year=self._extract_graduation_year(text, field)
-                    ))
+        for entry in document.entries('education'):
+            for _, line in entry.lines():
+                match = self.patterns['degree'].search(line)
+                if not match:
+                    continue
+                
+                degree = match.group(1).strip()
+                field = match.group(2).strip()
+                
+                # Institution and year are looked up within the entry only
+                education.append(EducationInfo(
+                    degree=degree.title(),
+                    institution=self._extract_institution(entry.text, field),
+                    graduation_year=self._extract_graduation_year(entry.text, field)
+                ))
         
         return education
 
     def _extract_institution(self, text: str, field: str) -> str:
-        """Extract institution name"""
+        """Extract institution name from an education entry"""
         # Look for university/college names near the field
-        institution_keywords = ['university', 'college', 'institute', 'school']
-        
-        for keyword in institution_keywords:
-            pattern = rf'([^,\n]*{keyword}[^,\n]*)'
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                return matches[0].strip()
+        for pattern in self.patterns['institution']:
+            match = pattern.search(text)
+            if match:
+                return match.group(1).strip()
         
         return "Unknown Institution"
 
     def _extract_graduation_year(self, text: str, field: str) -> Optional[int]:
-        """Extract graduation year"""
+        """Extract graduation year from an education entry"""
         # Look for years near education information
-        year_pattern = r'\b(19|20)\d{2}\b'
-        matches = re.findall(year_pattern, text)
+        matches = self.patterns['year'].findall(text)
         
         if matches:
             # Return the most recent year
-            return max([int(match) for match in matches])
+            return max(int(match) for match in matches)
         
         return None
 
-    def _extract_experience(self, text: str) -> List[ExperienceInfo]:
-        """Extract work experience"""
+    def _extract_experience(self, document: ResumeDocument) -> List[ExperienceInfo]:
+        """Extract work experience from the experience section entries"""
         experience = []
         
         # Look for job title patterns
-        title_patterns = [
-            r'(senior|junior|lead|principal|staff)?\s*([^,\n]+)\s*(?:at|@|in)\s*([^,\n]+)',
-            r'([^,\n]+)\s*(?:at|@|in)\s*([^,\n]+)'
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) >= 2:
-                    title = match[0].strip() if len(match) == 2 else f"{match[0]} {match[1]}".strip()
-                    company = match[-1].strip()
-                    
-                    experience.append(ExperienceInfo(
-                        title=title.title(),
-                        company=company.title(),
-                        duration=self._extract_duration(text, title, company),
-                        description=self._extract_job_description(text, title, company),
-                        skills_used=self._extract_job_skills(text, title, company)
-                    ))
+        for entry in document.entries('experience'):
+            # A job starts at a title line and runs until the next one, so
+            # entries that hold several jobs are split into local spans
+            jobs = []
+            for offset, line in entry.lines():
+                if line.startswith('-'):
+                    continue  # Bullet points describe a job, they don't start one
+                match = self.patterns['job_entry'].search(line)
+                if match:
+                    jobs.append((offset - entry.start, match))
+            
+            for index, (job_start, match) in enumerate(jobs):
+                job_end = jobs[index + 1][0] if index + 1 < len(jobs) else len(entry.text)
+                job_text = entry.text[job_start:job_end]
+                
+                title = f"{match.group(1) or ''} {match.group(2)}".strip()
+                company = match.group(3).strip()
+                
+                experience.append(ExperienceInfo(
+                    title=title.title(),
+                    company=company.title(),
+                    duration=self._extract_duration(job_text, title, company),
+                    description=self._extract_job_description(job_text, title, company),
+                    skills_used=self._extract_job_skills(job_text, title, company)
+                ))
         
         return experience
 
     def _extract_duration(self, text: str, title: str, company: str) -> str:
-        """Extract job duration"""
-        # Look for date patterns near the job
-        date_patterns = [
-            r'(\d{4})\s*-\s*(\d{4})',
-            r'(\d{4})\s*-\s*present',
-            r'(\d{4})\s*-\s*current'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                match = matches[0]
-                if len(match) == 2:
-                    return f"{match[0]} - {match[1]}"
-                else:
-                    return f"{match[0]} - Present"
+        """Extract job duration from the job's own span"""
+        match = self.patterns['duration'].search(text)
+        if match:
+            end = match.group(2)
+            if end.lower() in ['present', 'current']:
+                return f"{match.group(1)} - Present"
+            return f"{match.group(1)} - {end}"
         
         return "Duration not specified"
 
     def _extract_job_description(self, text: str, title: str, company: str) -> str:
-        """Extract job description"""
-        # This is a simplified version - in a real implementation,
-        # you'd use more sophisticated NLP to extract descriptions
+        """Extract job description from the lines following the title line"""
+        lines = [line.strip(' -') for line in text.split('\n')[1:] if line.strip(' -')]
+        description = ' '.join(line for line in lines if not re.fullmatch(r'[\d\s\-]+(?:present|current)?', line))
+        
+        if description:
+            return description
+        
         return f"Worked as {title} at {company}"
 
     def _extract_job_skills(self, text: str, title: str, company: str) -> List[str]:
         """Extract skills used in specific job"""
-        # Look for skills mentioned near the job title
-        job_skills = []
-        for skill in self.technical_skills + self.soft_skills:
-            if skill.lower() in text.lower():
-                job_skills.append(skill.title())
+        # Only the job's own span is scanned
+        job_skills = [skill.title() for skill in self.skill_matcher.find_all(text)]
         
         return job_skills[:5]  # Limit to top 5 skills
 
@@ -433,13 +577,8 @@ class ResumeAnalyzer:
         titles = []
         
         # Common job title patterns
-        title_patterns = [
-            r'(senior|junior|lead|principal|staff)?\s*([^,\n]+)\s*(?:developer|engineer|manager|analyst|specialist|consultant)',
-            r'(software|data|web|frontend|backend|full.?stack|devops|cloud|security)\s*([^,\n]+)'
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self.patterns['job_titles']:
+            matches = pattern.findall(text)
             for match in matches:
                 if isinstance(match, tuple):
                     title = " ".join(match).strip()
@@ -456,13 +595,8 @@ class ResumeAnalyzer:
         companies = []
         
         # Look for company patterns
-        company_patterns = [
-            r'(?:at|@|in)\s*([A-Z][a-zA-Z\s&]+(?:Inc|LLC|Corp|Ltd|Company|Technologies|Solutions|Systems)?)',
-            r'([A-Z][a-zA-Z\s&]+(?:Inc|LLC|Corp|Ltd|Company|Technologies|Solutions|Systems))'
-        ]
-        
-        for pattern in company_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in self.patterns['companies']:
+            matches = pattern.findall(text)
             for match in matches:
                 company = match.strip()
                 if len(company) > 2 and company not in companies:
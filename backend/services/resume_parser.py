@@ -0,0 +1,214 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Section headings (lower case, without trailing colon) -> canonical section name
+SECTION_HEADINGS = {
+    'summary': 'summary',
+    'professional summary': 'summary',
+    'profile': 'summary',
+    'objective': 'summary',
+    'career objective': 'summary',
+    'about me': 'summary',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'relevant experience': 'experience',
+    'employment': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'career history': 'experience',
+    'education': 'education',
+    'education and training': 'education',
+    'academic background': 'education',
+    'academic qualifications': 'education',
+    'qualifications': 'education',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'key skills': 'skills',
+    'core competencies': 'skills',
+    'competencies': 'skills',
+    'projects': 'projects',
+    'personal projects': 'projects',
+    'certifications': 'certifications',
+    'certificates': 'certifications',
+    'licenses and certifications': 'certifications',
+    'awards': 'awards',
+    'languages': 'languages',
+    'interests': 'interests',
+    'references': 'references'
+}
+
+_DATE_RANGE_PATTERN = re.compile(r'\d{4}\s*-\s*(?:\d{4}|present|current)')
+_BULLET_PREFIXES = ('-', '•', '*', '·')
+
+
+@dataclass
+class ResumeEntry:
+    """A block inside a section (a single job, degree, project, ...)"""
+    start: int
+    end: int
+    text: str
+
+    def lines(self) -> Iterator[Tuple[int, str]]:
+        """Iterate non-empty lines as (absolute offset, line) pairs"""
+        offset = self.start
+        for line in self.text.split('\n'):
+            if line.strip():
+                yield offset, line
+            offset += len(line) + 1
+
+
+@dataclass
+class ResumeSection:
+    """A top level resume section with its character span"""
+    name: str
+    heading: str
+    start: int
+    end: int
+    entries: List[ResumeEntry] = field(default_factory=list)
+
+
+@dataclass
+class ResumeDocument:
+    """Resume text segmented once into sections and entries"""
+    text: str
+    sections: List[ResumeSection] = field(default_factory=list)
+
+    def section_names(self) -> List[str]:
+        return [section.name for section in self.sections]
+
+    def has_section(self, name: str) -> bool:
+        return any(section.name == name for section in self.sections)
+
+    def get_sections(self, name: str) -> List[ResumeSection]:
+        return [section for section in self.sections if section.name == name]
+
+    def entries(self, name: str) -> List[ResumeEntry]:
+        """Get entries of a named section.
+
+        Resumes without an explicit heading for the section fall back to the
+        entries of the unlabelled header, so unstructured resumes are still
+        covered.
+        """
+        sections = self.get_sections(name) or self.get_sections('header')
+
+        return [entry for section in sections for entry in section.entries]
+
+    def text_of(self, name: str) -> str:
+        """Get the concatenated text of a named section"""
+        return '\n'.join(self.text[s.start:s.end] for s in self.get_sections(name))
+
+
+class ResumeSegmenter:
+    """Segments cleaned resume text into sections and entries in one pass"""
+
+    def __init__(self, headings: Optional[Dict[str, str]] = None, max_heading_words: int = 4):
+        self.headings = headings or SECTION_HEADINGS
+        self.max_heading_words = max_heading_words
+
+    def parse(self, text: str) -> ResumeDocument:
+        """Parse text into a ResumeDocument"""
+        document = ResumeDocument(text=text)
+        current = ResumeSection(name='header', heading='', start=0, end=0)
+
+        offset = 0
+        for line in text.split('\n'):
+            line_start = offset
+            offset += len(line) + 1
+
+            heading = self._match_heading(line)
+            if heading is None:
+                continue
+
+            name, heading_text, body_offset = heading
+            current.end = line_start
+            self._close_section(document, current)
+            current = ResumeSection(
+                name=name,
+                heading=heading_text,
+                start=line_start + body_offset,
+                end=len(text)
+            )
+
+        current.end = len(text)
+        self._close_section(document, current)
+        return document
+
+    def _match_heading(self, line: str) -> Optional[Tuple[str, str, int]]:
+        """Return (section name, heading, body offset) if line is a heading"""
+        stripped = line.strip()
+        if not stripped:
+            return None
+
+        # Whole line is a heading ("Work Experience" / "EDUCATION:")
+        candidate = stripped.rstrip(':').strip()
+        if candidate in self.headings and len(candidate.split()) <= self.max_heading_words:
+            return self.headings[candidate], candidate, len(line)
+
+        # Inline heading followed by content ("Skills: python, sql")
+        head, separator, _ = stripped.partition(':')
+        head = head.strip()
+        if separator and head in self.headings:
+            return self.headings[head], head, line.index(':') + 1
+
+        return None
+
+    def _close_section(self, document: ResumeDocument, section: ResumeSection) -> None:
+        """Split a section into entries and append it to the document"""
+        if section.end <= section.start and section.name == 'header':
+            return
+
+        section.entries = list(self._split_entries(document.text, section.start, section.end))
+        if section.name == 'header' and not section.entries:
+            return
+
+        document.sections.append(section)
+
+    def _split_entries(self, text: str, start: int, end: int) -> Iterator[ResumeEntry]:
+        """Split a section span into entries.
+
+        A new entry starts after a blank line, at a plain line following bullet
+        lines, or at a dated line when the current entry already has a date.
+        """
+        entry_start = None
+        entry_end = start
+        has_date = False
+        previous_bullet = False
+
+        offset = start
+        for line in text[start:end].split('\n'):
+            line_start = offset
+            line_end = offset + len(line)
+            offset = line_end + 1
+
+            stripped = line.strip()
+            if not stripped:
+                if entry_start is not None:
+                    yield ResumeEntry(entry_start, entry_end, text[entry_start:entry_end])
+                    entry_start = None
+                previous_bullet = False
+                continue
+
+            is_bullet = stripped.startswith(_BULLET_PREFIXES)
+            is_dated = bool(_DATE_RANGE_PATTERN.search(stripped))
+
+            if entry_start is not None and (
+                (previous_bullet and not is_bullet) or (is_dated and has_date and not is_bullet)
+            ):
+                yield ResumeEntry(entry_start, entry_end, text[entry_start:entry_end])
+                entry_start = None
+
+            if entry_start is None:
+                entry_start = line_start
+                has_date = False
+
+            has_date = has_date or is_dated
+            previous_bullet = is_bullet
+            entry_end = line_end
+
+        if entry_start is not None:
+            yield ResumeEntry(entry_start, entry_end, text[entry_start:entry_end])
@@ -0,0 +1,302 @@
+import os
+import json
+import math
+import time
+import shutil
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+from services.job_index import IndexedJob
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "current.json"
+
+
+def job_document(job: IndexedJob) -> str:
+    """Text a job is embedded from: title, description, skills and requirements"""
+    return "\n".join([
+        job.title or "",
+        job.description or "",
+        " ".join(job.required_skills),
+        " ".join(job.preferred_skills),
+        " ".join(job.requirements)
+    ])
+
+
+def _auto_nlist(n_vectors: int) -> int:
+    # ~4 * sqrt(n) lists, with enough vectors per list to train its centroid
+    return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+@dataclass
+class IVFIndex:
+    """Inverted-file index over L2-normalized dense job vectors.
+
+    Vectors are stored grouped by their nearest centroid (list), so probing a
+    list reads one contiguous slice of the memory-mapped vectors file.
+    """
+    version: str
+    built_at: datetime
+    vectorizer: Any  # TfidfVectorizer
+    svd: Any  # TruncatedSVD
+    centroids: np.ndarray  # nlist x dimensions, normalized
+    list_offsets: np.ndarray  # nlist + 1
+    vectors: np.ndarray  # n x dimensions float32, list order (memory-mapped)
+    job_ids: np.ndarray  # n, list order (memory-mapped)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dimensions(self) -> int:
+        return self.centroids.shape[1]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense, L2-normalized embeddings of texts (TF-IDF projected by the SVD)"""
+        embedded = self.svd.transform(self.vectorizer.transform(texts)).astype(np.float32)
+        return _normalize(embedded)
+
+    def search(self, query: np.ndarray, k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k (job ids, cosine scores) from the nprobe closest lists"""
+        nprobe = min(max(1, nprobe), self.nlist)
+        centroid_scores = self.centroids @ query
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        ids, scores = [], []
+        for list_id in probed:
+            start, end = self.list_offsets[list_id], self.list_offsets[list_id + 1]
+            if end > start:
+                ids.append(self.job_ids[start:end])
+                scores.append(self.vectors[start:end] @ query)
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return self._top(np.concatenate(ids), np.concatenate(scores), k)
+
+    def exact_search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force top-k over every vector (the recall baseline)"""
+        return self._top(np.asarray(self.job_ids), self.vectors @ query, k)
+
+    @staticmethod
+    def _top(ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")
+        return ids[order], scores[order]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at.isoformat(),
+            "jobs": len(self.job_ids),
+            "dimensions": self.dimensions,
+            "nlist": self.nlist
+        }
+
+
+class SemanticIndexStore:
+    """Builds, persists and loads the semantic job index.
+
+    Each version is a directory of .npy files (centroids, list offsets,
+    list-ordered vectors and job ids) plus the fitted TF-IDF and SVD models.
+    Vectors and ids are opened with np.load(mmap_mode="r"), so processes
+    share the page cache instead of each holding a copy. A manifest names the
+    current version; other processes pick up a new build on their next check.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        max_features: Optional[int] = None,
+        keep_versions: Optional[int] = None,
+        reload_interval: Optional[float] = None
+    ):
+        self.directory = directory or settings.semantic_index_directory
+        self.dimensions = dimensions or settings.semantic_dimensions
+        self.nlist = settings.semantic_nlist if nlist is None else nlist  # 0 = sized from the corpus
+        self.nprobe = nprobe or settings.semantic_nprobe
+        self.max_features = max_features or settings.semantic_max_features
+        self.keep_versions = keep_versions or settings.semantic_keep_versions
+        self.reload_interval = settings.semantic_reload_interval if reload_interval is None else reload_interval
+
+        self._index: Optional[IVFIndex] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> Optional[IVFIndex]:
+        """Current index, reloaded when another process published a newer one"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                self._checked_at = now
+                manifest = self._read_manifest()
+                if manifest and (self._index is None or manifest["version"] != self._index.version):
+                    self._load(manifest["version"])
+        return self._index
+
+    def age(self) -> Optional[float]:
+        """Seconds since the current index was built"""
+        index = self.index
+        if index is None:
+            return None
+        return (datetime.utcnow() - index.built_at).total_seconds()
+
+    def build(self, documents: Iterable[Tuple[int, str]]) -> Optional[IVFIndex]:
+        """Fit the embedding models on (job id, text) documents, cluster the
+        vectors into lists, persist the index and make it current"""
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        started = time.monotonic()
+        documents = list(documents)
+        job_ids = np.array([job_id for job_id, _ in documents], dtype=np.int64)
+        texts = [text for _, text in documents]
+
+        vectorizer = TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        try:
+            tfidf = vectorizer.fit_transform(texts)
+
+            # SVD needs fewer components than terms and documents
+            components = max(1, min(self.dimensions, tfidf.shape[1] - 1, len(texts) - 1))
+            svd = TruncatedSVD(n_components=components, random_state=0)
+            vectors = _normalize(svd.fit_transform(tfidf).astype(np.float32))
+
+            nlist = min(self.nlist or _auto_nlist(len(vectors)), len(vectors))
+            kmeans = MiniBatchKMeans(n_clusters=nlist, random_state=0, batch_size=4096, n_init=3)
+            labels = kmeans.fit_predict(vectors)
+            centroids = _normalize(kmeans.cluster_centers_.astype(np.float32))
+        except ValueError as e:
+            # No jobs, or too few terms to project
+            logger.warning(f"Semantic index not built: {str(e)}")
+            return None
+
+        order = np.argsort(labels, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+
+        built_at = datetime.utcnow()
+        version = f"{built_at:%Y%m%d%H%M%S%f}"
+        self._save(version, built_at, vectorizer, svd, centroids, list_offsets, vectors[order], job_ids[order])
+        with self._lock:
+            self._load(version)
+            self._checked_at = time.monotonic()
+        self._prune()
+
+        logger.info(
+            f"Semantic index {version} built on {len(texts)} jobs ({components} dimensions, "
+            f"{nlist} lists) in {time.monotonic() - started:.1f}s"
+        )
+        return self._index
+
+    def search(self, text: str, k: int, nprobe: Optional[int] = None,
+               exact: bool = False) -> List[Tuple[int, float]]:
+        """(job id, cosine) pairs of the jobs closest to text, best first"""
+        index = self.index
+        if index is None or k <= 0:
+            return []
+        query = index.embed([text])[0]
+        if exact:
+            ids, scores = index.exact_search(query, k)
+        else:
+            ids, scores = index.search(query, k, nprobe or self.nprobe)
+        return [(int(job_id), float(score)) for job_id, score in zip(ids, scores)]
+
+    def status(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "directory": self.directory,
+            "built": index is not None,
+            "nprobe": self.nprobe,
+            **(index.describe() if index is not None else {})
+        }
+
+    def _version_path(self, version: str) -> str:
+        return os.path.join(self.directory, f"semantic-{version}")
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read semantic index manifest: {str(e)}")
+            return None
+
+    def _load(self, version: str):
+        import joblib
+
+        path = self._version_path(version)
+        try:
+            models = joblib.load(os.path.join(path, "models.joblib"))
+            self._index = IVFIndex(
+                version=version,
+                built_at=models["built_at"],
+                vectorizer=models["vectorizer"],
+                svd=models["svd"],
+                centroids=np.load(os.path.join(path, "centroids.npy")),
+                list_offsets=np.load(os.path.join(path, "list_offsets.npy")),
+                vectors=np.load(os.path.join(path, "vectors.npy"), mmap_mode="r"),
+                job_ids=np.load(os.path.join(path, "job_ids.npy"), mmap_mode="r")
+            )
+            logger.info(f"Loaded semantic index {version}")
+        except Exception as e:
+            logger.warning(f"Could not load semantic index {version}: {str(e)}")
+
+    def _save(self, version: str, built_at: datetime, vectorizer, svd, centroids: np.ndarray,
+              list_offsets: np.ndarray, vectors: np.ndarray, job_ids: np.ndarray):
+        import joblib
+
+        path = self._version_path(version)
+        staging = f"{path}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        joblib.dump({"built_at": built_at, "vectorizer": vectorizer, "svd": svd}, os.path.join(staging, "models.joblib"))
+        np.save(os.path.join(staging, "centroids.npy"), centroids)
+        np.save(os.path.join(staging, "list_offsets.npy"), list_offsets)
+        np.save(os.path.join(staging, "vectors.npy"), vectors)
+        np.save(os.path.join(staging, "job_ids.npy"), job_ids)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+
+        # Publish only after the version directory is complete
+        manifest_path = os.path.join(self.directory, MANIFEST)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump({"version": version, "built_at": built_at.isoformat(), "jobs": len(job_ids)}, f)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def _prune(self):
+        """Delete all but the newest keep_versions index directories"""
+        try:
+            versions = sorted(
+                name for name in os.listdir(self.directory)
+                if name.startswith("semantic-") and not name.endswith(".tmp")
+            )
+            for name in versions[:-self.keep_versions]:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        except OSError as e:
+            logger.warning(f"Could not prune semantic indexes: {str(e)}")
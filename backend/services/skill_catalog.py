@@ -0,0 +1,302 @@
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select, case, delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, dialect_insert
+from models import AnalysisResult, Job, JobSkill, ResumeSkill, Skill
+
+logger = logging.getLogger(__name__)
+
+DETAILS = "skill_details"  # InstanceState.info key: normalized name -> (confidence, category)
+
+JOB_COLUMNS = ("required_skills", "preferred_skills")
+
+CHUNK = 500  # ids / names per IN (...) list
+
+
+def normalize_skill(name: Any) -> str:
+    """Key a skill is stored under: lowercased, whitespace collapsed"""
+    return " ".join(str(name).split()).lower()[:255]
+
+
+def skill_names(value: Optional[str]) -> Dict[str, str]:
+    """Normalized name -> first spelling, for a JSON list column"""
+    try:
+        names = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return {}
+
+    unique: Dict[str, str] = {}
+    for name in names if isinstance(names, list) else []:
+        key = normalize_skill(name)
+        if key and key not in unique:
+            unique[key] = " ".join(str(name).split())[:255]
+    return unique
+
+
+def set_skill_details(analysis: AnalysisResult, skills) -> None:
+    """Keep the analyzer's confidence and category (SkillAnalysis items) with a
+    new AnalysisResult; they are written to resume_skills when it is flushed"""
+    inspect(analysis).info[DETAILS] = {
+        normalize_skill(skill.skill): (skill.confidence, skill.category) for skill in skills
+    }
+
+
+def _chunks(values: List[Any]) -> Iterable[List[Any]]:
+    for start in range(0, len(values), CHUNK):
+        yield values[start:start + CHUNK]
+
+
+def resolve_skills(connection, names: Dict[str, str]) -> Dict[str, int]:
+    """Skill ids of the given normalized names, inserting the new ones"""
+    table = Skill.__table__
+    keys = list(names)
+    ids: Dict[str, int] = {}
+    for chunk in _chunks(keys):
+        ids.update(connection.execute(
+            select(table.c.normalized_name, table.c.id).where(table.c.normalized_name.in_(chunk))
+        ).all())
+
+    missing = [key for key in keys if key not in ids]
+    if missing:
+        rows = [{"name": names[key], "normalized_name": key} for key in missing]
+        statement = dialect_insert(connection, table)
+        if statement is not None:
+            # Another transaction may insert the same name concurrently
+            connection.execute(statement.on_conflict_do_nothing(index_elements=["normalized_name"]), rows)
+        else:
+            connection.execute(table.insert(), rows)
+        for chunk in _chunks(missing):
+            ids.update(connection.execute(
+                select(table.c.normalized_name, table.c.id).where(table.c.normalized_name.in_(chunk))
+            ).all())
+    return ids
+
+
+def link_jobs(connection, jobs: List[Tuple[int, Optional[str], Optional[str]]]):
+    """Replace the job_skills rows of (job id, required JSON, preferred JSON) jobs"""
+    if not jobs:
+        return
+    skills = {
+        job_id: (skill_names(required), skill_names(preferred))
+        for job_id, required, preferred in jobs
+    }
+    names: Dict[str, str] = {}
+    for required, preferred in skills.values():
+        names.update(preferred)
+        names.update(required)
+    ids = resolve_skills(connection, names)
+
+    rows = []
+    for job_id, (required, preferred) in skills.items():
+        rows.extend({"job_id": job_id, "skill_id": ids[key], "is_required": True} for key in required)
+        rows.extend(
+            {"job_id": job_id, "skill_id": ids[key], "is_required": False}
+            for key in preferred if key not in required
+        )
+
+    for chunk in _chunks(list(skills)):
+        connection.execute(delete(JobSkill).where(JobSkill.job_id.in_(chunk)))
+    if rows:
+        connection.execute(JobSkill.__table__.insert(), rows)
+
+
+def link_resumes(connection, analyses: List[Tuple[int, int, Optional[str], Dict[str, Tuple[float, str]]]]):
+    """Make (resume id, analysis id, skills JSON, details) the skills of their resumes"""
+    if not analyses:
+        return
+    skills = {
+        resume_id: (analysis_id, skill_names(value), details)
+        for resume_id, analysis_id, value, details in analyses
+    }
+    names: Dict[str, str] = {}
+    for _, resume_names, _ in skills.values():
+        names.update(resume_names)
+    ids = resolve_skills(connection, names)
+
+    rows = []
+    for resume_id, (analysis_id, resume_names, details) in skills.items():
+        for key in resume_names:
+            confidence, category = details.get(key, (None, None))
+            rows.append({
+                "resume_id": resume_id, "skill_id": ids[key], "analysis_id": analysis_id,
+                "confidence": confidence, "category": category
+            })
+
+    for chunk in _chunks(list(skills)):
+        connection.execute(delete(ResumeSkill).where(ResumeSkill.resume_id.in_(chunk)))
+    if rows:
+        connection.execute(ResumeSkill.__table__.insert(), rows)
+
+
+def _changed(instance, columns) -> bool:
+    attrs = inspect(instance).attrs
+    return any(attrs[name].history.has_changes() for name in columns)
+
+
+def _before_flush(session: Session, flush_context, instances):
+    """Drop the links of jobs and analyses about to be deleted"""
+    job_ids = [inspect(job).identity[0] for job in session.deleted if isinstance(job, Job)]
+    analysis_ids = [inspect(analysis).identity[0] for analysis in session.deleted if isinstance(analysis, AnalysisResult)]
+    if job_ids:
+        session.connection().execute(delete(JobSkill).where(JobSkill.job_id.in_(job_ids)))
+    if analysis_ids:
+        session.connection().execute(delete(ResumeSkill).where(ResumeSkill.analysis_id.in_(analysis_ids)))
+
+
+def _after_flush(session: Session, flush_context):
+    """Relink jobs whose skill lists changed and resumes given a new latest analysis"""
+    connection = session.connection()
+    jobs = [
+        job for job in list(session.new) + list(session.dirty)
+        if isinstance(job, Job) and job not in session.deleted and (job in session.new or _changed(job, JOB_COLUMNS))
+    ]
+    link_jobs(connection, [(job.id, job.required_skills, job.preferred_skills) for job in jobs])
+
+    analyses: Dict[int, AnalysisResult] = {}
+    for analysis in list(session.new) + list(session.dirty):
+        if isinstance(analysis, AnalysisResult) and (analysis in session.new or _changed(analysis, ("skills",))):
+            analyses[analysis.resume_id] = analysis
+
+    latest = []
+    for resume_id, analysis in analyses.items():
+        latest_id = connection.execute(
+            select(AnalysisResult.id).where(AnalysisResult.resume_id == resume_id).order_by(
+                AnalysisResult.analysis_date.desc(), AnalysisResult.id.desc()
+            ).limit(1)
+        ).scalar()
+        if latest_id == analysis.id:
+            details = inspect(analysis).info.get(DETAILS, {})
+            latest.append((resume_id, analysis.id, analysis.skills, details))
+    link_resumes(connection, latest)
+
+
+class SkillCatalog:
+    """Canonical skills and their job/resume association tables.
+
+    The JSON skill columns stay the source the matchers read; job_skills and
+    resume_skills mirror them by skill id in the same transaction as every
+    ORM job or analysis write, so filtering and aggregating by skill is an
+    indexed SQL join. Bulk SQL updates bypass the session events; migrate()
+    relinks from the JSON columns.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        if not event.contains(session_factory, "before_flush", _before_flush):
+            event.listen(session_factory, "before_flush", _before_flush)
+            event.listen(session_factory, "after_flush", _after_flush)
+
+    def job_filter(self, db: Session, skills: List[str], required_only: bool = False) -> Select:
+        """Select of the ids of jobs listing every one of `skills`"""
+        keys = list(dict.fromkeys(key for key in map(normalize_skill, skills) if key))
+        skill_ids = [skill_id for (skill_id,) in db.query(Skill.id).filter(Skill.normalized_name.in_(keys))]
+
+        statement = select(JobSkill.job_id).where(JobSkill.skill_id.in_(skill_ids))
+        if required_only:
+            statement = statement.where(JobSkill.is_required == True)
+        if len(keys) > 1:
+            # An unknown skill leaves fewer ids than keys, so nothing matches
+            statement = statement.group_by(JobSkill.job_id).having(func.count(JobSkill.skill_id) == len(keys))
+        return statement
+
+    def demand(self, db: Session, limit: int = 20) -> List[Dict[str, Any]]:
+        """Skills most listed by active jobs, with how many resumes have them"""
+        job_counts = db.query(
+            JobSkill.skill_id,
+            func.count(JobSkill.job_id).label("jobs"),
+            func.sum(case((JobSkill.is_required == True, 1), else_=0))
+        ).join(Job, Job.id == JobSkill.job_id).filter(Job.is_active == True).group_by(
+            JobSkill.skill_id
+        ).order_by(func.count(JobSkill.job_id).desc(), JobSkill.skill_id).limit(limit).all()
+
+        skill_ids = [skill_id for skill_id, _, _ in job_counts]
+        names = dict(db.query(Skill.id, Skill.name).filter(Skill.id.in_(skill_ids)).all())
+        resumes = {
+            skill_id: (count, confidence)
+            for skill_id, count, confidence in db.query(
+                ResumeSkill.skill_id, func.count(ResumeSkill.resume_id), func.avg(ResumeSkill.confidence)
+            ).filter(ResumeSkill.skill_id.in_(skill_ids)).group_by(ResumeSkill.skill_id)
+        }
+
+        demand = []
+        for skill_id, jobs, required in job_counts:
+            resume_count, confidence = resumes.get(skill_id, (0, None))
+            demand.append({
+                "skill": names[skill_id],
+                "jobs": int(jobs),
+                "required_jobs": int(required or 0),
+                "preferred_jobs": int(jobs) - int(required or 0),
+                "resumes": int(resume_count),
+                "average_confidence": round(float(confidence), 3) if confidence is not None else None
+            })
+        return demand
+
+    def migrate(self, db: Optional[Session] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """Relink every job, and every resume whose links are not from its latest
+        analysis, from the JSON skill columns"""
+        owns_session = db is None
+        db = db or self.session_factory()
+        try:
+            connection = db.connection()
+            counts = {"jobs": 0, "resumes": 0}
+
+            connection.execute(delete(JobSkill))
+            last_id = 0
+            while True:
+                jobs = connection.execute(
+                    select(Job.id, Job.required_skills, Job.preferred_skills).where(
+                        Job.id > last_id
+                    ).order_by(Job.id).limit(batch_size)
+                ).all()
+                if not jobs:
+                    break
+                link_jobs(connection, [tuple(job) for job in jobs])
+                counts["jobs"] += len(jobs)
+                last_id = jobs[-1][0]
+
+            latest: Dict[int, int] = {}
+            for resume_id, analysis_id in connection.execute(
+                select(AnalysisResult.resume_id, AnalysisResult.id).order_by(
+                    AnalysisResult.resume_id, AnalysisResult.analysis_date, AnalysisResult.id
+                ).execution_options(yield_per=batch_size)
+            ):
+                latest[resume_id] = analysis_id
+            linked = dict(connection.execute(select(ResumeSkill.resume_id, ResumeSkill.analysis_id).distinct()).all())
+            # Links of the latest analysis keep the confidences recorded when it was stored
+            stale = [analysis_id for resume_id, analysis_id in latest.items() if linked.get(resume_id) != analysis_id]
+
+            for start in range(0, len(stale), batch_size):
+                analyses = connection.execute(
+                    select(AnalysisResult.resume_id, AnalysisResult.id, AnalysisResult.skills).where(
+                        AnalysisResult.id.in_(stale[start:start + batch_size])
+                    )
+                ).all()
+                link_resumes(connection, [(resume_id, analysis_id, skills, {}) for resume_id, analysis_id, skills in analyses])
+                counts["resumes"] += len(analyses)
+
+            db.commit()
+            logger.info(f"Skill links migrated for {counts['jobs']} jobs and {counts['resumes']} resumes")
+            return counts
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error migrating skill links: {str(e)}")
+            raise Exception(f"Skill migration failed: {str(e)}")
+        finally:
+            if owns_session:
+                db.close()
+
+    def ensure(self):
+        """Migrate the JSON skill columns once, when the skills table is still empty"""
+        db = self.session_factory()
+        try:
+            if db.query(Skill.id).first() is None and (
+                db.query(Job.id).first() is not None or db.query(AnalysisResult.id).first() is not None
+            ):
+                self.migrate(db)
+        finally:
+            db.close()
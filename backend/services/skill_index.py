@@ -0,0 +1,119 @@
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class SkillIndex:
+    """Inverted index over compiled jobs for top-k matching.
+
+    Posting lists map each normalized required skill and each TF-IDF term to
+    the ascending positions of the jobs containing it (the CSC form of the
+    job x skill and job x term matrices). Jobs sharing neither with a resume
+    score only on experience, industry and location, which depend on a few
+    job attributes; jobs are grouped by those attributes (facet groups) so
+    such jobs are scored once per group instead of once per job.
+    """
+
+    def __init__(
+        self,
+        required: sparse.csr_matrix,
+        job_vectors: Optional[sparse.csr_matrix],
+        required_count: np.ndarray,
+        has_experience_range: np.ndarray,
+        experience_min: np.ndarray,
+        experience_max: np.ndarray,
+        industry_codes: np.ndarray,
+        location_score: np.ndarray
+    ):
+        self.skill_postings = required.tocsc()
+        self.skill_postings.sort_indices()
+        self.term_postings = job_vectors.tocsc() if job_vectors is not None else None
+        if self.term_postings is not None:
+            self.term_postings.sort_indices()
+
+        # Facet groups: distinct (experience range, industry, location score)
+        facets = np.column_stack([
+            has_experience_range.astype(float), experience_min, experience_max,
+            industry_codes.astype(float), location_score
+        ]) if len(required_count) else np.zeros((0, 5))
+        groups, self.group_of = np.unique(facets, axis=0, return_inverse=True)
+        self.group_of = self.group_of.ravel()
+        self.group_has_experience_range = groups[:, 0].astype(bool)
+        self.group_experience_min = groups[:, 1]
+        self.group_experience_max = groups[:, 2]
+        self.group_industry_codes = groups[:, 3].astype(np.int64)
+        self.group_location_score = groups[:, 4]
+
+        # Buckets split each group by whether the job lists required skills;
+        # members are kept in ascending position order
+        self.bucket_of = self.group_of * 2 + (required_count > 0)
+        self.bucket_order = np.argsort(self.bucket_of, kind="stable")
+        self.bucket_offsets = np.concatenate([
+            [0], np.cumsum(np.bincount(self.bucket_of, minlength=len(groups) * 2))
+        ])
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.group_location_score)
+
+    def bucket_groups(self) -> np.ndarray:
+        return np.arange(self.n_groups * 2) // 2
+
+    def bucket_has_required(self) -> np.ndarray:
+        return np.arange(self.n_groups * 2) % 2 == 1
+
+    def candidates(self, skill_columns: Iterable[int], term_columns: Iterable[int] = (),
+                   skill_groups: Optional[np.ndarray] = None,
+                   term_groups: Optional[np.ndarray] = None) -> np.ndarray:
+        """Positions of jobs sharing at least one skill or term, ascending.
+
+        skill_groups / term_groups are boolean masks over facet groups; when
+        given, postings of jobs in other groups are dropped.
+        """
+        lists = [self._postings(self.skill_postings, column, skill_groups) for column in skill_columns]
+        if self.term_postings is not None:
+            lists.extend(self._postings(self.term_postings, column, term_groups) for column in term_columns)
+        lists = [positions for positions in lists if len(positions)]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+
+        total = sum(len(positions) for positions in lists)
+        n_jobs = len(self.group_of)
+        if total * 16 < n_jobs:
+            return np.unique(np.concatenate(lists))
+
+        # Long lists: marking a bitmap beats sorting/hashing their concatenation
+        marked = np.zeros(n_jobs, dtype=bool)
+        for positions in lists:
+            marked[positions] = True
+        return np.flatnonzero(marked)
+
+    def bucket_members(self, bucket: int, limit: int, exclude: np.ndarray, excluded_in_bucket: int) -> np.ndarray:
+        """First `limit` positions of a bucket that are not in the sorted `exclude`
+        array, of which `excluded_in_bucket` belong to this bucket"""
+        members = self.bucket_order[self.bucket_offsets[bucket]:self.bucket_offsets[bucket + 1]]
+        head = members[:limit + excluded_in_bucket]
+        if excluded_in_bucket:
+            found = np.minimum(np.searchsorted(exclude, head), len(exclude) - 1)
+            head = head[exclude[found] != head]
+        return head[:limit]
+
+    def _postings(self, matrix: sparse.csc_matrix, column: int, groups: Optional[np.ndarray]) -> np.ndarray:
+        positions = matrix.indices[matrix.indptr[column]:matrix.indptr[column + 1]]
+        if groups is not None:
+            positions = positions[groups[self.group_of[positions]]]
+        return positions
+
+    def stats(self) -> Dict:
+        skill_lengths = np.diff(self.skill_postings.indptr)
+        return {
+            "skills": len(skill_lengths),
+            "skill_postings": int(skill_lengths.sum()),
+            "longest_skill_posting": int(skill_lengths.max()) if len(skill_lengths) else 0,
+            "terms": self.term_postings.shape[1] if self.term_postings is not None else 0,
+            "facet_groups": self.n_groups
+        }
@@ -0,0 +1,188 @@
+import re
+import logging
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """Compiled multi-pattern skill matcher (Aho-Corasick automaton).
+
+    Every registered skill and alias is compiled into a single automaton, so
+    finding all skills in a text is one linear pass regardless of how large the
+    taxonomy grows. Matches are word-boundary aware: "r" does not match inside
+    "react" and "ai" does not match inside "maintain".
+    """
+
+    def __init__(self, normalizer: Optional[Callable[[str], str]] = None):
+        self._normalizer = normalizer or (lambda value: value.lower())
+
+        # Automaton state: transitions, failure links and outputs per node.
+        # Terminals are the patterns ending exactly at a node, outputs also
+        # include those inherited through failure links. Both hold (skill index,
+        # pattern length, starts with word char, ends with word char) tuples.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminals: List[List[Tuple[int, int, bool, bool]]] = [[]]
+        self._output: List[List[Tuple[int, int, bool, bool]]] = [[]]
+
+        # Skill registry
+        self._skills: List[str] = []
+        self._categories: List[str] = []
+        self._skill_ids: Dict[str, int] = {}
+        self._patterns: Dict[str, int] = {}
+
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill.lower() in self._skill_ids
+
+    @property
+    def skills(self) -> List[str]:
+        """Canonical skill names in registration order"""
+        return list(self._skills)
+
+    def category_of(self, skill: str) -> Optional[str]:
+        """Get the category a canonical skill was registered with"""
+        skill_id = self._skill_ids.get(skill.lower())
+        return self._categories[skill_id] if skill_id is not None else None
+
+    def add_skill(self, skill: str, category: str, aliases: Iterable[str] = ()) -> None:
+        """Register a canonical skill, optionally with aliases.
+
+        A skill that is already registered keeps its original category, which
+        mirrors the first-list-wins behaviour of the skill databases.
+        """
+        key = skill.lower()
+        if key not in self._skill_ids:
+            self._skill_ids[key] = len(self._skills)
+            self._skills.append(skill)
+            self._categories.append(category)
+
+        self._add_pattern(skill, self._skill_ids[key])
+        for alias in aliases:
+            self._add_pattern(alias, self._skill_ids[key])
+
+    def add_alias(self, alias: str, skill: str) -> bool:
+        """Register an alias (synonym) for an already registered skill"""
+        skill_id = self._skill_ids.get(skill.lower())
+        if skill_id is None:
+            logger.debug(f"Ignoring alias '{alias}' for unknown skill '{skill}'")
+            return False
+
+        self._add_pattern(alias, skill_id)
+        return True
+
+    def _add_pattern(self, pattern: str, skill_id: int) -> None:
+        """Insert a normalized pattern into the trie"""
+        normalized = _WHITESPACE.sub(' ', self._normalizer(pattern)).strip()
+        if not normalized:
+            logger.debug(f"Skill pattern '{pattern}' is empty after normalization")
+            return
+
+        # First registration of a pattern wins (e.g. "c++" and "c#" may
+        # normalize to the same text)
+        if normalized in self._patterns:
+            return
+        self._patterns[normalized] = skill_id
+
+        node = 0
+        for ch in normalized:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminals.append([])
+                self._goto[node][ch] = next_node
+            node = next_node
+
+        self._terminals[node].append((
+            skill_id,
+            len(normalized),
+            _is_word_char(normalized[0]),
+            _is_word_char(normalized[-1])
+        ))
+        self._compiled = False
+
+    def compile(self) -> None:
+        """Compute failure links (breadth-first over the trie)"""
+        self._output = [list(terminals) for terminals in self._terminals]
+
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+
+                # Inherit outputs of the failure state so every pattern
+                # ending at this position is reported
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._compiled = True
+
+    def find_all(self, text: str) -> Dict[str, int]:
+        """Find all skills in text in one pass.
+
+        Returns a mapping of canonical skill name to occurrence count, ordered
+        by skill registration order.
+        """
+        if not self._compiled:
+            self.compile()
+
+        text = _WHITESPACE.sub(' ', self._normalizer(text))
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        text_length = len(text)
+
+        matches: List[Tuple[int, int, int]] = []
+        node = 0
+        for position, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            if not output[node]:
+                continue
+
+            for skill_id, length, word_start, word_end in output[node]:
+                start = position - length + 1
+                if word_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if word_end and position + 1 < text_length and _is_word_char(text[position + 1]):
+                    continue
+                matches.append((start, position, skill_id))
+
+        # Drop matches nested inside a longer one, so "js" in "node.js" or
+        # "react" in "react.js" are not counted on their own
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        counts: Dict[int, int] = {}
+        covered_until = -1
+        for start, end, skill_id in matches:
+            if end <= covered_until:
+                continue
+            covered_until = end
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+
+        return {self._skills[skill_id]: counts[skill_id] for skill_id in sorted(counts)}
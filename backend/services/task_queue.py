@@ -0,0 +1,599 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+DEAD = "dead"  # exhausted retries or failed permanently (dead-letter)
+
+
+class PermanentTaskError(Exception):
+    """Raised by a task handler for failures that retrying cannot fix"""
+
+
+@dataclass
+class QueuedTask:
+    """A unit of background work and its delivery state"""
+    id: str
+    name: str
+    payload: Dict[str, Any]
+    status: str = QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    worker_id: Optional[str] = None
+    available_at: float = field(default_factory=time.time)
+    lease_expires_at: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class Broker(ABC):
+    """Storage and delivery for queued tasks.
+
+    Claims are leases: a task whose worker dies becomes claimable again once
+    its lease expires. Updates from a worker check the attempt number, so a
+    worker that lost its lease can't overwrite the newer attempt.
+    """
+
+    @abstractmethod
+    def enqueue(self, task: QueuedTask) -> QueuedTask:
+        """Store a new task"""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float, exclude: Iterable[str] = ()) -> Optional[QueuedTask]:
+        """Lease the next available task, skipping task names in exclude"""
+
+    @abstractmethod
+    def complete(self, task: QueuedTask, result: Any) -> bool:
+        """Mark a leased task succeeded with its result"""
+
+    @abstractmethod
+    def retry(self, task: QueuedTask, error: str, available_at: float) -> bool:
+        """Return a failed task to the queue, claimable again at available_at"""
+
+    @abstractmethod
+    def dead_letter(self, task: QueuedTask, error: str) -> bool:
+        """Mark a task failed for good"""
+
+    @abstractmethod
+    def release(self, task: QueuedTask) -> bool:
+        """Return an unfinished task to the queue without counting the attempt"""
+
+    @abstractmethod
+    def extend(self, task: QueuedTask, lease_seconds: float) -> bool:
+        """Renew the lease of a task its worker is still running"""
+
+    @abstractmethod
+    def requeue(self, task_id: str) -> Optional[QueuedTask]:
+        """Move a dead-lettered task back to the queue with fresh attempts"""
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[QueuedTask]:
+        """A task by id, or None"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per status"""
+
+    @abstractmethod
+    def has_pending(self, name: str) -> bool:
+        """Whether a task with this name is queued or running"""
+
+
+class MemoryBroker(Broker):
+    """In-process broker; tasks are lost when the process exits"""
+
+    def __init__(self):
+        self._tasks: Dict[str, QueuedTask] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, task: QueuedTask) -> QueuedTask:
+        with self._lock:
+            self._tasks[task.id] = replace(task)
+        return task
+
+    def claim(self, worker_id: str, lease_seconds: float, exclude: Iterable[str] = ()) -> Optional[QueuedTask]:
+        now = time.time()
+        excluded = set(exclude)
+        with self._lock:
+            candidates = [
+                task for task in self._tasks.values()
+                if task.name not in excluded and (
+                    (task.status == QUEUED and task.available_at <= now) or
+                    (task.status == RUNNING and task.lease_expires_at < now)
+                )
+            ]
+            if not candidates:
+                return None
+
+            task = min(candidates, key=lambda candidate: candidate.available_at)
+            task.status = RUNNING
+            task.attempts += 1
+            task.worker_id = worker_id
+            task.lease_expires_at = now + lease_seconds
+            task.updated_at = now
+            return replace(task)
+
+    def _update(self, task: QueuedTask, **changes) -> bool:
+        with self._lock:
+            current = self._tasks.get(task.id)
+            if current is None or current.status != RUNNING or current.attempts != task.attempts:
+                return False
+            for name, value in changes.items():
+                setattr(current, name, value)
+            current.updated_at = time.time()
+            return True
+
+    def complete(self, task: QueuedTask, result: Any) -> bool:
+        return self._update(task, status=SUCCEEDED, result=result, error=None, lease_expires_at=None)
+
+    def retry(self, task: QueuedTask, error: str, available_at: float) -> bool:
+        return self._update(task, status=QUEUED, error=error, available_at=available_at, lease_expires_at=None)
+
+    def dead_letter(self, task: QueuedTask, error: str) -> bool:
+        return self._update(task, status=DEAD, error=error, lease_expires_at=None)
+
+    def release(self, task: QueuedTask) -> bool:
+        return self._update(
+            task, status=QUEUED, attempts=task.attempts - 1, available_at=time.time(), lease_expires_at=None
+        )
+
+    def extend(self, task: QueuedTask, lease_seconds: float) -> bool:
+        return self._update(task, lease_expires_at=time.time() + lease_seconds)
+
+    def requeue(self, task_id: str) -> Optional[QueuedTask]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None or task.status != DEAD:
+                return None
+            task.status = QUEUED
+            task.attempts = 0
+            task.available_at = time.time()
+            task.updated_at = task.available_at
+            return replace(task)
+
+    def get(self, task_id: str) -> Optional[QueuedTask]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return replace(task) if task is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, DEAD: 0}
+        with self._lock:
+            for task in self._tasks.values():
+                counts[task.status] += 1
+        return counts
+
+    def has_pending(self, name: str) -> bool:
+        with self._lock:
+            return any(task.name == name and task.status in (QUEUED, RUNNING) for task in self._tasks.values())
+
+
+class SQLiteBroker(Broker):
+    """Durable broker in a SQLite file, shared by the API and worker processes"""
+
+    _COLUMNS = (
+        "id", "name", "payload", "status", "attempts", "max_attempts", "result", "error",
+        "worker_id", "available_at", "lease_expires_at", "created_at", "updated_at"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queued_tasks (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    worker_id TEXT,
+                    available_at REAL NOT NULL,
+                    lease_expires_at REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_queued_tasks_ready ON queued_tasks (status, available_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit mode; write transactions are opened explicitly with
+        # BEGIN IMMEDIATE so claims are atomic across processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _to_task(self, row) -> QueuedTask:
+        values = dict(zip(self._COLUMNS, row))
+        values["payload"] = json.loads(values["payload"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return QueuedTask(**values)
+
+    def enqueue(self, task: QueuedTask) -> QueuedTask:
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO queued_tasks ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                (
+                    task.id, task.name, json.dumps(task.payload), task.status, task.attempts,
+                    task.max_attempts, None, task.error, None, task.available_at, None,
+                    task.created_at, task.updated_at
+                )
+            )
+        return task
+
+    def claim(self, worker_id: str, lease_seconds: float, exclude: Iterable[str] = ()) -> Optional[QueuedTask]:
+        now = time.time()
+        excluded = list(exclude)
+        name_filter = f"AND name NOT IN ({', '.join('?' * len(excluded))})" if excluded else ""
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"""
+                    SELECT id FROM queued_tasks
+                    WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?))
+                    {name_filter}
+                    ORDER BY available_at
+                    LIMIT 1
+                    """,
+                    (QUEUED, now, RUNNING, now, *excluded)
+                ).fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    """
+                    UPDATE queued_tasks
+                    SET status = ?, attempts = attempts + 1, worker_id = ?, lease_expires_at = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (RUNNING, worker_id, now + lease_seconds, now, row[0])
+                )
+                claimed = conn.execute(
+                    f"SELECT {', '.join(self._COLUMNS)} FROM queued_tasks WHERE id = ?", (row[0],)
+                ).fetchone()
+                conn.execute("COMMIT")
+                return self._to_task(claimed)
+
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _update(self, task: QueuedTask, **changes) -> bool:
+        changes["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in changes)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE queued_tasks SET {assignments} WHERE id = ? AND status = ? AND attempts = ?",
+                (*changes.values(), task.id, RUNNING, task.attempts)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task: QueuedTask, result: Any) -> bool:
+        return self._update(
+            task, status=SUCCEEDED, result=json.dumps(result, default=str), error=None, lease_expires_at=None
+        )
+
+    def retry(self, task: QueuedTask, error: str, available_at: float) -> bool:
+        return self._update(task, status=QUEUED, error=error, available_at=available_at, lease_expires_at=None)
+
+    def dead_letter(self, task: QueuedTask, error: str) -> bool:
+        return self._update(task, status=DEAD, error=error, lease_expires_at=None)
+
+    def release(self, task: QueuedTask) -> bool:
+        return self._update(
+            task, status=QUEUED, attempts=task.attempts - 1, available_at=time.time(), lease_expires_at=None
+        )
+
+    def extend(self, task: QueuedTask, lease_seconds: float) -> bool:
+        return self._update(task, lease_expires_at=time.time() + lease_seconds)
+
+    def requeue(self, task_id: str) -> Optional[QueuedTask]:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE queued_tasks SET status = ?, attempts = 0, available_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (QUEUED, now, now, task_id, DEAD)
+            )
+            if cursor.rowcount != 1:
+                return None
+        return self.get(task_id)
+
+    def get(self, task_id: str) -> Optional[QueuedTask]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM queued_tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        return self._to_task(row) if row is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, DEAD: 0}
+        with self._connect() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM queued_tasks GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def has_pending(self, name: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM queued_tasks WHERE name = ? AND status IN (?, ?) LIMIT 1", (name, QUEUED, RUNNING)
+            ).fetchone()
+        return row is not None
+
+
+def create_broker(url: str) -> Broker:
+    """Create a broker from a URL: memory:// or sqlite:///path/to/queue.db"""
+    if url.startswith("memory://"):
+        return MemoryBroker()
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported task queue URL: {url}")
+
+
+@dataclass
+class TaskHandler:
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    concurrency: Optional[int] = None  # per-worker limit for this task name
+
+
+@dataclass
+class ScheduledTask:
+    name: str
+    interval: float  # seconds between submissions
+    payload: Dict[str, Any] = field(default_factory=dict)
+    next_run: float = 0.0  # time.time() of the next submission; 0 submits on worker start
+
+
+class TaskQueue:
+    """Background task queue with retries, dead-lettering and concurrency limits.
+
+    Handlers are registered by name with the `task` decorator. `submit` only
+    writes to the broker and returns immediately; `run_worker` consumes tasks
+    in the API process (embedded worker) or in a separate `worker.py` process.
+    Failed tasks are retried with exponential backoff up to max_attempts and
+    then dead-lettered. Tasks registered with `schedule` are submitted
+    periodically by every running worker, skipped while one is still pending.
+
+    Coroutine handlers time out after lease_seconds. Sync handlers run in a
+    thread, which can't be stopped: the worker renews the lease until the
+    thread exits, so a slow handler is never retried while it still runs.
+    A task whose worker dies is still run again once its lease expires.
+    """
+
+    def __init__(
+        self,
+        broker: Optional[Broker] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        retry_backoff_max: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ):
+        self._broker = broker
+        self.concurrency = concurrency or settings.task_queue_concurrency
+        self.max_attempts = max_attempts or settings.task_queue_max_attempts
+        self.retry_backoff = retry_backoff or settings.task_queue_retry_backoff
+        self.retry_backoff_max = retry_backoff_max or settings.task_queue_retry_backoff_max
+        self.lease_seconds = lease_seconds or settings.task_queue_lease_seconds
+        self.poll_interval = poll_interval or settings.task_queue_poll_interval
+        self._handlers: Dict[str, TaskHandler] = {}
+        self._schedules: Dict[str, ScheduledTask] = {}
+
+    @property
+    def broker(self) -> Broker:
+        """Broker from settings, created on first use"""
+        if self._broker is None:
+            self._broker = create_broker(settings.task_queue_url)
+        return self._broker
+
+    def task(self, name: str, concurrency: Optional[int] = None):
+        """Register a handler; it receives the task payload dict"""
+        def decorator(func):
+            self._handlers[name] = TaskHandler(name=name, func=func, concurrency=concurrency)
+            return func
+        return decorator
+
+    def schedule(self, name: str, interval: float, payload: Optional[Dict[str, Any]] = None):
+        """Submit a registered task every interval seconds while a worker runs"""
+        self._schedules[name] = ScheduledTask(name=name, interval=interval, payload=payload or {})
+
+    def _submit_due(self):
+        now = time.time()
+        for scheduled in self._schedules.values():
+            if scheduled.next_run > now:
+                continue
+            scheduled.next_run = now + scheduled.interval
+            try:
+                # Several workers share the broker; one pending run is enough
+                if not self.broker.has_pending(scheduled.name):
+                    self.submit(scheduled.name, dict(scheduled.payload))
+                    logger.info(f"Scheduled task {scheduled.name} submitted")
+            except Exception as e:
+                logger.warning(f"Could not submit scheduled task {scheduled.name}: {str(e)}")
+
+    def submit(self, name: str, payload: Dict[str, Any], max_attempts: Optional[int] = None,
+               delay: float = 0.0) -> QueuedTask:
+        """Enqueue a task and return it without waiting for a worker"""
+        if name not in self._handlers:
+            raise ValueError(f"Unknown task: {name}")
+
+        now = time.time()
+        task = QueuedTask(
+            id=uuid.uuid4().hex,
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts or self.max_attempts,
+            available_at=now + delay,
+            created_at=now,
+            updated_at=now
+        )
+        return self.broker.enqueue(task)
+
+    def get(self, task_id: str) -> Optional[QueuedTask]:
+        return self.broker.get(task_id)
+
+    def requeue(self, task_id: str) -> Optional[QueuedTask]:
+        """Retry a dead-lettered task"""
+        return self.broker.requeue(task_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tasks": self.broker.counts(),
+            "concurrency": self.concurrency,
+            "handlers": sorted(self._handlers),
+            "schedules": {name: scheduled.interval for name, scheduled in self._schedules.items()}
+        }
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff after the given number of failed attempts"""
+        return min(self.retry_backoff * (2 ** (attempts - 1)), self.retry_backoff_max)
+
+    def _saturated(self, running: Dict[asyncio.Task, QueuedTask]) -> List[str]:
+        """Task names that reached their own concurrency limit"""
+        in_flight: Dict[str, int] = {}
+        for task in running.values():
+            in_flight[task.name] = in_flight.get(task.name, 0) + 1
+        return [
+            name for name, handler in self._handlers.items()
+            if handler.concurrency is not None and in_flight.get(name, 0) >= handler.concurrency
+        ]
+
+    async def run_worker(self, stop_event: Optional[asyncio.Event] = None, worker_id: Optional[str] = None,
+                         shutdown_grace: float = 10.0):
+        """Consume tasks until stop_event is set"""
+        stop_event = stop_event or asyncio.Event()
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        running: Dict[asyncio.Task, QueuedTask] = {}
+        logger.info(f"Task worker {worker_id} started (concurrency {self.concurrency})")
+
+        try:
+            while not stop_event.is_set():
+                if self._schedules:
+                    await asyncio.to_thread(self._submit_due)
+
+                while len(running) < self.concurrency:
+                    task = await asyncio.to_thread(
+                        self.broker.claim, worker_id, self.lease_seconds, self._saturated(running)
+                    )
+                    if task is None:
+                        break
+                    running[asyncio.create_task(self._execute(task))] = task
+
+                if running:
+                    done, _ = await asyncio.wait(
+                        running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for finished in done:
+                        running.pop(finished)
+                else:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+        except Exception as e:
+            logger.error(f"Task worker {worker_id} failed: {str(e)}")
+            raise
+
+        finally:
+            # Give in-flight tasks a moment, then hand the rest back
+            if running:
+                done, pending = await asyncio.wait(running, timeout=shutdown_grace)
+                for unfinished in pending:
+                    unfinished.cancel()
+                    await asyncio.to_thread(self.broker.release, running[unfinished])
+            logger.info(f"Task worker {worker_id} stopped")
+
+    async def _execute(self, task: QueuedTask):
+        """Run one claimed task and record its outcome"""
+        handler = self._handlers.get(task.name)
+        if handler is None:
+            await asyncio.to_thread(self.broker.dead_letter, task, f"No handler registered for task '{task.name}'")
+            return
+
+        if task.attempts > task.max_attempts:
+            # Reclaimed after the lease of its final attempt expired
+            await asyncio.to_thread(self.broker.dead_letter, task, task.error or "Task lease expired on final attempt")
+            return
+
+        try:
+            if asyncio.iscoroutinefunction(handler.func):
+                result = await asyncio.wait_for(handler.func(task.payload), timeout=self.lease_seconds)
+            else:
+                result = await self._run_in_thread(handler, task)
+
+            await asyncio.to_thread(self.broker.complete, task, result)
+            logger.info(f"Task {task.name} {task.id} succeeded on attempt {task.attempts}")
+
+        except PermanentTaskError as e:
+            logger.error(f"Task {task.name} {task.id} failed permanently: {str(e)}")
+            await asyncio.to_thread(self.broker.dead_letter, task, str(e))
+
+        except asyncio.TimeoutError:
+            await self._record_failure(task, f"Timed out after {self.lease_seconds}s")
+
+        except Exception as e:
+            await self._record_failure(task, str(e))
+
+    async def _run_in_thread(self, handler: TaskHandler, task: QueuedTask) -> Any:
+        """Run a sync handler in a thread, renewing the lease until it exits.
+        The task stays in the worker's running set meanwhile, so it keeps
+        counting against the concurrency limits."""
+        thread = asyncio.ensure_future(asyncio.to_thread(handler.func, task.payload))
+        started = time.time()
+        overrun_logged = False
+        while True:
+            done, _ = await asyncio.wait([thread], timeout=self.lease_seconds / 2)
+            if done:
+                return thread.result()
+
+            if not overrun_logged and time.time() - started > self.lease_seconds:
+                logger.warning(f"Task {task.name} {task.id} is still running after {self.lease_seconds}s")
+                overrun_logged = True
+            if not await asyncio.to_thread(self.broker.extend, task, self.lease_seconds):
+                logger.warning(f"Task {task.name} {task.id} lost its lease while running")
+
+    async def _record_failure(self, task: QueuedTask, error: str):
+        if task.attempts >= task.max_attempts:
+            logger.error(f"Task {task.name} {task.id} dead-lettered after {task.attempts} attempts: {error}")
+            await asyncio.to_thread(self.broker.dead_letter, task, error)
+            return
+
+        delay = self.retry_delay(task.attempts)
+        logger.warning(f"Task {task.name} {task.id} attempt {task.attempts} failed, retrying in {delay:.1f}s: {error}")
+        await asyncio.to_thread(self.broker.retry, task, error, time.time() + delay)
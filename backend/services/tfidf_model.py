@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from config import settings
+from services.job_index import IndexedJob
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "current.json"
+
+
+def skills_text(skills: Sequence[str]) -> str:
+    """Document text of a (lowercased) skill list"""
+    return " ".join(skills)
+
+
+def _text_hash(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+@dataclass
+class TfidfArtifact:
+    """A TF-IDF vectorizer fitted over the job corpus and the job vectors it produced"""
+    version: str
+    fitted_at: datetime
+    vectorizer: Any
+    job_ids: np.ndarray
+    text_hashes: np.ndarray  # crc32 of each job's skills text, to detect edited jobs
+    job_vectors: sparse.csr_matrix  # L2-normalized rows, aligned with job_ids
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows (read-only, safe across threads)"""
+        return self.vectorizer.transform(texts).tocsr()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "fitted_at": self.fitted_at.isoformat(),
+            "jobs": len(self.job_ids),
+            "terms": self.n_terms
+        }
+
+
+class TfidfModelStore:
+    """Versioned, persisted TF-IDF model of job skills.
+
+    The vectorizer is fitted once over the required-skills text of every
+    active job and saved with the job vectors as tfidf-<version>.joblib; a
+    small manifest names the current version, so the API and worker
+    processes pick up an artifact fitted by either of them. At query time
+    only the resume is transformed.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_features: Optional[int] = None,
+        keep_versions: Optional[int] = None,
+        reload_interval: Optional[float] = None
+    ):
+        self.directory = directory or settings.tfidf_model_directory
+        self.max_features = max_features or settings.tfidf_max_features
+        self.keep_versions = keep_versions or settings.tfidf_keep_versions
+        self.reload_interval = settings.tfidf_reload_interval if reload_interval is None else reload_interval
+
+        self._artifact: Optional[TfidfArtifact] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def artifact(self) -> Optional[TfidfArtifact]:
+        """Current artifact, reloaded when another process published a newer one"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                self._checked_at = now
+                manifest = self._read_manifest()
+                if manifest and (self._artifact is None or manifest["version"] != self._artifact.version):
+                    self._load(manifest)
+        return self._artifact
+
+    def ensure(self, jobs: Callable[[], List[IndexedJob]]) -> Optional[TfidfArtifact]:
+        """Current artifact, fitting the first one if none was persisted yet"""
+        artifact = self.artifact
+        if artifact is None:
+            artifact = self.fit(jobs())
+        return artifact
+
+    def age(self) -> Optional[float]:
+        """Seconds since the current artifact was fitted"""
+        artifact = self.artifact
+        if artifact is None:
+            return None
+        return (datetime.utcnow() - artifact.fitted_at).total_seconds()
+
+    def fit(self, jobs: List[IndexedJob]) -> Optional[TfidfArtifact]:
+        """Fit a new version over the job corpus, persist it and make it current"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        started = time.monotonic()
+        texts = [skills_text(job.required_lower) for job in jobs]
+        vectorizer = TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            dtype=np.float64
+        )
+        try:
+            job_vectors = vectorizer.fit_transform(texts).tocsr()
+        except ValueError as e:
+            # No jobs, or no skill terms outside the stop words
+            logger.warning(f"TF-IDF model not fitted: {str(e)}")
+            return None
+
+        corpus_hash = hashlib.sha256("\n".join(texts).encode("utf-8")).hexdigest()[:8]
+        fitted_at = datetime.utcnow()
+        artifact = TfidfArtifact(
+            version=f"{fitted_at:%Y%m%d%H%M%S}-{corpus_hash}",
+            fitted_at=fitted_at,
+            vectorizer=vectorizer,
+            job_ids=np.array([job.id for job in jobs], dtype=np.int64),
+            text_hashes=np.array([_text_hash(text) for text in texts], dtype=np.uint32),
+            job_vectors=job_vectors
+        )
+
+        with self._lock:
+            self._save(artifact)
+            self._artifact = artifact
+            self._checked_at = time.monotonic()
+        self._prune()
+
+        logger.info(
+            f"TF-IDF model {artifact.version} fitted on {len(jobs)} jobs, {artifact.n_terms} terms "
+            f"in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+        return artifact
+
+    def job_vectors(self, artifact: TfidfArtifact, jobs: List[IndexedJob]) -> sparse.csr_matrix:
+        """Vectors for the given jobs: stored rows where the job is unchanged since
+        the fit, freshly transformed rows (same vocabulary and IDF) otherwise"""
+        texts = [skills_text(job.required_lower) for job in jobs]
+        positions = {int(job_id): row for row, job_id in enumerate(artifact.job_ids)}
+
+        stored_rows = np.full(len(jobs), -1, dtype=np.int64)
+        for index, (job, text) in enumerate(zip(jobs, texts)):
+            row = positions.get(job.id)
+            if row is not None and artifact.text_hashes[row] == _text_hash(text):
+                stored_rows[index] = row
+
+        missing = np.flatnonzero(stored_rows < 0)
+        if len(missing) == 0:
+            return artifact.job_vectors[stored_rows]
+
+        # Stack stored and new rows, then restore job order
+        fresh = artifact.transform([texts[index] for index in missing])
+        reused = np.flatnonzero(stored_rows >= 0)
+        stacked = sparse.vstack([artifact.job_vectors[stored_rows[reused]], fresh]).tocsr()
+        order = np.empty(len(jobs), dtype=np.int64)
+        order[np.concatenate([reused, missing])] = np.arange(len(jobs))
+        return stacked[order]
+
+    def similarity(self, first_text: str, second_text: str) -> Optional[float]:
+        """Cosine of two texts under the corpus model; None without a model or
+        when either text has no known terms"""
+        artifact = self.artifact
+        if artifact is None:
+            return None
+        vectors = artifact.transform([first_text, second_text])
+        if vectors[0].nnz == 0 or vectors[1].nnz == 0:
+            return None
+        return float(vectors[0].multiply(vectors[1]).sum())
+
+    def status(self) -> Dict[str, Any]:
+        artifact = self.artifact
+        return {
+            "directory": self.directory,
+            "fitted": artifact is not None,
+            **(artifact.describe() if artifact is not None else {})
+        }
+
+    def _artifact_path(self, version: str) -> str:
+        return os.path.join(self.directory, f"tfidf-{version}.joblib")
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read TF-IDF manifest: {str(e)}")
+            return None
+
+    def _load(self, manifest: Dict[str, Any]):
+        import joblib
+
+        try:
+            data = joblib.load(self._artifact_path(manifest["version"]))
+            self._artifact = TfidfArtifact(**data)
+            logger.info(f"Loaded TF-IDF model {self._artifact.version}")
+        except Exception as e:
+            logger.warning(f"Could not load TF-IDF model {manifest.get('version')}: {str(e)}")
+
+    def _save(self, artifact: TfidfArtifact):
+        import joblib
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._artifact_path(artifact.version)
+        joblib.dump({
+            "version": artifact.version,
+            "fitted_at": artifact.fitted_at,
+            "vectorizer": artifact.vectorizer,
+            "job_ids": artifact.job_ids,
+            "text_hashes": artifact.text_hashes,
+            "job_vectors": artifact.job_vectors
+        }, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+        # Publish only after the artifact is complete on disk
+        manifest_path = os.path.join(self.directory, MANIFEST)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(artifact.describe(), f)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def _prune(self):
+        """Delete all but the newest keep_versions artifacts"""
+        try:
+            files = sorted(
+                name for name in os.listdir(self.directory)
+                if name.startswith("tfidf-") and name.endswith(".joblib")
+            )
+            for name in files[:-self.keep_versions]:
+                os.remove(os.path.join(self.directory, name))
+        except OSError as e:
+            logger.warning(f"Could not prune TF-IDF models: {str(e)}")
@@ -0,0 +1,181 @@
+"""Background task handlers and schedules of the task queue.
+
+Imported by the API (main.py), which submits tasks and with
+TASK_QUEUE_EMBEDDED_WORKER consumes them in-process, and by the standalone
+worker.py.
+"""
+import os
+import asyncio
+import logging
+
+from database import SessionLocal
+from models import Resume, AnalysisResult
+from services.semantic_index import job_document
+from services.task_queue import TaskQueue, PermanentTaskError
+from app_services import (
+    job_matcher, match_store, job_importer, reanalysis_backfill, analyze_content, build_analysis_record
+)
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+task_queue = TaskQueue()
+
+async def queue_match_materialization(resume_id: int):
+    """Queue storing a newly analyzed resume's job matches. Only logged on
+    failure: the analysis is saved, and stored matches older than the latest
+    analysis are recomputed on the next read anyway."""
+    try:
+        await asyncio.to_thread(task_queue.submit, "materialize_matches", {"resume_id": resume_id})
+    except Exception as e:
+        logger.warning(f"Could not queue match materialization for resume {resume_id}: {str(e)}")
+
+def load_resume_content(db, resume_id: int) -> str:
+    """Resume text for a background analysis"""
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        raise PermanentTaskError(f"Resume {resume_id} not found")
+    return resume.content
+
+def store_analysis(db, resume_id: int, analysis_result) -> int:
+    """Save a background analysis and return its id"""
+    analysis = build_analysis_record(resume_id, analysis_result)
+    db.add(analysis)
+    db.commit()
+    return analysis.id
+
+@task_queue.task("analyze_resume")
+async def analyze_resume_task(payload: dict) -> dict:
+    """Background resume analysis: analyze and store an AnalysisResult. The
+    analysis is awaited on the worker's loop (it runs in the analysis pool);
+    the database work runs in threads."""
+    resume_id = payload["resume_id"]
+    db = SessionLocal()
+    try:
+        content = await asyncio.to_thread(load_resume_content, db, resume_id)
+        analysis_result = await analyze_content(content, db)
+        analysis_id = await asyncio.to_thread(store_analysis, db, resume_id, analysis_result)
+        await queue_match_materialization(resume_id)
+        
+        return {
+            "analysis_id": analysis_id,
+            "resume_id": resume_id,
+            "analysis": analysis_result.model_dump(mode="json")
+        }
+    finally:
+        db.close()
+
+@task_queue.task("reanalysis_backfill", concurrency=1)
+async def reanalysis_backfill_task(payload: dict) -> dict:
+    """Run the backfill for one time slice, then queue the next slice"""
+    progress = await reanalysis_backfill.run(
+        max_duration=settings.backfill_task_duration,
+        restart=payload.get("restart", False)
+    )
+    if progress["status"] != "completed":
+        await asyncio.to_thread(task_queue.submit, "reanalysis_backfill", {})
+    return progress
+
+@task_queue.task("refit_tfidf", concurrency=1)
+def refit_tfidf_task(payload: dict) -> dict:
+    """Fit a new TF-IDF model version over the current job corpus"""
+    age = job_matcher.tfidf_model.age()
+    # Scheduled runs also fire on worker start; skip if a model is still fresh
+    if not payload.get("force") and age is not None and age < settings.tfidf_refit_interval / 2:
+        return {"refit": False, **job_matcher.tfidf_model.status()}
+    
+    if job_matcher.tfidf_model.fit(job_matcher.job_index.jobs()) is None:
+        raise PermanentTaskError("No job skills to fit a TF-IDF model on")
+    return {"refit": True, **job_matcher.tfidf_model.status()}
+
+task_queue.schedule("refit_tfidf", settings.tfidf_refit_interval)
+
+def build_semantic_index() -> dict:
+    """Embed every active job and rebuild the semantic IVF index"""
+    jobs = job_matcher.job_index.jobs()
+    if job_matcher.semantic_index.build((job.id, job_document(job)) for job in jobs) is None:
+        raise PermanentTaskError("No job text to build a semantic index from")
+    return job_matcher.semantic_index.status()
+
+@task_queue.task("build_semantic_index", concurrency=1)
+def build_semantic_index_task(payload: dict) -> dict:
+    """Rebuild the semantic job index unless it is still fresh"""
+    age = job_matcher.semantic_index.age()
+    if not payload.get("force") and age is not None and age < settings.semantic_rebuild_interval / 2:
+        return {"rebuilt": False, **job_matcher.semantic_index.status()}
+    return {"rebuilt": True, **build_semantic_index()}
+
+task_queue.schedule("build_semantic_index", settings.semantic_rebuild_interval)
+
+@task_queue.task("rebuild_job_trends", concurrency=1)
+def rebuild_job_trends_task(payload: dict) -> dict:
+    """Recount the job trend counters from the jobs table"""
+    return {"active_jobs": job_matcher.job_trends.rebuild()}
+
+@task_queue.task("migrate_skills", concurrency=1)
+def migrate_skills_task(payload: dict) -> dict:
+    """Relink job and resume skills from the JSON skill columns"""
+    return job_matcher.skill_catalog.migrate()
+
+@task_queue.task("migrate_salaries", concurrency=1)
+def migrate_salaries_task(payload: dict) -> dict:
+    """Re-parse job salary columns from salary_range and recount the salary trends"""
+    counts = job_matcher.job_salaries.migrate()
+    job_matcher.job_trends.rebuild()
+    job_matcher.job_index.invalidate()
+    return counts
+
+@task_queue.task("migrate_locations", concurrency=1)
+def migrate_locations_task(payload: dict) -> dict:
+    """Re-resolve job coordinates and geohashes from location through the gazetteer"""
+    counts = job_matcher.job_geo.migrate()
+    job_matcher.job_index.invalidate()
+    return counts
+
+@task_queue.task("import_jobs", concurrency=1)
+def import_jobs_task(payload: dict) -> dict:
+    """Import one time slice of an uploaded job feed, then queue the next slice"""
+    if not os.path.exists(payload["path"]):
+        raise PermanentTaskError(f"Job feed {payload['path']} not found")
+    
+    report = job_importer.import_file(
+        payload["path"],
+        payload["format"],
+        offset=payload.get("offset", 0),
+        max_duration=settings.job_import_task_duration,
+        report=payload.get("report")
+    )
+    job_matcher.job_index.invalidate()
+    if report["completed"]:
+        os.remove(payload["path"])
+        task_queue.submit("sync_job_matches", {})
+    else:
+        task_queue.submit("import_jobs", {**payload, "offset": report["offset"], "report": report})
+    return report
+
+@task_queue.task("materialize_matches")
+def materialize_matches_task(payload: dict) -> dict:
+    """Compute and store a resume's job matches from its latest analysis"""
+    db = SessionLocal()
+    try:
+        analysis = db.query(AnalysisResult).filter(
+            AnalysisResult.resume_id == payload["resume_id"]
+        ).order_by(AnalysisResult.analysis_date.desc()).first()
+        if not analysis:
+            raise PermanentTaskError(f"No analysis for resume {payload['resume_id']}")
+        
+        match_set = match_store.ensure_current(db, payload["resume_id"], analysis)
+        return {"resume_id": match_set.resume_id, "analysis_id": match_set.analysis_id}
+    finally:
+        db.close()
+
+@task_queue.task("sync_job_matches", concurrency=1)
+def sync_job_matches_task(payload: dict) -> dict:
+    """Rescore stored matches of jobs added, edited or deactivated since the last sync"""
+    db = SessionLocal()
+    try:
+        return match_store.sync_jobs(db)
+    finally:
+        db.close()
+
+task_queue.schedule("sync_job_matches", settings.job_match_sync_interval)
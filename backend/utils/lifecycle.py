@@ -0,0 +1,74 @@
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracker:
+    """Records how long each startup phase takes and when the app is ready"""
+
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.started_at = datetime.utcnow()
+        self.milestones: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.failing: Optional[str] = None  # required phase failed and waiting to be retried
+        self.degraded: List[str] = []  # optional phases that failed; the app serves without them
+        self.ready_after: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_after is not None
+
+    def _elapsed_ms(self, since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 2)
+
+    def mark(self, name: str):
+        """Record a milestone relative to tracker creation"""
+        self.milestones[name] = self._elapsed_ms(self.created_at)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase, recording failures"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.errors[name] = str(e)
+            raise
+        finally:
+            self.phases[name] = self._elapsed_ms(start)
+            logger.info(f"Startup phase '{name}' took {self.phases[name]}ms")
+
+    def mark_failing(self, name: str):
+        """Record that a required phase failed and will be retried"""
+        self.failing = name
+
+    def mark_degraded(self, name: str):
+        """Record that an optional phase failed and startup went on without it"""
+        self.degraded.append(name)
+
+    def mark_ready(self):
+        """Record that the application is ready to serve traffic"""
+        self.ready_after = self._elapsed_ms(self.created_at)
+        self.failing = None
+        logger.info(f"Application ready after {self.ready_after}ms")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "milestones_ms": dict(self.milestones),
+            "phases_ms": dict(self.phases),
+            "errors": dict(self.errors),
+            "failing_phase": self.failing,
+            "degraded_phases": list(self.degraded),
+            "ready_after_ms": self.ready_after
+        }
+
+
+# Process-wide tracker, created when the API module is first imported
+startup_tracker = StartupTracker()
@@ -0,0 +1,124 @@
+import re
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from config import settings
+
+try:
+    import re2  # Optional linear-time engine (google-re2)
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+_active_budget: ContextVar[Optional["ExtractionBudget"]] = ContextVar("extraction_budget", default=None)
+
+
+class ExtractionBudget:
+    """Per-document CPU time budget shared by all extraction patterns"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = settings.analysis_time_budget if seconds is None else seconds
+        self.deadline = time.monotonic() + self.seconds
+        self.degraded_patterns: List[str] = []
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() > self.deadline
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.degraded_patterns)
+
+    def mark_degraded(self, name: str):
+        """Record a pattern that stopped early because the budget ran out"""
+        if name not in self.degraded_patterns:
+            self.degraded_patterns.append(name)
+
+    @contextmanager
+    def activate(self):
+        """Make this budget apply to every SafePattern used in the block"""
+        token = _active_budget.set(self)
+        try:
+            yield self
+        finally:
+            _active_budget.reset(token)
+
+
+class SafePattern:
+    """Regular expression with bounded worst-case cost.
+
+    Uses RE2 (linear time) when it is installed. Otherwise the stdlib engine
+    runs line by line on windows of at most `max_line_length` characters with
+    an optional start guard, so backtracking is bounded by the window size
+    instead of the document size, and the active ExtractionBudget is checked
+    between windows. When the budget runs out the remaining text is skipped
+    and the pattern is recorded as degraded.
+    """
+
+    # Guards for the backtracking engine: only start a match attempt where the
+    # leftmost match can begin, so failed attempts are not retried from every
+    # position of the same segment or digit run
+    SEGMENT_START = r"(?:^|(?<=[,\n]))"
+    NUMBER_START = r"(?<!\d)"
+
+    def __init__(self, pattern: str, flags: int = 0, name: Optional[str] = None,
+                 guard: str = "", max_line_length: Optional[int] = None):
+        self.pattern = pattern
+        self.flags = flags
+        self.name = name or pattern
+        self.max_line_length = max_line_length or settings.regex_max_line_length
+        self.engine = "re"
+        self._compiled = self._compile(pattern, flags, guard)
+
+    def _compile(self, pattern: str, flags: int, guard: str):
+        """Compile with RE2 when available, falling back to the stdlib engine"""
+        if re2 is not None and settings.regex_engine in ("auto", "re2"):
+            try:
+                inline_flags = "(?i)" if flags & re.IGNORECASE else ""
+                compiled = re2.compile(inline_flags + pattern)
+                self.engine = "re2"
+                return compiled
+            except Exception as e:
+                logger.debug(f"RE2 cannot compile '{self.name}', using re: {str(e)}")
+
+        return re.compile(guard + pattern, flags)
+
+    def _windows(self, text: str) -> Iterator[str]:
+        """Yield bounded windows of text, stopping when the budget expires"""
+        budget = _active_budget.get()
+        limit = self.max_line_length
+
+        for line in text.split("\n"):
+            while line:
+                if budget is not None and budget.expired:
+                    budget.mark_degraded(self.name)
+                    return
+
+                if self.engine == "re2" or len(line) <= limit:
+                    window, line = line, ""
+                else:
+                    # Cut long lines at whitespace so words stay intact
+                    cut = line.rfind(" ", 0, limit)
+                    cut = cut if cut > 0 else limit
+                    window, line = line[:cut], line[cut:].lstrip(" ")
+
+                yield window
+
+    def search(self, text: str):
+        """Find the first match in text"""
+        for window in self._windows(text):
+            match = self._compiled.search(window)
+            if match:
+                return match
+        return None
+
+    def findall(self, text: str) -> list:
+        """Find all matches in text"""
+        matches = []
+        for window in self._windows(text):
+            matches.extend(self._compiled.findall(window))
+        return matches
@@ -0,0 +1,103 @@
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+
+def format_ndjson(event: str, payload: Any) -> str:
+    """One JSON object per line, tagged with its event name"""
+    data = jsonable_encoder(payload)
+    if not isinstance(data, dict):
+        data = {"data": data}
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+def format_sse(event: str, payload: Any) -> str:
+    """A Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(payload))}\n\n"
+
+
+def stream_events(events: Union[Iterator[Tuple[str, Any]], AsyncIterator[Tuple[str, Any]]], stream_format: str) -> StreamingResponse:
+    """Wrap an iterator of (event, payload) pairs in a streaming response.
+
+    Sync iterators are consumed in the threadpool by Starlette, so blocking
+    database reads inside them don't stall the event loop.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise ValueError(f"Invalid stream format: {stream_format}. Use one of {', '.join(STREAM_FORMATS)}")
+
+    formatter = format_sse if stream_format == "sse" else format_ndjson
+
+    if hasattr(events, "__aiter__"):
+        async def body():
+            async for event, payload in events:
+                yield formatter(event, payload)
+    else:
+        def body():
+            for event, payload in events:
+                yield formatter(event, payload)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(body(), media_type=STREAM_FORMATS[stream_format], headers=headers)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    window: int
+) -> AsyncIterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """Run func over items with at most `window` calls in flight.
+
+    Yields (item, result, error) in completion order. Items are pulled from
+    the iterable only when a slot frees up, so memory is bounded by the window
+    rather than the number of items.
+    """
+    iterator = iter(items)
+    in_flight = {}
+
+    def fill():
+        while len(in_flight) < window:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            in_flight[asyncio.ensure_future(func(item))] = item
+
+    fill()
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = in_flight.pop(task)
+                error = task.exception()
+                yield item, None if error else task.result(), error
+            fill()
+    finally:
+        # Client disconnected or the consumer stopped early
+        for task in in_flight:
+            task.cancel()
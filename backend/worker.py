@@ -0,0 +1,32 @@
+"""Standalone background task worker.
+
+Run with `python worker.py` next to an API started with
+TASK_QUEUE_EMBEDDED_WORKER=false; both must use the same TASK_QUEUE_URL.
+"""
+import signal
+import asyncio
+import logging
+
+from database import init_db
+from app_services import analysis_pool
+from tasks import task_queue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run():
+    init_db()
+    
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    await asyncio.to_thread(analysis_pool.warm_up)
+    try:
+        await task_queue.run_worker(stop_event)
+    finally:
+        analysis_pool.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(run())